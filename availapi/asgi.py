@@ -0,0 +1,313 @@
+"""ASGI entry point of the service: `uvicorn availapi.asgi:app`.
+
+The availability routes are served natively, resolving the holidays with
+asyncio redis so the lookups of one request run concurrently and a worker
+serves many requests in flight. The validation, computation and responses
+are the ones of the Flask app (its config, error handlers and request
+hooks included) and any other route (docs, spec) is delegated to it.
+"""
+import asyncio
+
+from flask import Flask, request
+from webargs.flaskparser import parser
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from . import create_app
+from .core.availability import (
+    batch_calendar_keys,
+    check_availability,
+    check_loaded_batch,
+    decode_ndjson_line,
+    find_slots,
+    load_batch,
+    ranges_calendar_keys,
+    validate_batch,
+)
+from .core.fast_validation import parse_ranges_args
+from .core.schemas import SlotsQuerySchema, dump_ranked_slots, dump_slots
+from .utils.async_holiday_providers import build_async_holidays_provider
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+slots_query_schema = SlotsQuerySchema()
+
+
+def _build_environ(scope: dict, body: bytes = b"") -> dict:
+    """Build the WSGI environ of an ASGI HTTP request."""
+    host, port = scope.get("server") or ("localhost", 80)
+    builder = EnvironBuilder(
+        path=scope["path"],
+        base_url=f"{scope.get('scheme', 'http')}://{host}:{port}"
+        f"{scope.get('root_path', '')}",
+        method=scope["method"],
+        headers=[
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in scope["headers"]
+        ],
+        query_string=scope["query_string"].decode("latin-1"),
+        data=body,
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+    return environ
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def _iter_lines(receive):
+    """Yield the lines of the request body while it is received."""
+    pending = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        more_body = message.get("more_body", False)
+        lines = (pending + message.get("body", b"")).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+async def _start_response(send, status: int, headers):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ],
+        }
+    )
+
+
+class AsgiApp:
+    """ASGI application serving the availability routes of a Flask app."""
+
+    def __init__(self, flask_app: Flask):
+        self.flask_app = flask_app
+        self.routes = {
+            "/availability-check": self.check_availability,
+            "/availability-slots": self.find_slots,
+            "/availability-check/batch": self.check_availability_batch,
+        }
+        self._holidays_provider = None
+
+    @property
+    def holidays_provider(self):
+        # Built on first use, inside the event loop its clients are bound to.
+        if self._holidays_provider is None:
+            self._holidays_provider = build_async_holidays_provider(
+                self.flask_app.config
+            )
+        return self._holidays_provider
+
+    async def resolve_calendars(self, keys: set) -> dict:
+        """Resolve at once the holidays calendars of several (country, year)
+        keys, without blocking the event loop.
+
+        :param keys: The (country, year) keys to resolve.
+        :type keys: set
+        :return: The holidays calendars per (country, year).
+        :rtype: dict
+        """
+        if not keys:
+            return {}
+        return await self.holidays_provider.get_calendars(keys)
+
+    async def resolve_calendars_by_key(self, keys: set) -> tuple:
+        """Resolve at once the holidays calendars of several (country, year)
+        keys, telling apart the keys that fail (see
+        `availapi.utils.holidays.resolve_calendars_by_key`).
+
+        :param keys: The (country, year) keys to resolve.
+        :type keys: set
+        :return: The calendars of the keys resolved and the error (an
+            `HTTPException`) of every key failing.
+        :rtype: tuple
+        """
+        try:
+            return await self.resolve_calendars(keys), {}
+        except HTTPException:
+            pass
+
+        keys = list(keys)
+        results = await asyncio.gather(
+            *(self.resolve_calendars({key}) for key in keys),
+            return_exceptions=True,
+        )
+        calendars = {}
+        errors = {}
+        for key, result in zip(keys, results):
+            if isinstance(result, HTTPException):
+                errors[key] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                calendars.update(result)
+        return calendars, errors
+
+    async def check_availability(self):
+        data = parse_ranges_args()
+        calendars = await self.resolve_calendars(ranges_calendar_keys(data))
+        return (
+            dump_slots(check_availability(data, calendars)),
+            200,
+            JSON_HEADERS,
+        )
+
+    async def find_slots(self):
+        data = parser.parse(slots_query_schema, location="json")
+        calendars = await self.resolve_calendars(
+            ranges_calendar_keys(
+                dt_range
+                for participant in data["participants"]
+                for dt_range in participant["ranges"]
+            )
+        )
+        slots = find_slots(
+            data["participants"], data["min_participants"], calendars
+        )
+        return dump_ranked_slots(slots), 200, JSON_HEADERS
+
+    async def check_availability_batch(self):
+        queries = request.get_json(silent=True)
+        validate_batch(queries, self.flask_app.config["MAX_BATCH_SIZE"])
+        loaded_queries = load_batch(queries)
+        calendars, calendar_errors = await self.resolve_calendars_by_key(
+            batch_calendar_keys(loaded_queries)
+        )
+        return (
+            check_loaded_batch(loaded_queries, calendars, calendar_errors),
+            200,
+            JSON_HEADERS,
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] != "http" or scope["method"] != "POST":
+            await self._call_flask(scope, receive, send)
+        elif scope["path"] == "/availability-check/stream":
+            await self._check_availability_stream(scope, receive, send)
+        elif scope["path"] in self.routes:
+            await self._dispatch(scope, receive, send)
+        else:
+            await self._call_flask(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, scope, receive, send):
+        """Run a route like Flask does: request hooks, error handlers and
+        response processing included.
+        """
+        environ = _build_environ(scope, await _read_body(receive))
+        with self.flask_app.request_context(environ):
+            try:
+                try:
+                    rv = self.flask_app.preprocess_request()
+                    if rv is None:
+                        rv = await self.routes[scope["path"]]()
+                except Exception as e:
+                    rv = self.flask_app.handle_user_exception(e)
+                response = self.flask_app.finalize_request(rv)
+            except Exception as e:
+                response = self.flask_app.make_response(
+                    self.flask_app.handle_exception(e)
+                )
+            body = response.get_data()
+
+        await _start_response(
+            send, response.status_code, response.headers.items()
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _check_availability_stream(self, scope, receive, send):
+        """Stream the results of a newline-delimited JSON stream of queries,
+        like `/availability-check/stream` of the Flask app.
+        """
+        chunk_size = self.flask_app.config["STREAM_CHUNK_SIZE"]
+        with self.flask_app.request_context(_build_environ(scope)):
+            await _start_response(
+                send, 200, [("Content-Type", "application/x-ndjson")]
+            )
+            chunk = []
+            async for line in _iter_lines(receive):
+                if line.strip():
+                    chunk.append(decode_ndjson_line(line))
+                if len(chunk) >= chunk_size:
+                    await self._send_batch_lines(send, chunk)
+                    chunk = []
+            if chunk:
+                await self._send_batch_lines(send, chunk)
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _send_batch_lines(self, send, queries: list):
+        loaded_queries = load_batch(queries)
+        calendars, calendar_errors = await self.resolve_calendars_by_key(
+            batch_calendar_keys(loaded_queries)
+        )
+        results = check_loaded_batch(
+            loaded_queries, calendars, calendar_errors
+        )
+        body = "".join(
+            self.flask_app.json.dumps(result, separators=(",", ":")) + "\n"
+            for result in results
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": body.encode(),
+                "more_body": True,
+            }
+        )
+
+    async def _call_flask(self, scope, receive, send):
+        """Serve any other request with the Flask app, in a thread."""
+        if scope["type"] != "http":
+            return
+        environ = _build_environ(scope, await _read_body(receive))
+
+        def call():
+            app_iter, status, headers = run_wsgi_app(
+                self.flask_app, environ, buffered=True
+            )
+            try:
+                return b"".join(app_iter), status, headers
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+
+        (
+            body,
+            status,
+            headers,
+        ) = await asyncio.get_running_loop().run_in_executor(None, call)
+        await _start_response(
+            send, int(status.split(" ", 1)[0]), headers.items()
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+app = AsgiApp(create_app())
@@ -0,0 +1,112 @@
+from datetime import date
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from .utils.countries import supported_countries
+from .utils.holiday_providers import CalendarificProvider
+from .utils.holidays import get_holidays_provider
+from .utils.holidays_dataset import write_dataset
+from .utils.warmup import parse_countries, warm_up_holidays, warmup_keys
+
+holidays_cli = AppGroup("holidays", help="Manage the holidays data.")
+
+
+@holidays_cli.command("snapshot")
+@click.option(
+    "--from-year",
+    type=int,
+    default=lambda: date.today().year,
+    help="First year of the snapshot (defaults to the current year).",
+)
+@click.option(
+    "--to-year",
+    type=int,
+    default=lambda: date.today().year + 1,
+    help="Last year of the snapshot (defaults to the next year).",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    required=True,
+    help="Path of the dataset file to write.",
+)
+def snapshot_command(from_year: int, to_year: int, output: str):
+    """Snapshot the holidays of all the supported countries into a dataset
+    file that can be used through `HOLIDAYS_DATASET_PATH`.
+    """
+    keys = [
+        (country, year)
+        for country in supported_countries
+        for year in range(from_year, to_year + 1)
+    ]
+    provider = CalendarificProvider(current_app.config["CALENDARIFIC_API_KEY"])
+    calendars = provider.get_calendars(keys)
+    write_dataset(output, calendars)
+    click.echo(f"Wrote {len(calendars)} calendars into {output}.")
+
+
+@holidays_cli.command("warmup")
+@click.option(
+    "--countries",
+    help="Comma separated country codes to warm up (defaults to the "
+    "`HOLIDAYS_WARMUP_COUNTRIES` setting, all the supported ones if empty).",
+)
+@click.option(
+    "--year",
+    "years",
+    type=int,
+    multiple=True,
+    help="Year to warm up, can be repeated (defaults to the current and the "
+    "next year).",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Calendars resolved concurrently (defaults to the "
+    "`HOLIDAYS_WARMUP_WORKERS` setting).",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Calendars resolved per second (defaults to the "
+    "`HOLIDAYS_WARMUP_RATE` setting).",
+)
+def warmup_command(countries: str, years: tuple, workers: int, rate: float):
+    """Resolve the holidays of the supported countries through the holidays
+    providers, so they are cached (in redis) before the requests need them.
+    """
+    config = current_app.config
+    try:
+        countries = parse_countries(
+            config["HOLIDAYS_WARMUP_COUNTRIES"]
+            if countries is None
+            else countries
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--countries")
+
+    report = warm_up_holidays(
+        get_holidays_provider(),
+        warmup_keys(countries, list(years)),
+        max_workers=workers or config["HOLIDAYS_WARMUP_WORKERS"],
+        rate=rate or config["HOLIDAYS_WARMUP_RATE"],
+    )
+
+    failures = report["failures"]
+    click.echo(
+        f"Warmed up {report['keys'] - len(failures)} of {report['keys']} "
+        f"holidays calendars in {report['elapsed']:.2f}s."
+    )
+    timings = sorted(report["timings"].values())
+    if timings:
+        click.echo(
+            f"Per calendar: p50 {timings[len(timings) // 2]:.2f}s, "
+            f"p95 {timings[int(len(timings) * 0.95)]:.2f}s, "
+            f"max {timings[-1]:.2f}s."
+        )
+    for (country, year), error in failures.items():
+        click.echo(f"Failed {country}-{year}: {error}", err=True)
+    if failures:
+        raise click.exceptions.Exit(1)
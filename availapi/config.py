@@ -0,0 +1,116 @@
+import os
+import tempfile
+from datetime import timedelta
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class Config:
+    # Queries allowed in a single `/availability-check/batch` request.
+    MAX_BATCH_SIZE = 1000
+    # Validate the valid `/availability-check` bodies without marshmallow.
+    FAST_VALIDATION = True
+    # Queries of `/availability-check/stream` checked together.
+    STREAM_CHUNK_SIZE = 100
+    # Serialize the JSON responses with orjson when it is installed.
+    ORJSON_ENABLED = True
+    # Cache the responses of `/availability-check` per normalized query (see
+    # `availapi.core.result_cache`), for up to RESULT_CACHE_TTL seconds.
+    RESULT_CACHE_ENABLED = os.environ.get(
+        "RESULT_CACHE_ENABLED", ""
+    ).lower() in ("1", "true", "yes")
+    RESULT_CACHE_MAX_SIZE = 10000
+    RESULT_CACHE_TTL = 60
+    # Expose the request counts, latencies and cache counters in `/metrics`.
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    # Serve the OpenAPI document in `/spec.json` and the Swagger UI in `/docs`.
+    DOCS_ENABLED = os.environ.get("DOCS_ENABLED", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    # Profile a share of the requests with cProfile and, when the threshold
+    # (seconds) is set, sample the stacks of the slower ones every
+    # PROFILING_SAMPLE_INTERVAL seconds (see `availapi.core.profiling`). The
+    # last PROFILING_MAX_FILES profiles are kept in PROFILING_DIR.
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    PROFILING_SAMPLE_RATE = float(
+        os.environ.get("PROFILING_SAMPLE_RATE", 0.01)
+    )
+    PROFILING_SLOW_THRESHOLD = (
+        float(os.environ["PROFILING_SLOW_THRESHOLD"])
+        if os.environ.get("PROFILING_SLOW_THRESHOLD")
+        else None
+    )
+    PROFILING_SAMPLE_INTERVAL = 0.005
+    PROFILING_DIR = os.environ.get(
+        "PROFILING_DIR",
+        os.path.join(tempfile.gettempdir(), "availapi-profiles"),
+    )
+    PROFILING_MAX_FILES = 50
+    # Weekdays (0 = Monday) of the weekend of the countries whose weekend
+    # differs from the built-in one (see `availapi.utils.weekends`).
+    # Example: {"AE": [5, 6]}
+    WEEKENDS = {}
+
+    CALENDARIFIC_API_KEY = os.environ.get("CALENDARIFIC_API_KEY")
+    CALENDARIFIC_POOL_SIZE = 10
+    # Seconds to wait for the connection and then for the response.
+    CALENDARIFIC_CONNECT_TIMEOUT = 3.05
+    CALENDARIFIC_READ_TIMEOUT = 10
+    CALENDARIFIC_RETRIES = 2
+    # Consecutive failures that open the circuit and seconds before trying
+    # again.
+    CALENDARIFIC_CIRCUIT_THRESHOLD = 5
+    CALENDARIFIC_CIRCUIT_RESET_TIMEOUT = 30
+
+    REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
+    REDIS_PORT = int(os.environ.get("REDIS_PORT", 6379))
+    REDIS_DB = int(os.environ.get("REDIS_DB", 0))
+    # When set, the unix socket is used instead of the host and port.
+    REDIS_UNIX_SOCKET = os.environ.get("REDIS_UNIX_SOCKET")
+    REDIS_MAX_CONNECTIONS = 20
+    # Seconds to wait for the connection and for every command.
+    REDIS_CONNECT_TIMEOUT = 0.5
+    REDIS_SOCKET_TIMEOUT = 0.5
+    REDIS_HEALTH_CHECK_INTERVAL = 30
+    # Seconds redis is skipped after an error, while the holidays are
+    # resolved without it.
+    REDIS_RETRY_INTERVAL = 5
+
+    # Layers used to resolve the holidays, from the first one consulted to
+    # the last one (see `build_holidays_provider`).
+    HOLIDAYS_PROVIDERS = os.environ.get(
+        "HOLIDAYS_PROVIDERS", "dataset,memory,redis,calendarific"
+    )
+    # Optional file generated with `flask holidays snapshot`.
+    HOLIDAYS_DATASET_PATH = os.environ.get("HOLIDAYS_DATASET_PATH")
+    # Holidays served by the `static` layer: {(country, year): [date, ...]}.
+    HOLIDAYS_STATIC = {}
+    # In-process copy of the calendars kept by every worker.
+    HOLIDAYS_MEMORY_MAX_SIZE = 512
+    HOLIDAYS_MEMORY_TTL = timedelta(hours=1)
+    # Past the soft TTL the cached holidays are refreshed in background, past
+    # the hard TTL they are dropped from redis.
+    HOLIDAYS_SOFT_TTL = timedelta(days=1)
+    HOLIDAYS_HARD_TTL = timedelta(days=7)
+    # Warm up the holidays of the current and next year in background when
+    # the app starts (see `flask holidays warmup`). The countries are comma
+    # separated, all the supported ones when empty.
+    HOLIDAYS_WARMUP_ON_STARTUP = os.environ.get(
+        "HOLIDAYS_WARMUP_ON_STARTUP", ""
+    ).lower() in ("1", "true", "yes")
+    HOLIDAYS_WARMUP_COUNTRIES = os.environ.get("HOLIDAYS_WARMUP_COUNTRIES", "")
+    HOLIDAYS_WARMUP_WORKERS = 8
+    # Calendars resolved per second while warming up.
+    HOLIDAYS_WARMUP_RATE = 10
@@ -0,0 +1,366 @@
+import json
+from datetime import date
+
+from flask import abort
+from marshmallow import ValidationError
+from werkzeug.exceptions import HTTPException
+
+from ..utils.business_days import range_years, split_business_windows
+from ..utils.holiday_providers import subdivision_calendar
+from ..utils.holidays import resolve_calendars, resolve_calendars_by_key
+from ..utils.intersection import (
+    Ranges,
+    common_window,
+    common_windows,
+    free_windows,
+    from_epoch_us,
+)
+from ..utils.weekends import is_weekend
+from . import metrics
+from .error_handler import format_error
+from .fast_validation import load_ranges
+from .schemas import dump_slots
+
+
+@metrics.timed("special_dates")
+def _validate_special_dates(
+    d: date, cc: str, calendars: dict, subdivision: str = None
+):
+    """Check whether the date given correspond to a weekend or holiday.
+
+    :param d: The date to check.
+    :type d: date
+    :param cc: The corresponding country.
+    :type cc: str
+    :param calendars: The holidays calendars per (country, year).
+    :type calendars: dict
+    :param subdivision: The corresponding subdivision of the country.
+    :type subdivision: str, optional
+    """
+    base_error_message = "Unable to find an available slot."
+    if is_weekend(d, cc):
+        abort(
+            400,
+            f"{base_error_message} The date {d.isoformat()} correspond "
+            "to a weekend.",
+        )
+
+    calendar = subdivision_calendar(
+        calendars.get((cc, d.year), ()), subdivision
+    )
+    if d.toordinal() in calendar:
+        abort(
+            400,
+            f"{base_error_message} The date {d.isoformat()} is "
+            f"holiday in {subdivision or cc}.",
+        )
+
+
+def ranges_calendar_keys(dt_ranges) -> set:
+    """Return the holidays calendars needed by the ranges given.
+
+    :param dt_ranges: The ranges loaded with `RangeSchema`.
+    :type dt_ranges: iterable
+    :return: The (country, year) keys of the calendars.
+    :rtype: set
+    """
+    return {
+        (dt_range["cc"], year)
+        for dt_range in dt_ranges
+        for year in range_years(
+            dt_range["from_datetime"], dt_range["to_datetime"]
+        )
+    }
+
+
+def resolve_ranges_calendars(dt_ranges) -> dict:
+    """Resolve at once the holidays calendars needed by the ranges given.
+
+    :param dt_ranges: The ranges loaded with `RangeSchema`.
+    :type dt_ranges: iterable
+    :return: The holidays calendars per (country, year).
+    :rtype: dict
+    """
+    return resolve_calendars(ranges_calendar_keys(dt_ranges))
+
+
+@metrics.timed("business_days")
+def _business_windows(dt_range: dict, calendars: dict) -> list:
+    return split_business_windows(
+        dt_range["from_datetime"],
+        dt_range["to_datetime"],
+        dt_range["cc"],
+        calendars,
+        dt_range.get("subdivision"),
+    )
+
+
+def _to_slot(from_us: int, to_us: int) -> dict:
+    return {
+        "from_datetime": from_epoch_us(from_us),
+        "to_datetime": from_epoch_us(to_us),
+    }
+
+
+def check_availability(data: list, calendars: dict = None) -> list:
+    """Find the slots where all the ranges given are matched.
+
+    Every range is split into its windows on business days. When all the
+    ranges are a single window (the common case of single-day ranges) the
+    slot is the intersection of all of them, otherwise every window matched
+    by all the ranges is a slot. The slots are split at the midnights of
+    every range, so a slot is always within a single day of each range.
+
+    :param data: The ranges loaded with `RangeSchema`.
+    :type data: list
+    :param calendars: The holidays calendars per (country, year), they are
+        resolved when not given.
+    :type calendars: dict, optional
+    :return: The slots (dicts with `from_datetime` and `to_datetime` in UTC)
+        sorted by `from_datetime`.
+    :rtype: list
+    """
+    # First we validate something that we could not validate on marshmallow.
+    if len(data) == 0:
+        abort(422, "Invalid input type. The array is empty.")
+
+    # Step 1: Resolve at once the holidays of every country/year involved.
+    if calendars is None:
+        calendars = resolve_ranges_calendars(data)
+
+    # Step 2: Split the ranges into their windows on business days.
+    ranges_windows = []
+    for dt_range in data:
+        windows = _business_windows(dt_range, calendars)
+        if not windows:
+            # All the days are weekends or holidays, explain the first one.
+            _validate_special_dates(
+                dt_range["from_datetime"].date(),
+                dt_range["cc"],
+                calendars,
+                dt_range.get("subdivision"),
+            )
+        ranges_windows.append(windows)
+
+    # Step 3: Find the windows matched by all the ranges (in UTC).
+    if all(len(windows) == 1 for windows in ranges_windows):
+        ranges = Ranges()
+        for windows in ranges_windows:
+            ranges.append(*windows[0])
+        window = common_window(ranges)
+        slots = [] if window is None else [_to_slot(*window)]
+    else:
+        participants = []
+        for windows in ranges_windows:
+            ranges = Ranges()
+            for from_dt, to_dt in windows:
+                ranges.append(from_dt, to_dt)
+            participants.append(ranges)
+        slots = [
+            _to_slot(from_us, to_us)
+            for from_us, to_us in common_windows(participants)
+        ]
+
+    if not slots:
+        # Then there is not a slot when all ranges are intercepted.
+        abort(
+            400,
+            "There were no slots available where all these ranges matched.",
+        )
+    return slots
+
+
+def find_slots(
+    participants: list, min_participants: int = None, calendars: dict = None
+) -> list:
+    """Find every slot where at least `min_participants` of the participants
+    are available, ignoring their windows on weekends or holidays.
+
+    :param participants: The participants loaded with `ParticipantSchema`.
+    :type participants: list
+    :param min_participants: The participants needed in a slot, all of them
+        by default.
+    :type min_participants: int, optional
+    :param calendars: The holidays calendars per (country, year), they are
+        resolved when not given.
+    :type calendars: dict, optional
+    :return: The slots (dicts with `from_datetime`, `to_datetime` in UTC and
+        the `participants` available) ranked by the participants available
+        and then by their duration.
+    :rtype: list
+    """
+    # Step 1: Resolve at once the holidays of every country/year involved.
+    if calendars is None:
+        calendars = resolve_ranges_calendars(
+            dt_range
+            for participant in participants
+            for dt_range in participant["ranges"]
+        )
+
+    # Step 2: Keep the windows of every participant on business days.
+    participants_ranges = []
+    for participant in participants:
+        ranges = Ranges()
+        for dt_range in participant["ranges"]:
+            for from_dt, to_dt in _business_windows(dt_range, calendars):
+                ranges.append(from_dt, to_dt)
+        participants_ranges.append(ranges)
+
+    # Step 3: Find the windows and rank them.
+    windows = free_windows(
+        participants_ranges, min_participants or len(participants)
+    )
+    windows.sort(key=lambda w: (-w[2], w[0] - w[1], w[0]))
+    return [
+        {**_to_slot(from_us, to_us), "participants": available}
+        for from_us, to_us, available in windows
+    ]
+
+
+def validate_batch(queries, max_size: int):
+    """Check that the body of a batch is an array of queries.
+
+    :param queries: The decoded JSON body.
+    :param max_size: The queries allowed in a batch.
+    :type max_size: int
+    """
+    if not isinstance(queries, list):
+        abort(422, "Invalid input type.")
+    if len(queries) == 0:
+        abort(422, "Invalid input type. The array is empty.")
+    if len(queries) > max_size:
+        abort(
+            422,
+            f"The batch must not contain more than {max_size} queries.",
+        )
+
+
+@metrics.timed("parse")
+def load_batch(queries: list) -> list:
+    """Validate every query of a batch.
+
+    :param queries: The raw (JSON decoded) queries.
+    :type queries: list
+    :return: The ranges loaded for every valid query and the validation
+        errors (a dict) for the rest.
+    :rtype: list
+    """
+    loaded_queries = []
+    for query in queries:
+        try:
+            loaded_queries.append(load_ranges(query))
+        except ValidationError as e:
+            loaded_queries.append({"json": e.messages})
+    return loaded_queries
+
+
+def batch_calendar_keys(loaded_queries: list) -> set:
+    """Return the holidays calendars needed by the valid queries of a batch.
+
+    :param loaded_queries: The queries loaded with `load_batch`.
+    :type loaded_queries: list
+    :return: The (country, year) keys of the calendars.
+    :rtype: set
+    """
+    return ranges_calendar_keys(
+        dt_range
+        for data in loaded_queries
+        if isinstance(data, list)
+        for dt_range in data
+    )
+
+
+def check_loaded_batch(
+    loaded_queries: list, calendars: dict, calendar_errors: dict = None
+) -> list:
+    """Check every query of a batch loaded with `load_batch`.
+
+    :param loaded_queries: The queries loaded with `load_batch`.
+    :type loaded_queries: list
+    :param calendars: The holidays calendars per (country, year).
+    :type calendars: dict
+    :param calendar_errors: The error of every (country, year) calendar
+        that could not be resolved, the queries needing it fail with it.
+    :type calendar_errors: dict, optional
+    :return: The result of every query, a dict with the `status` and the
+        `body` that `/availability-check` would have responded.
+    :rtype: list
+    """
+    results = []
+    for data in loaded_queries:
+        if isinstance(data, dict):
+            results.append({"status": 422, "body": {"errors": data}})
+            continue
+        try:
+            if calendar_errors:
+                for key in sorted(ranges_calendar_keys(data)):
+                    if key in calendar_errors:
+                        raise calendar_errors[key]
+            slots = check_availability(data, calendars)
+        except HTTPException as e:
+            errors_data, code = format_error(e)
+            results.append({"status": code, "body": {"errors": errors_data}})
+        else:
+            results.append({"status": 200, "body": dump_slots(slots)})
+    return results
+
+
+def check_availability_batch(queries: list) -> list:
+    """Check the availability of several independent queries, each one an
+    array of ranges like the body of `/availability-check`.
+
+    The queries are validated one by one and the holidays of all the valid
+    ones are resolved at once. A query failing does not affect the others,
+    not even when the holidays it needs cannot be resolved.
+
+    :param queries: The raw (JSON decoded) queries.
+    :type queries: list
+    :return: The result of every query, a dict with the `status` and the
+        `body` that `/availability-check` would have responded.
+    :rtype: list
+    """
+    loaded_queries = load_batch(queries)
+    calendars, calendar_errors = resolve_calendars_by_key(
+        batch_calendar_keys(loaded_queries)
+    )
+    return check_loaded_batch(loaded_queries, calendars, calendar_errors)
+
+
+def decode_ndjson_line(line):
+    """Decode a line of a newline-delimited JSON stream of queries.
+
+    :param line: The line (str or bytes).
+    :return: The query, None when the line is not valid JSON (the batch
+        check then reports it as an invalid query).
+    """
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def iter_ndjson_results(lines, chunk_size: int = 100):
+    """Check the availability of the queries of a newline-delimited JSON
+    stream, one query (an array of ranges) per line.
+
+    The lines are consumed lazily and checked in chunks of `chunk_size`
+    queries (sharing the holidays resolution), so the memory used does not
+    depend on the size of the stream. Blank lines are skipped.
+
+    :param lines: The lines of the stream (str or bytes).
+    :type lines: iterable
+    :param chunk_size: The queries checked together.
+    :type chunk_size: int, optional
+    :return: The result of every query, like `check_availability_batch`.
+    :rtype: generator
+    """
+    chunk = []
+    for line in lines:
+        if not line.strip():
+            continue
+        chunk.append(decode_ndjson_line(line))
+        if len(chunk) >= chunk_size:
+            yield from check_availability_batch(chunk)
+            chunk = []
+    if chunk:
+        yield from check_availability_batch(chunk)
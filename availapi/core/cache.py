@@ -1,8 +1,58 @@
-import os
-
 import redis
-from dotenv import load_dotenv
+import redis.asyncio
+
+
+def _pool_kwargs(config, unix_connection_class) -> dict:
+    """Build the connection pool arguments described by the config."""
+    kwargs = {
+        "max_connections": config["REDIS_MAX_CONNECTIONS"],
+        "db": config["REDIS_DB"],
+        "socket_timeout": config["REDIS_SOCKET_TIMEOUT"],
+        "health_check_interval": config["REDIS_HEALTH_CHECK_INTERVAL"],
+    }
+    if config["REDIS_UNIX_SOCKET"]:
+        kwargs.update(
+            connection_class=unix_connection_class,
+            path=config["REDIS_UNIX_SOCKET"],
+        )
+    else:
+        kwargs.update(
+            host=config["REDIS_HOST"],
+            port=config["REDIS_PORT"],
+            socket_connect_timeout=config["REDIS_CONNECT_TIMEOUT"],
+        )
+    return kwargs
+
+
+def create_redis_client(config) -> redis.Redis:
+    """Create a redis client backed by its own connection pool.
+
+    No connection is opened here, the pool connects on the first command and
+    then reuses the connections (up to `REDIS_MAX_CONNECTIONS`).
+
+    :param config: The application config.
+    :type config: dict
+    :return: The redis client.
+    :rtype: redis.Redis
+    """
+    pool = redis.ConnectionPool(
+        **_pool_kwargs(config, redis.UnixDomainSocketConnection)
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def create_async_redis_client(config) -> redis.asyncio.Redis:
+    """Create an asyncio redis client backed by its own connection pool,
+    like `create_redis_client`.
 
-load_dotenv()
+    The pool is bound to the event loop where it is first used.
 
-r = redis.Redis(host=os.environ["REDIS_HOST"], port=os.environ["REDIS_PORT"])
+    :param config: The application config.
+    :type config: dict
+    :return: The redis client.
+    :rtype: redis.asyncio.Redis
+    """
+    pool = redis.asyncio.ConnectionPool(
+        **_pool_kwargs(config, redis.asyncio.UnixDomainSocketConnection)
+    )
+    return redis.asyncio.Redis(connection_pool=pool)
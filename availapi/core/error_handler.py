@@ -1,18 +1,30 @@
 from flask import jsonify
 
 
+def format_error(err) -> tuple:
+    """Build the errors data of the responses for an error.
+
+    :param err: The error raised (usually with `flask.abort`).
+    :type err: werkzeug.exceptions.HTTPException
+    :return: The errors data and the status code.
+    :rtype: tuple
+    """
+    if err.code == 422:
+        if hasattr(err, "data"):
+            # Entering here meaning that the error was generated by marshmallow.
+            errors_data = err.data["messages"]
+        else:
+            # Otherwise was a message generated from the flask.abort function.
+            errors_data = {"json": {"_schema": [err.description]}}
+    else:
+        errors_data = err.description
+    return errors_data, err.code
+
+
 # Return validation errors as JSON
 def configure_error_handlers(app):
     @app.errorhandler(422)
     @app.errorhandler(400)
     def handle_errors(err):
-        if err.code == 422:
-            if hasattr(err, "data"):
-                # Entering here meaning that the error was generated by marshmallow.
-                errors_data = err.data["messages"]
-            else:
-                # Otherwise was a message generated from the flask.abort function.
-                errors_data = {"json": {"_schema": [err.description]}}
-        elif err.code == 400:
-            errors_data = err.description
-        return jsonify({"errors": errors_data}), err.code
+        errors_data, code = format_error(err)
+        return jsonify({"errors": errors_data}), code
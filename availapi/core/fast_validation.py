@@ -0,0 +1,166 @@
+import functools
+import re
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app, request
+from marshmallow.utils import get_fixed_timezone
+from webargs.flaskparser import parser
+
+from availapi.utils.countries import supported_countries
+
+from . import metrics
+from .schemas import MAX_RANGE_DAYS, SUBDIVISION_RE, RangeSchema
+
+COUNTRY_CODES = frozenset(supported_countries)
+RANGE_KEYS = frozenset(("from", "to", "cc"))
+SUBDIVISION_RANGE_KEYS = RANGE_KEYS | {"subdivision"}
+MAX_RANGE_SPAN = timedelta(days=MAX_RANGE_DAYS)
+
+# Schemas are stateless, a single instance is shared by the requests.
+ranges_schema = RangeSchema(many=True)
+
+# The common RFC 3339 subset accepted by the fast path, every value it
+# matches is parsed by `AwareDateTime` into the same datetime. Anything else
+# goes through marshmallow.
+_datetime_re = re.compile(
+    r"(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d{1,6}))?(Z|[+-]\d{2}:\d{2})"
+)
+
+# Timezones per offset, built like marshmallow does so the loaded datetimes
+# are the same objects it would return.
+_timezones = {"Z": timezone.utc}
+
+_subdivision_re = re.compile(SUBDIVISION_RE)
+
+
+def _timezone(offset: str) -> timezone:
+    """Return the timezone of an offset.
+
+    :raises ValueError: When the offset is not less than 24 hours.
+    """
+    tzinfo = _timezones.get(offset)
+    if tzinfo is None:
+        minutes = 60 * int(offset[1:3]) + int(offset[4:6])
+        tzinfo = get_fixed_timezone(-minutes if offset[0] == "-" else minutes)
+        _timezones[offset] = tzinfo
+    return tzinfo
+
+
+def _parse_datetime(value):
+    """Parse an RFC 3339 datetime with `datetime.fromisoformat`.
+
+    :return: The aware datetime or None when the value is not in the subset
+        handled here.
+    :rtype: datetime
+    """
+    if type(value) is not str:
+        return None
+    match = _datetime_re.fullmatch(value)
+    if match is None:
+        return None
+    local, fraction, offset = match.groups()
+    try:
+        # Python 3.8 only parses fractions of 3 or 6 digits.
+        dt = datetime.fromisoformat(
+            f"{local}.{(fraction or '').ljust(6, '0')}"
+        )
+        tzinfo = _timezone(offset)
+    except ValueError:
+        return None
+    return dt.replace(tzinfo=tzinfo)
+
+
+def fast_load_ranges(payload):
+    """Load the ranges of an `/availability-check` body without marshmallow.
+
+    Only the valid bodies are handled, the result is then the same that
+    `RangeSchema(many=True).load` returns. For anything else None is
+    returned and the body must go through the schema, which reports the
+    detailed errors.
+
+    :param payload: The decoded JSON body.
+    :return: The loaded ranges or None.
+    :rtype: list
+    """
+    if type(payload) is not list:
+        return None
+
+    data = []
+    for item in payload:
+        if type(item) is not dict:
+            return None
+        keys = item.keys()
+        if keys != RANGE_KEYS and keys != SUBDIVISION_RANGE_KEYS:
+            return None
+        cc = item["cc"]
+        if type(cc) is not str or cc not in COUNTRY_CODES:
+            return None
+        # A null `subdivision` is an error of the schema, not a missing one.
+        subdivision = item.get("subdivision")
+        if len(keys) == len(SUBDIVISION_RANGE_KEYS) and (
+            type(subdivision) is not str
+            or _subdivision_re.match(subdivision) is None
+            or not subdivision.startswith(f"{cc}-")
+        ):
+            return None
+        from_datetime = _parse_datetime(item["from"])
+        to_datetime = _parse_datetime(item["to"])
+        if (
+            from_datetime is None
+            or to_datetime is None
+            or from_datetime > to_datetime
+            or to_datetime - from_datetime > MAX_RANGE_SPAN
+        ):
+            return None
+        dt_range = {
+            "from_datetime": from_datetime,
+            "to_datetime": to_datetime,
+            "cc": cc,
+        }
+        if subdivision is not None:
+            dt_range["subdivision"] = subdivision
+        data.append(dt_range)
+    return data
+
+
+def load_ranges(payload) -> list:
+    """Load the ranges of an `/availability-check` body, trying the fast
+    path first when `FAST_VALIDATION` is enabled.
+
+    :param payload: The decoded JSON body.
+    :raises ValidationError: When the body is not valid.
+    :return: The loaded ranges.
+    :rtype: list
+    """
+    if current_app.config["FAST_VALIDATION"]:
+        data = fast_load_ranges(payload)
+        if data is not None:
+            return data
+    return ranges_schema.load(payload)
+
+
+@metrics.timed("parse")
+def parse_ranges_args() -> list:
+    """Parse the ranges of the body of the current request like
+    `use_args(RangeSchema(many=True), location="json")`, but trying the fast
+    path first when `FAST_VALIDATION` is enabled. The failures are always
+    parsed by webargs so the error bodies do not change.
+
+    :return: The loaded ranges.
+    :rtype: list
+    """
+    if current_app.config["FAST_VALIDATION"]:
+        data = fast_load_ranges(request.get_json(silent=True))
+        if data is not None:
+            return data
+    return parser.parse(ranges_schema, location="json")
+
+
+def use_ranges_args(view):
+    """Decorate a view to receive the ranges parsed by `parse_ranges_args`."""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        return view(parse_ranges_args(), *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,221 @@
+import random
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# The clients with a name, whose stats are exposed by the metrics.
+_named_clients = weakref.WeakSet()
+
+
+def named_clients() -> list:
+    """Return the HTTP clients with a name alive in this process.
+
+    :return: The clients.
+    :rtype: list
+    """
+    return list(_named_clients)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop sending requests to an upstream that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and the
+    requests are rejected right away. Once `reset_timeout` seconds passed,
+    the circuit is half open: a single request is let through and depending
+    on its result the circuit closes or opens again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.counters = {
+            "successes": 0,
+            "failures": 0,
+            "rejections": 0,
+            "opened": 0,
+        }
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow_request(self) -> bool:
+        """Check whether a request can be sent, counting it as rejected
+        otherwise.
+
+        :return: Whether the request can be sent.
+        :rtype: bool
+        """
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.counters["rejections"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.counters["successes"] += 1
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            if (
+                self._trial_running
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                if self.state != self.OPEN:
+                    self.counters["opened"] += 1
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+    def stats(self) -> dict:
+        """Return the state of the circuit and its counters.
+
+        :return: A dict with the `state` and the counters.
+        :rtype: dict
+        """
+        return {"state": self.state, **self.counters}
+
+
+class RateLimiter:
+    """Space the calls evenly so there are at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self.next_at = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class HttpClient:
+    """HTTP client sharing a pool of keep-alive connections.
+
+    Every request is bounded by the connect/read timeouts, the connection
+    errors and 5xx/429 responses are retried with a jittered exponential
+    backoff and the whole call goes through a circuit breaker so a degraded
+    upstream fails fast instead of pinning the workers.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10,
+        retries: int = 2,
+        backoff: float = 0.2,
+        circuit_breaker: CircuitBreaker = None,
+        name: str = None,
+    ):
+        self.name = name
+        if name is not None:
+            _named_clients.add(self)
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.counters = {"requests": 0, "retries": 0, "errors": 0}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @staticmethod
+    def _should_retry(response: requests.Response) -> bool:
+        return response.status_code >= 500 or response.status_code == 429
+
+    def get(self, url: str, params: dict = None) -> requests.Response:
+        """Send a GET request.
+
+        :param url: The URL to request.
+        :type url: str
+        :param params: The query string params.
+        :type params: dict, optional
+        :raises CircuitOpenError: When the circuit is open.
+        :raises requests.RequestException: When the request kept failing.
+        :return: The response, which could be an error one if the retries
+            were exhausted.
+        :rtype: requests.Response
+        """
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError(f"The circuit of {url} is open.")
+
+        # The circuit hears about the call whatever happens, or a trial
+        # request failing unexpectedly would leave it half open forever.
+        succeeded = False
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt > 0:
+                    self.counters["retries"] += 1
+                    time.sleep(
+                        self.backoff
+                        * 2 ** (attempt - 1)
+                        * random.uniform(0.5, 1.5)
+                    )
+
+                self.counters["requests"] += 1
+                error = None
+                try:
+                    response = self.session.get(
+                        url, params=params, timeout=self.timeout
+                    )
+                except requests.RequestException as e:
+                    error = e
+                else:
+                    if not self._should_retry(response):
+                        succeeded = True
+                        return response
+        finally:
+            if succeeded:
+                self.circuit_breaker.record_success()
+            else:
+                self.counters["errors"] += 1
+                self.circuit_breaker.record_failure()
+
+        if error is not None:
+            raise error
+        return response
+
+    def stats(self) -> dict:
+        """Return the counters of the client and the circuit breaker.
+
+        :return: A dict with the counters and the `circuit` stats.
+        :rtype: dict
+        """
+        return {**self.counters, "circuit": self.circuit_breaker.stats()}
@@ -0,0 +1,52 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the default provider is used then.
+    orjson = None
+
+COMPACT_SEPARATORS = (",", ":")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider serializing the compact output with orjson.
+
+    The output is byte-identical to the default provider: the keys are
+    sorted and anything orjson would write differently (non-ASCII text,
+    non-string keys, dates, dataclasses, pretty printing) is serialized by
+    the default provider instead. Floats are not expected in the responses,
+    orjson does not write the exponent of the large ones like `json` does.
+    """
+
+    OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+        if orjson is not None
+        else 0
+    )
+
+    def dumps(self, obj, **kwargs) -> str:
+        if (
+            kwargs.get("separators") == COMPACT_SEPARATORS
+            and kwargs.keys() <= {"separators"}
+            and self.sort_keys
+            and self.ensure_ascii
+        ):
+            try:
+                data = orjson.dumps(obj, option=self.OPTIONS)
+            except TypeError:
+                pass
+            else:
+                if data.isascii():
+                    return data.decode("ascii")
+        return super().dumps(obj, **kwargs)
+
+
+def configure_json_provider(app):
+    """Use orjson for the JSON responses when `ORJSON_ENABLED` is set and it
+    is installed.
+    """
+    if app.config["ORJSON_ENABLED"] and orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,99 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+# The caches with a name, whose stats are exposed by the metrics.
+_named_caches = weakref.WeakSet()
+
+
+def named_caches() -> list:
+    """Return the caches with a name alive in this process.
+
+    :return: The caches.
+    :rtype: list
+    """
+    return list(_named_caches)
+
+
+class LocalCache:
+    """A bounded, thread-safe in-process cache.
+
+    Entries expire after `ttl` seconds and, once `max_size` entries are
+    stored, the least recently used one is evicted. The cache also keeps
+    hit/miss counters to be able to check how effective it is at runtime.
+    """
+
+    def __init__(self, max_size: int, ttl: float, name: str = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        if name is not None:
+            _named_caches.add(self)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Return the value stored for the key if it has not expired.
+
+        :param key: The key to search.
+        :param default: The value returned when the key is missing.
+        :return: The cached value or the default one.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: float = None):
+        """Store a value, evicting the least recently used entry if needed.
+
+        :param key: The key of the entry.
+        :param value: The value to store.
+        :param ttl: Seconds before the entry expires, defaults to `self.ttl`.
+        :type ttl: float, optional
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove an entry and return its value."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        """Remove all the entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the size and the hit/miss counters of the cache.
+
+        :return: A dict with the `size`, `max_size`, `hits` and `misses`.
+        :rtype: dict
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
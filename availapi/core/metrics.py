@@ -0,0 +1,368 @@
+"""Prometheus metrics of the service, exposed by `/metrics` when
+`METRICS_ENABLED` is set.
+
+The stages of a request are measured with `timed` and `timer`, which only
+check a global when the metrics are disabled.
+"""
+import contextlib
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, abort, g, request
+
+from .http import CircuitBreaker, named_clients
+from .local_cache import named_caches
+
+# Upper bounds (seconds) of the buckets of the latency histograms.
+BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+METRICS = {
+    "availapi_requests_total": ("counter", "Requests served."),
+    "availapi_request_duration_seconds": (
+        "histogram",
+        "Latency of the requests.",
+    ),
+    "availapi_stage_duration_seconds": (
+        "histogram",
+        "Latency of the stages of the requests.",
+    ),
+    "availapi_cache_hits_total": ("counter", "Lookups found in a cache."),
+    "availapi_cache_misses_total": ("counter", "Lookups missing in a cache."),
+    "availapi_cache_errors_total": ("counter", "Lookups failed in a cache."),
+    "availapi_cache_size": ("gauge", "Entries stored in a cache."),
+    "availapi_upstream_requests_total": (
+        "counter",
+        "Requests sent to an upstream, the retries included.",
+    ),
+    "availapi_upstream_retries_total": (
+        "counter",
+        "Requests retried to an upstream.",
+    ),
+    "availapi_upstream_errors_total": (
+        "counter",
+        "Calls to an upstream failed after the retries.",
+    ),
+    "availapi_upstream_rejections_total": (
+        "counter",
+        "Calls to an upstream rejected by its open circuit.",
+    ),
+    "availapi_upstream_circuit_state": (
+        "gauge",
+        "State of the circuit of an upstream (1 for the current one).",
+    ),
+}
+
+# The registry while the metrics are enabled, None otherwise.
+registry = None
+
+
+class Histogram:
+    """Observations counted in cumulative buckets, with their sum."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """The counters and histograms of this process, per name and labels."""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def add_collector(self, collector):
+        """Add a function returning (name, labels, value) samples read when
+        the metrics are rendered, for the values kept elsewhere (like the
+        counters of the caches).
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format.
+
+        :return: The metrics.
+        :rtype: str
+        """
+        samples = []
+        with self._lock:
+            samples.extend(
+                (name, labels, value)
+                for (name, labels), value in self.counters.items()
+            )
+            histograms = [
+                (name, labels, list(h.counts), h.sum, h.count)
+                for (name, labels), h in self.histograms.items()
+            ]
+        for collector in self.collectors:
+            samples.extend(
+                (name, tuple(sorted(labels.items())), value)
+                for name, labels, value in collector()
+            )
+
+        families = {}
+        for name, labels, value in sorted(samples):
+            families.setdefault(name, []).append(
+                f"{name}{_format_labels(labels)} {value}"
+            )
+        for name, labels, counts, total, count in sorted(histograms):
+            lines = families.setdefault(name, [])
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{name}_bucket"
+                    f"{_format_labels(labels + (('le', bound),))} "
+                    f"{cumulative}"
+                )
+            lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        rendered = []
+        for name in sorted(families):
+            metric_type, help_text = METRICS[name]
+            rendered.append(f"# HELP {name} {help_text}")
+            rendered.append(f"# TYPE {name} {metric_type}")
+            rendered.extend(families[name])
+        return "\n".join(rendered) + "\n"
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+def enable():
+    """Start collecting the metrics in a new registry."""
+    global registry
+    metrics_registry = Registry()
+    metrics_registry.add_collector(_collect_caches)
+    metrics_registry.add_collector(_collect_upstreams)
+    registry = metrics_registry
+
+
+def disable():
+    """Stop collecting the metrics."""
+    global registry
+    registry = None
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Increment a counter, when the metrics are enabled."""
+    metrics_registry = registry
+    if metrics_registry is not None:
+        metrics_registry.inc(name, value, **labels)
+
+
+def _collect_caches():
+    """Read the counters of the in-process caches with a name, added up per
+    name.
+    """
+    totals = {}
+    for cache in named_caches():
+        stats = cache.stats()
+        cache_totals = totals.setdefault(
+            cache.name, {"hits": 0, "misses": 0, "size": 0}
+        )
+        for stat in cache_totals:
+            cache_totals[stat] += stats[stat]
+    for name, cache_totals in totals.items():
+        labels = {"cache": name}
+        yield "availapi_cache_hits_total", labels, cache_totals["hits"]
+        yield "availapi_cache_misses_total", labels, cache_totals["misses"]
+        yield "availapi_cache_size", labels, cache_totals["size"]
+
+
+def _collect_upstreams():
+    """Read the counters and circuit state of the HTTP clients with a name,
+    added up per name.
+    """
+    totals = {}
+    for client in named_clients():
+        stats = client.stats()
+        circuit = stats["circuit"]
+        upstream_totals = totals.setdefault(
+            client.name,
+            {
+                "requests": 0,
+                "retries": 0,
+                "errors": 0,
+                "rejections": 0,
+                "state": CircuitBreaker.CLOSED,
+            },
+        )
+        for stat in ("requests", "retries", "errors"):
+            upstream_totals[stat] += stats[stat]
+        upstream_totals["rejections"] += circuit["rejections"]
+        if circuit["state"] != CircuitBreaker.CLOSED:
+            upstream_totals["state"] = circuit["state"]
+    for name, upstream_totals in totals.items():
+        labels = {"upstream": name}
+        for stat in ("requests", "retries", "errors", "rejections"):
+            yield (
+                f"availapi_upstream_{stat}_total",
+                labels,
+                upstream_totals[stat],
+            )
+        for state in (
+            CircuitBreaker.CLOSED,
+            CircuitBreaker.OPEN,
+            CircuitBreaker.HALF_OPEN,
+        ):
+            yield (
+                "availapi_upstream_circuit_state",
+                {**labels, "state": state},
+                int(upstream_totals["state"] == state),
+            )
+
+
+@contextlib.contextmanager
+def _timer(metrics_registry: Registry, stage: str):
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics_registry.observe(
+            "availapi_stage_duration_seconds",
+            time.perf_counter() - started_at,
+            stage=stage,
+        )
+
+
+_null_timer = contextlib.nullcontext()
+
+
+def timer(stage: str):
+    """Measure the latency of a block as a stage of the request.
+
+    :param stage: The name of the stage. Example: redis
+    :type stage: str
+    :return: The context manager.
+    """
+    metrics_registry = registry
+    if metrics_registry is None:
+        return _null_timer
+    return _timer(metrics_registry, stage)
+
+
+def timed(stage: str):
+    """Decorate a function to measure its latency as a stage of the
+    request.
+
+    :param stage: The name of the stage. Example: serialize
+    :type stage: str
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics_registry = registry
+            if metrics_registry is None:
+                return func(*args, **kwargs)
+            started_at = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics_registry.observe(
+                    "availapi_stage_duration_seconds",
+                    time.perf_counter() - started_at,
+                    stage=stage,
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def _start_request():
+    if registry is not None:
+        g.metrics_started_at = time.perf_counter()
+
+
+def _end_request(response):
+    metrics_registry = registry
+    started_at = g.pop("metrics_started_at", None)
+    if metrics_registry is not None and started_at is not None:
+        endpoint = (
+            "unmatched" if request.url_rule is None else request.url_rule.rule
+        )
+        metrics_registry.inc(
+            "availapi_requests_total",
+            endpoint=endpoint,
+            method=request.method,
+            status=response.status_code,
+        )
+        metrics_registry.observe(
+            "availapi_request_duration_seconds",
+            time.perf_counter() - started_at,
+            endpoint=endpoint,
+        )
+    return response
+
+
+def metrics_endpoint():
+    """Expose the metrics in the Prometheus text format."""
+    metrics_registry = registry
+    if metrics_registry is None:
+        abort(404)
+    return Response(
+        metrics_registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def configure_metrics(app):
+    """Collect the metrics of the app when `METRICS_ENABLED` is set,
+    counting and timing its requests and exposing them in `/metrics`.
+
+    :param app: The application.
+    :type app: Flask
+    """
+    if app.config["METRICS_ENABLED"]:
+        enable()
+    app.before_request(_start_request)
+    app.after_request(_end_request)
+    app.add_url_rule("/metrics", "metrics", metrics_endpoint)
@@ -0,0 +1,279 @@
+"""Opt-in profiling of the requests, enabled with `PROFILING_ENABLED`.
+
+A share of the requests (`PROFILING_SAMPLE_RATE`) is profiled with cProfile
+and, when `PROFILING_SLOW_THRESHOLD` is set, the stack of the requests
+running for longer than it is sampled until they finish. The profiles are
+written to a bounded directory and listed by `/debug/profiles`.
+"""
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import abort, jsonify, send_from_directory
+
+_slug_re = re.compile(r"[^A-Za-z0-9]+")
+
+
+class ProfileStore:
+    """Ring buffer of profiles on disk: once `max_files` are stored, the
+    oldest one is removed.
+    """
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def new_path(self, environ: dict, elapsed: float, extension: str) -> str:
+        """Return the path of a new profile of a request, named after the
+        time, the request and its latency so they sort by time.
+        """
+        slug = _slug_re.sub(
+            "_",
+            f"{environ.get('REQUEST_METHOD', '')} "
+            f"{environ.get('PATH_INFO', '')}",
+        ).strip("_")[:60]
+        return os.path.join(
+            self.directory,
+            f"{time.time_ns() // 1000}-{slug}-{elapsed * 1000:.0f}ms."
+            f"{extension}",
+        )
+
+    def list(self) -> list:
+        """Return the names of the profiles stored, the newest first.
+
+        :return: The names.
+        :rtype: list
+        """
+        return sorted(
+            (name for name in os.listdir(self.directory) if name[0] != "."),
+            reverse=True,
+        )
+
+    def prune(self):
+        """Remove the oldest profiles beyond `max_files`."""
+        with self._lock:
+            for name in self.list()[self.max_files :]:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+def _fold_stack(frame) -> str:
+    """Return the stack of a frame in the folded format (outermost first,
+    separated by `;`) used by the flame graph tools.
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__')}.{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class _InFlight:
+    __slots__ = ("started_at", "stacks")
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stacks = Counter()
+
+
+class SlowRequestSampler:
+    """Sample every `interval` seconds the stack of the requests running for
+    longer than `threshold` seconds, from a background thread.
+    """
+
+    def __init__(self, threshold: float, interval: float = 0.005):
+        self.threshold = threshold
+        self.interval = interval
+        self.in_flight = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="slow-request-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            frames = None
+            for ident, request in list(self.in_flight.items()):
+                if now - request.started_at < self.threshold:
+                    continue
+                if frames is None:
+                    frames = sys._current_frames()
+                frame = frames.get(ident)
+                if frame is not None:
+                    request.stacks[_fold_stack(frame)] += 1
+
+    def begin(self) -> _InFlight:
+        """Start watching the request running in the current thread."""
+        self._start()
+        request = _InFlight()
+        self.in_flight[threading.get_ident()] = request
+        return request
+
+    def end(self):
+        """Stop watching the request running in the current thread."""
+        self.in_flight.pop(threading.get_ident(), None)
+
+
+class _ClosingIterable:
+    """Iterate the response of a request, with the profile given enabled
+    while every chunk is produced, and call `on_close` once it is closed.
+    """
+
+    def __init__(self, app_iter, on_close, profile=None):
+        self.app_iter = iter(app_iter)
+        self.closable = app_iter
+        self.on_close = on_close
+        self.profile = profile
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.profile is None:
+            return next(self.app_iter)
+        self.profile.enable()
+        try:
+            return next(self.app_iter)
+        finally:
+            self.profile.disable()
+
+    def close(self):
+        try:
+            if hasattr(self.closable, "close"):
+                self.closable.close()
+        finally:
+            self.on_close()
+
+
+class ProfilingMiddleware:
+    """WSGI middleware profiling a sample of the requests.
+
+    A request is profiled with cProfile with a probability of `sample_rate`
+    (a `.prof` file, readable with `pstats`). When `slow_threshold` is set,
+    the other requests are watched by a `SlowRequestSampler` and the stacks
+    sampled from the ones exceeding it are saved in the folded format (a
+    `.folded` file, readable with the flame graph tools). The requests not
+    sampled nor watched go straight to the app.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore,
+        sample_rate: float = 0.01,
+        slow_threshold: float = None,
+        sample_interval: float = 0.005,
+        excluded_prefix: str = "/debug/profiles",
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.sampler = (
+            SlowRequestSampler(slow_threshold, sample_interval)
+            if slow_threshold
+            else None
+        )
+        self.excluded_prefix = excluded_prefix
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO", "").startswith(self.excluded_prefix):
+            return self.app(environ, start_response)
+        if self.sample_rate and random.random() < self.sample_rate:
+            return self._profile(environ, start_response)
+        if self.sampler is not None:
+            return self._watch(environ, start_response)
+        return self.app(environ, start_response)
+
+    def _profile(self, environ, start_response):
+        profile = cProfile.Profile()
+        started_at = time.perf_counter()
+
+        def save():
+            elapsed = time.perf_counter() - started_at
+            profile.dump_stats(self.store.new_path(environ, elapsed, "prof"))
+            self.store.prune()
+
+        profile.enable()
+        try:
+            app_iter = self.app(environ, start_response)
+        except Exception:
+            profile.disable()
+            save()
+            raise
+        profile.disable()
+        return _ClosingIterable(app_iter, save, profile)
+
+    def _watch(self, environ, start_response):
+        request = self.sampler.begin()
+
+        def save():
+            self.sampler.end()
+            if request.stacks:
+                elapsed = time.perf_counter() - request.started_at
+                path = self.store.new_path(environ, elapsed, "folded")
+                with open(path, "w") as f:
+                    f.writelines(
+                        f"{stack} {count}\n"
+                        for stack, count in request.stacks.items()
+                    )
+                self.store.prune()
+
+        try:
+            app_iter = self.app(environ, start_response)
+        except Exception:
+            save()
+            raise
+        return _ClosingIterable(app_iter, save)
+
+
+def configure_profiling(app):
+    """Profile a sample of the requests of the app when `PROFILING_ENABLED`
+    is set, and expose the profiles in `/debug/profiles`.
+
+    :param app: The application.
+    :type app: Flask
+    """
+    if not app.config["PROFILING_ENABLED"]:
+        return
+
+    store = ProfileStore(
+        app.config["PROFILING_DIR"], app.config["PROFILING_MAX_FILES"]
+    )
+    app.wsgi_app = ProfilingMiddleware(
+        app.wsgi_app,
+        store,
+        sample_rate=app.config["PROFILING_SAMPLE_RATE"],
+        slow_threshold=app.config["PROFILING_SLOW_THRESHOLD"],
+        sample_interval=app.config["PROFILING_SAMPLE_INTERVAL"],
+    )
+
+    def list_profiles():
+        return jsonify(store.list())
+
+    def download_profile(name):
+        if name not in store.list():
+            abort(404)
+        return send_from_directory(store.directory, name, as_attachment=True)
+
+    app.add_url_rule("/debug/profiles", "list_profiles", list_profiles)
+    app.add_url_rule(
+        "/debug/profiles/<name>", "download_profile", download_profile
+    )
@@ -0,0 +1,166 @@
+import functools
+import hashlib
+
+from flask import Response, current_app, request
+from werkzeug.exceptions import HTTPException
+
+from ..utils.holiday_providers import holidays_version
+from ..utils.intersection import to_epoch_us
+from .availability import ranges_calendar_keys
+from .fast_validation import parse_ranges_args
+from .local_cache import LocalCache
+
+
+class CachedResult:
+    """A response of `/availability-check` ready to be sent again, along
+    with the versions of the holidays calendars it was computed with.
+    """
+
+    __slots__ = ("status", "body", "etag", "versions")
+
+    def __init__(self, status: int, body: bytes, versions: tuple = ()):
+        self.status = status
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.versions = versions
+
+    def is_current(self) -> bool:
+        """Whether none of the holidays it was computed with were fetched
+        again since then.
+        """
+        return all(
+            holidays_version(*key) == version for key, version in self.versions
+        )
+
+    def to_response(self) -> Response:
+        """Build the response, a `304 Not Modified` one when the client
+        already has this body.
+        """
+        if request.if_none_match.contains_weak(self.etag):
+            response = Response(status=304)
+        else:
+            response = Response(
+                self.body, self.status, content_type="application/json"
+            )
+        response.set_etag(self.etag)
+        return response
+
+
+def get_result_cache() -> LocalCache:
+    """Return the result cache of the current app, building it from the app
+    config on the first call.
+
+    :return: The cache.
+    :rtype: LocalCache
+    """
+    cache = current_app.extensions.get("result_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault(
+            "result_cache",
+            LocalCache(
+                current_app.config["RESULT_CACHE_MAX_SIZE"],
+                current_app.config["RESULT_CACHE_TTL"],
+                name="results",
+            ),
+        )
+    return cache
+
+
+def normalize_ranges(data: list) -> tuple:
+    """Return the canonical form of the ranges given, the same for all the
+    bodies describing the same query.
+
+    Every range is its UTC bounds, the offset it was given with (its days are
+    split at the midnights of that offset), the country and the subdivision.
+    The order is kept, since the errors explain the first range without
+    business days.
+
+    :param data: The ranges loaded with `RangeSchema`.
+    :type data: list
+    :return: The normalized ranges.
+    :rtype: tuple
+    """
+    return tuple(
+        (
+            to_epoch_us(dt_range["from_datetime"]),
+            to_epoch_us(dt_range["to_datetime"]),
+            dt_range["from_datetime"].utcoffset(),
+            dt_range["to_datetime"].utcoffset(),
+            dt_range["cc"],
+            dt_range.get("subdivision"),
+        )
+        for dt_range in data
+    )
+
+
+def calendar_versions(data: list) -> tuple:
+    """Return the current version of every holidays calendar needed by the
+    ranges given.
+
+    :param data: The ranges loaded with `RangeSchema`.
+    :type data: list
+    :return: The ((country, year), version) pairs.
+    :rtype: tuple
+    """
+    return tuple(
+        (key, holidays_version(*key))
+        for key in sorted(ranges_calendar_keys(data))
+    )
+
+
+def cache_results(view):
+    """Decorate the view of `/availability-check` to receive the ranges
+    parsed by `parse_ranges_args` (like `use_ranges_args`), caching its
+    responses when `RESULT_CACHE_ENABLED` is set.
+
+    The responses are cached by the digest of the request body, so a query
+    polled again is answered without parsing it, and by the normalized
+    ranges, so the bodies written differently share the result. The
+    successes and the deterministic errors (no slot, weekend, holiday) are
+    cached, along with the versions of the holidays calendars they were
+    computed with so they are not used once the holidays of one of their
+    countries and years are fetched again.
+
+    The responses carry an `ETag` and a request whose `If-None-Match`
+    matches it gets a `304 Not Modified` without body.
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_app.config["RESULT_CACHE_ENABLED"]:
+            return view(parse_ranges_args(), *args, **kwargs)
+
+        cache = get_result_cache()
+        body_key = (
+            "body",
+            request.mimetype,
+            hashlib.blake2b(request.get_data(), digest_size=16).digest(),
+        )
+        result = cache.get(body_key)
+        if result is not None and result.is_current():
+            return result.to_response()
+
+        data = parse_ranges_args()
+        ranges_key = ("ranges", normalize_ranges(data))
+        result = cache.get(ranges_key)
+        if result is None or not result.is_current():
+            # Read before computing, so a fetch meanwhile makes it stale.
+            versions = calendar_versions(data)
+            try:
+                response = current_app.make_response(
+                    view(data, *args, **kwargs)
+                )
+            except HTTPException as e:
+                if e.code != 400:
+                    raise
+                response = current_app.make_response(
+                    current_app.handle_user_exception(e)
+                )
+            result = CachedResult(
+                response.status_code, response.get_data(), versions
+            )
+            cache.set(ranges_key, result)
+        cache.set(body_key, result)
+        return result.to_response()
+
+    return wrapper
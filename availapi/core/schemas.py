@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 from marshmallow import (
     Schema,
     ValidationError,
@@ -9,6 +11,14 @@ from marshmallow import (
 
 from availapi.utils.countries import supported_countries
 
+from . import metrics
+
+# Longest span allowed for a range.
+MAX_RANGE_DAYS = 31
+
+# ISO 3166-2 subdivision codes. Example: US-CA
+SUBDIVISION_RE = r"[A-Z]{2}-[A-Z0-9]{1,3}\Z"
+
 
 class RangeSchema(Schema):
     from_datetime = fields.AwareDateTime(
@@ -38,12 +48,35 @@ class RangeSchema(Schema):
             "example": "SG",
         },
     )
+    subdivision = fields.Str(
+        validate=validate.Regexp(
+            SUBDIVISION_RE, error="Not a valid ISO 3166-2 subdivision code."
+        ),
+        metadata={
+            "description": "Subdivision (state, province...) of the country "
+            "for an item, so its regional holidays are considered too. "
+            "Must be on iso-3166-2 format.",
+            "example": "US-CA",
+        },
+    )
+
+    @validates_schema
+    def check_subdivision_country(self, data, **kwargs):
+        """Check that the `subdivision` belongs to the country `cc`."""
+        if "subdivision" in data and not data["subdivision"].startswith(
+            f"{data.get('cc')}-"
+        ):
+            raise ValidationError(
+                "The subdivision must belong to the country `cc`.",
+                "subdivision",
+            )
 
     @validates_schema
     def check_from_to_relation(self, data, **kwargs):
         """
         Check that the `from_datetime` be always a past datetime in regards to
-        the `to_datetime`.
+        the `to_datetime` and that the range is not longer than
+        `MAX_RANGE_DAYS`.
         """
         if data["from_datetime"] > data["to_datetime"]:
             raise ValidationError(
@@ -51,9 +84,55 @@ class RangeSchema(Schema):
                 "date in regards to the `to` field."
             )
 
-        if data["from_datetime"].date() != data["to_datetime"].date():
+        if data["to_datetime"] - data["from_datetime"] > timedelta(
+            days=MAX_RANGE_DAYS
+        ):
+            raise ValidationError(
+                f"The range must not span more than {MAX_RANGE_DAYS} days."
+            )
+
+
+class ParticipantSchema(Schema):
+    ranges = fields.List(
+        fields.Nested(RangeSchema),
+        required=True,
+        validate=validate.Length(min=1),
+        metadata={
+            "description": "Availability ranges of the participant.",
+        },
+    )
+
+
+class SlotsQuerySchema(Schema):
+    participants = fields.List(
+        fields.Nested(ParticipantSchema),
+        required=True,
+        validate=validate.Length(min=1),
+        metadata={"description": "Participants of the meeting."},
+    )
+    min_participants = fields.Int(
+        load_default=None,
+        validate=validate.Range(min=1),
+        metadata={
+            "description": "Participants that must be available in a slot. "
+            "All of them by default.",
+            "example": 2,
+        },
+    )
+
+    @validates_schema
+    def check_min_participants(self, data, **kwargs):
+        """
+        Check that the `min_participants` be not higher than the number of
+        participants.
+        """
+        if data.get("min_participants") is not None and data[
+            "min_participants"
+        ] > len(data["participants"]):
             raise ValidationError(
-                "The `from` and `to` dates must be correspond to the same day."
+                "The `min_participants` field must not be higher than "
+                "the number of participants.",
+                "min_participants",
             )
 
 
@@ -87,3 +166,75 @@ class SlotSchema(Schema):
         data["from"] = data["from"][:-5] + "Z"
         data["to"] = data["to"][:-5] + "Z"
         return data
+
+
+class RankedSlotSchema(SlotSchema):
+    participants = fields.Int(
+        required=True,
+        metadata={
+            "description": "Participants available in the slot.",
+            "example": 3,
+        },
+    )
+
+
+def format_slot_datetime(dt: datetime) -> str:
+    """Format a UTC datetime of a slot like `SlotSchema` does, with only
+    one digit of the microseconds and the Z.
+
+    :param dt: The datetime in UTC.
+    :type dt: datetime
+    :return: The formatted datetime. Example: 2022-11-02T01:00:00.0Z
+    :rtype: str
+    """
+    # Formatting the fields is faster than `strftime`.
+    return "%d-%02d-%02dT%02d:%02d:%02d.%dZ" % (
+        dt.year,
+        dt.month,
+        dt.day,
+        dt.hour,
+        dt.minute,
+        dt.second,
+        dt.microsecond // 100000,
+    )
+
+
+@metrics.timed("serialize")
+def dump_slots(slots: list) -> list:
+    """Serialize slots, the same as `SlotSchema().dump(slots, many=True)`
+    without going through marshmallow.
+
+    :param slots: The slots (dicts with `from_datetime` and `to_datetime`).
+    :type slots: list
+    :return: The serialized slots.
+    :rtype: list
+    """
+    return [
+        {
+            "from": format_slot_datetime(slot["from_datetime"]),
+            "to": format_slot_datetime(slot["to_datetime"]),
+        }
+        for slot in slots
+    ]
+
+
+@metrics.timed("serialize")
+def dump_ranked_slots(slots: list) -> list:
+    """Serialize ranked slots, the same as
+    `RankedSlotSchema().dump(slots, many=True)` without going through
+    marshmallow.
+
+    :param slots: The slots (dicts with `from_datetime`, `to_datetime` and
+        `participants`).
+    :type slots: list
+    :return: The serialized slots.
+    :rtype: list
+    """
+    return [
+        {
+            "from": format_slot_datetime(slot["from_datetime"]),
+            "to": format_slot_datetime(slot["to_datetime"]),
+            "participants": slot["participants"],
+        }
+        for slot in slots
+    ]
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+
+class Lease:
+    """The lease of a missing redis key (`{key}:lease`), taken with
+    `SET NX` and an expiry by the only caller of the cluster loading it.
+    """
+
+    __slots__ = ("key", "token", "deadline")
+
+    def __init__(self, key: str, wait_timeout: float):
+        self.key = f"{key}:lease"
+        self.token = uuid.uuid4().hex
+        # Past it, the caller stops waiting for the lease holder.
+        self.deadline = time.monotonic() + wait_timeout
+
+    def is_expired(self) -> bool:
+        return time.monotonic() > self.deadline
+
+    def is_owned(self, value) -> bool:
+        """Check whether the value of the lease key is still this lease."""
+        return _decode(value) == self.token
+
+
+class SingleFlight:
+    """Coalesce the loads of missing redis keys.
+
+    Inside a worker, the callers asking for the same key wait on a per-key
+    lock. Across workers, the loader only runs for the one that acquires a
+    lease in redis (`SET NX` with an expiry) while the others poll the key
+    until the value shows up. This way a missing key triggers exactly one
+    load in the whole cluster instead of one per concurrent request.
+    """
+
+    def __init__(
+        self,
+        lease_ttl: int = 10,
+        poll_interval: float = 0.05,
+        wait_timeout: float = 10,
+    ):
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _local_lock(self, key: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def load(
+        self, client, key: str, loader, ttl: timedelta, decode: bool = True
+    ):
+        """Return the value stored in a key, loading it when it is missing.
+
+        :param client: The redis client.
+        :type client: redis.Redis
+        :param key: The key to read.
+        :type key: str
+        :param loader: Function without arguments that returns the value to
+            store when the key is missing.
+        :type loader: callable
+        :param ttl: The expiration of the value stored.
+        :type ttl: timedelta
+        :param decode: Whether the values read are decoded into str, the
+            binary values are returned as they are read otherwise.
+        :type decode: bool, optional
+        :return: The value of the key.
+        :rtype: str or bytes
+        """
+        read = _decode if decode else _identity
+        value = client.get(key)
+        if value is not None:
+            return read(value)
+
+        with self._local_lock(key):
+            # Another thread of this worker could have loaded it meanwhile.
+            value = client.get(key)
+            if value is not None:
+                return read(value)
+
+            lease = Lease(key, self.wait_timeout)
+            while not client.set(
+                lease.key, lease.token, nx=True, ex=self.lease_ttl
+            ):
+                time.sleep(self.poll_interval)
+                value = client.get(key)
+                if value is not None:
+                    return read(value)
+                if lease.is_expired():
+                    # The lease holder is taking too long, load it anyway.
+                    break
+
+            try:
+                value = loader()
+                client.setex(key, ttl, value)
+            finally:
+                # Only release the lease if it is still ours.
+                if lease.is_owned(client.get(lease.key)):
+                    client.delete(lease.key)
+
+            return value
+
+
+class AsyncSingleFlight(SingleFlight):
+    """Coalesce the loads of missing redis keys across workers with the
+    lease of `SingleFlight`, through an asyncio redis client.
+
+    The callers of a worker asking for the same key are not coalesced here,
+    they must share the task loading it.
+    """
+
+    async def load(
+        self, client, key: str, loader, ttl: timedelta, decode: bool = True
+    ):
+        """Return the value stored in a key, loading it when it is missing.
+
+        :param client: The asyncio redis client.
+        :type client: redis.asyncio.Redis
+        :param key: The key to read.
+        :type key: str
+        :param loader: Coroutine function without arguments that returns the
+            value to store when the key is missing.
+        :type loader: callable
+        :param ttl: The expiration of the value stored.
+        :type ttl: timedelta
+        :param decode: Whether the values read are decoded into str, the
+            binary values are returned as they are read otherwise.
+        :type decode: bool, optional
+        :return: The value of the key.
+        :rtype: str or bytes
+        """
+        read = _decode if decode else _identity
+        value = await client.get(key)
+        if value is not None:
+            return read(value)
+
+        lease = Lease(key, self.wait_timeout)
+        while not await client.set(
+            lease.key, lease.token, nx=True, ex=self.lease_ttl
+        ):
+            await asyncio.sleep(self.poll_interval)
+            value = await client.get(key)
+            if value is not None:
+                return read(value)
+            if lease.is_expired():
+                # The lease holder is taking too long, load it anyway.
+                break
+
+        try:
+            value = await loader()
+            await client.setex(key, ttl, value)
+        finally:
+            # Only release the lease if it is still ours.
+            if lease.is_owned(await client.get(lease.key)):
+                await client.delete(lease.key)
+
+        return value
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _identity(value):
+    return value
@@ -0,0 +1,45 @@
+import importlib
+import threading
+
+from flask import current_app, jsonify
+
+from .swagger import swaggerui_blueprint
+
+_spec_lock = threading.Lock()
+
+
+def generate_spec_json():
+    """Serve the OpenAPI document, generated on the first request and then
+    cached by the app.
+
+    `availapi.docs.spec` is only imported here: apispec (and the
+    `pkg_resources` it loads) takes more time to import than the rest of the
+    service, which is not paid by the workers nor the tests until the
+    document is requested.
+    """
+    spec = current_app.extensions.get("spec")
+    if spec is None:
+        with _spec_lock:
+            spec = current_app.extensions.get("spec")
+            if spec is None:
+                build_spec = importlib.import_module(
+                    ".spec", __package__
+                ).build_spec
+                spec = current_app.extensions["spec"] = build_spec(
+                    current_app._get_current_object()
+                )
+    return jsonify(spec)
+
+
+def configure_docs(app):
+    """Serve the OpenAPI document in `/spec.json` and the Swagger UI in
+    `/docs` when `DOCS_ENABLED` is set.
+
+    :param app: The application.
+    :type app: Flask
+    """
+    if not app.config["DOCS_ENABLED"]:
+        return
+
+    app.add_url_rule("/spec.json", "spec", generate_spec_json)
+    app.register_blueprint(swaggerui_blueprint)
@@ -0,0 +1,54 @@
+"""Test doubles shared by the tests and the benchmarks."""
+import time
+
+import redis
+from flask import abort
+
+from .utils.holiday_providers import CalendarificProvider
+
+
+class StubCalendarific(CalendarificProvider):
+    """Calendarific provider returning the 4th of july of every year (and a
+    datetime holiday, which is not indexed, and a holiday of the `AA`
+    subdivision), after `delay` seconds, except for the countries failing.
+    """
+
+    def __init__(self, delay=0, failing=()):
+        super().__init__(api_key="test")
+        self.delay = delay
+        self.failing = failing
+        self.requests = []
+
+    def request_holidays(self, country, year):
+        self.requests.append((country, year))
+        time.sleep(self.delay)
+        if country in self.failing:
+            abort(500, "The holidays API is not available.")
+        return [
+            {"date": {"iso": f"{year}-07-04"}, "states": "All"},
+            {"date": {"iso": f"{year}-03-20T15:33:24+00:00"}},
+            {
+                "date": {"iso": f"{year}-03-31"},
+                "states": [{"iso": f"{country.lower()}-aa"}],
+            },
+        ]
+
+
+class BrokenRedis:
+    """Redis client whose every command fails, as a coroutine when it is
+    `asynchronous`.
+    """
+
+    def __init__(self, asynchronous=False):
+        self.asynchronous = asynchronous
+        self.commands = 0
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands += 1
+            raise redis.ConnectionError("Connection refused.")
+
+        async def async_command(*args, **kwargs):
+            return command(*args, **kwargs)
+
+        return async_command if self.asynchronous else command
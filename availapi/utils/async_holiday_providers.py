@@ -0,0 +1,377 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+import redis
+
+from ..core.cache import create_async_redis_client
+from ..core.single_flight import AsyncSingleFlight
+from .holiday_providers import (
+    PROVIDER_BUILDERS,
+    CalendarificProvider,
+    ChainLayer,
+    HolidaysProvider,
+    MemoryLayer,
+    RedisLayer,
+    StaticProvider,
+    _fetch_executor,
+    build_holidays_calendar,
+    build_holidays_provider,
+    encode_cached_calendar,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHolidaysProvider:
+    """Base class of the sources of holidays used by the ASGI app, like
+    `HolidaysProvider` but resolving the calendars without blocking the
+    event loop.
+    """
+
+    async def get_calendars(self, keys: set) -> dict:
+        """Return the calendars of the (country, year) keys given.
+
+        :param keys: The (country, year) keys to resolve.
+        :type keys: set
+        :return: The calendar of every key covered by the provider, the keys
+            not covered are not included.
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+
+class LocalProvider(AsyncHolidaysProvider):
+    """Adapt a provider resolving the calendars in-process (dataset, static)
+    which is fast enough to be called from the event loop.
+    """
+
+    def __init__(self, provider: HolidaysProvider):
+        self.provider = provider
+
+    async def get_calendars(self, keys: set) -> dict:
+        return self.provider.get_calendars(keys)
+
+
+class AsyncCalendarificProvider(AsyncHolidaysProvider):
+    """Request the holidays to the calendarific API, without any cache.
+
+    The requests go through the pooled client of `CalendarificProvider`
+    (timeouts, retries and circuit breaker), run in the fetch threads so
+    the requests of every key are sent concurrently and the event loop is
+    never blocked.
+    """
+
+    def __init__(self, provider: CalendarificProvider):
+        self.provider = provider
+
+    async def request_holidays(self, country: str, year: int) -> list:
+        """Request the holidays for a given country and year.
+
+        :param country: The country code. Example: US
+        :type country: str
+        :param year: The year used to search the holidays. Example 2022
+        :type year: int
+        :return: The list of holidays for that country in that year.
+        :rtype: list
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            _fetch_executor, self.provider.request_holidays, country, year
+        )
+
+    async def get_calendars(self, keys: set) -> dict:
+        keys = list(keys)
+        holidays = await asyncio.gather(
+            *(self.request_holidays(*key) for key in keys)
+        )
+        return {
+            key: build_holidays_calendar(key_holidays)
+            for key, key_holidays in zip(keys, holidays)
+        }
+
+
+class AsyncRedisProvider(RedisLayer, AsyncHolidaysProvider):
+    """Cache in redis the holidays calendars of calendarific, sharing the
+    keys, format and logic of `RedisProvider`.
+
+    The keys are read with a single `MGET` and the ones not cached yet are
+    requested concurrently. Concurrent misses of the same key share a task
+    in the worker and a lease in the cluster, so the holidays are requested
+    once. The holidays older than `soft_ttl` are served while they are
+    refreshed in background.
+
+    When redis fails, it is skipped for `retry_interval` seconds and the
+    holidays are requested directly to the upstream meanwhile.
+    """
+
+    def __init__(
+        self,
+        client,
+        upstream: AsyncCalendarificProvider,
+        soft_ttl: timedelta = timedelta(days=1),
+        hard_ttl: timedelta = timedelta(days=7),
+        retry_interval: float = 5,
+    ):
+        super().__init__(
+            client,
+            upstream,
+            soft_ttl,
+            hard_ttl,
+            retry_interval,
+            AsyncSingleFlight(),
+        )
+        self._in_flight = {}
+        # Strong references of the background tasks while they run.
+        self._tasks = set()
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _fetch(self, country: str, year: int) -> bytes:
+        """Request the holidays and serialize their calendar to be cached."""
+        return encode_cached_calendar(
+            year,
+            build_holidays_calendar(
+                await self.upstream.request_holidays(country, year)
+            ),
+        )
+
+    async def _refresh(self, country: str, year: int):
+        """Fetch again the holidays for a given country and year and replace
+        the cached ones. Only one worker of the cluster refreshes a key.
+        """
+        cache_key_name = self._cache_key(country, year)
+        try:
+            if await self.client.set(
+                f"{cache_key_name}:refresh",
+                1,
+                nx=True,
+                ex=self.single_flight.lease_ttl,
+            ):
+                await self.client.setex(
+                    cache_key_name,
+                    self.hard_ttl,
+                    await self._fetch(country, year),
+                )
+        except Exception:
+            logger.exception(
+                "Unable to refresh the holidays %s.", cache_key_name
+            )
+        finally:
+            self._end_refresh(country, year)
+
+    async def _migrate(self, country: str, year: int, value: bytes):
+        """Rewrite a value cached in the legacy JSON format, keeping its
+        expiration.
+        """
+        try:
+            await self.client.set(
+                self._cache_key(country, year), value, keepttl=True
+            )
+        except redis.RedisError:
+            logger.exception(
+                "Unable to migrate the holidays %s-%s.", country, year
+            )
+
+    def _use_cached(self, country: str, year: int, cached_value):
+        """Parse the calendar cached for a given country and year scheduling
+        its refresh when it is older than the `soft_ttl`.
+
+        :return: The calendar or None when it was written in a format unknown
+            to this version.
+        """
+        calendar, migrated_value, refresh = self._parse_cached(
+            country, year, cached_value
+        )
+        if calendar is None:
+            return None
+
+        if migrated_value is not None:
+            self._spawn(self._migrate(country, year, migrated_value))
+        if refresh:
+            self._spawn(self._refresh(country, year))
+        return calendar
+
+    async def _load(self, country: str, year: int):
+        """Get the holidays calendar for a given country and year from the
+        cache, requesting the holidays when they are missing.
+        """
+        if self._is_available():
+            try:
+                cached_value = await self.single_flight.load(
+                    self.client,
+                    self._cache_key(country, year),
+                    lambda: self._fetch(country, year),
+                    self.hard_ttl,
+                    decode=False,
+                )
+            except redis.RedisError as e:
+                self._mark_unavailable(e)
+            else:
+                calendar = self._use_cached(country, year, cached_value)
+                if calendar is not None:
+                    return calendar
+
+        return build_holidays_calendar(
+            await self.upstream.request_holidays(country, year)
+        )
+
+    async def get_calendar(self, country: str, year: int) -> frozenset:
+        """Get the holidays calendar for a given country and year from the
+        cache, requesting the holidays when they are missing and waiting for
+        the request already in flight in this worker if any.
+
+        :param country: The country code. Example: US
+        :type country: str
+        :param year: The year used to search the holidays. Example 2022
+        :type year: int
+        :return: The day ordinals of the holidays.
+        :rtype: frozenset
+        """
+        key = (country, year)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._spawn(self._load(country, year))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # A waiter being cancelled must not cancel the request of the rest.
+        return await asyncio.shield(task)
+
+    async def get_calendars(self, keys: set) -> dict:
+        if not self._is_available():
+            return await self.upstream.get_calendars(keys)
+
+        keys = list(keys)
+        try:
+            cached_values = await self.client.mget(
+                [self._cache_key(*key) for key in keys]
+            )
+        except redis.RedisError as e:
+            self._mark_unavailable(e)
+            return await self.upstream.get_calendars(keys)
+
+        calendars = {}
+        missing_keys = []
+        unknown_keys = set()
+        for key, cached_value in zip(keys, cached_values):
+            if cached_value is None:
+                missing_keys.append(key)
+                continue
+            calendar = self._use_cached(*key, cached_value)
+            if calendar is None:
+                # Written in a format unknown to this version.
+                unknown_keys.add(key)
+            else:
+                calendars[key] = calendar
+
+        fetched_calendars = await asyncio.gather(
+            *(self.get_calendar(*key) for key in missing_keys)
+        )
+        calendars.update(zip(missing_keys, fetched_calendars))
+        if unknown_keys:
+            calendars.update(await self.upstream.get_calendars(unknown_keys))
+        return calendars
+
+
+class AsyncMemoryProvider(MemoryLayer, AsyncHolidaysProvider):
+    """Keep in-process the calendars resolved by the upstream provider, like
+    `MemoryProvider`.
+    """
+
+    async def get_calendars(self, keys: set) -> dict:
+        calendars, missing_keys = self._lookup(keys)
+        if missing_keys:
+            calendars.update(
+                self._keep(await self.upstream.get_calendars(missing_keys))
+            )
+        return calendars
+
+
+class AsyncChainProvider(ChainLayer, AsyncHolidaysProvider):
+    """Ask the providers in order, each one only for the keys not resolved
+    by the previous ones, like `ChainProvider`.
+    """
+
+    async def get_calendars(self, keys: set) -> dict:
+        calendars = {}
+        for provider, missing_keys in self._lookups(keys, calendars):
+            calendars.update(await provider.get_calendars(missing_keys))
+        return calendars
+
+
+def _chain(provider: HolidaysProvider, upstream):
+    provider = LocalProvider(provider)
+    return (
+        provider
+        if upstream is None
+        else AsyncChainProvider([provider, upstream])
+    )
+
+
+def _build_calendarific(config, upstream):
+    return AsyncCalendarificProvider(
+        PROVIDER_BUILDERS["calendarific"](config, None)
+    )
+
+
+def _build_redis(config, upstream):
+    if not isinstance(upstream, AsyncCalendarificProvider):
+        raise ValueError("The redis holidays provider must wrap calendarific.")
+
+    return AsyncRedisProvider(
+        create_async_redis_client(config),
+        upstream,
+        soft_ttl=config["HOLIDAYS_SOFT_TTL"],
+        hard_ttl=config["HOLIDAYS_HARD_TTL"],
+        retry_interval=config["REDIS_RETRY_INTERVAL"],
+    )
+
+
+def _build_memory(config, upstream):
+    return AsyncMemoryProvider(
+        upstream,
+        max_size=config["HOLIDAYS_MEMORY_MAX_SIZE"],
+        ttl=config["HOLIDAYS_MEMORY_TTL"].total_seconds(),
+    )
+
+
+def _build_dataset(config, upstream):
+    provider = PROVIDER_BUILDERS["dataset"](config, None)
+    if provider is None:
+        return upstream
+    return _chain(provider, upstream)
+
+
+def _build_static(config, upstream):
+    return _chain(
+        StaticProvider(
+            config["HOLIDAYS_STATIC"],
+            default=None if upstream else frozenset(),
+        ),
+        upstream,
+    )
+
+
+ASYNC_PROVIDER_BUILDERS = {
+    "calendarific": _build_calendarific,
+    "redis": _build_redis,
+    "memory": _build_memory,
+    "dataset": _build_dataset,
+    "static": _build_static,
+}
+
+
+def build_async_holidays_provider(config) -> AsyncHolidaysProvider:
+    """Build the async holidays provider described by the
+    `HOLIDAYS_PROVIDERS` setting of the config given, with the same layers
+    as `build_holidays_provider`.
+
+    :param config: The application config.
+    :type config: dict
+    :return: The provider.
+    :rtype: AsyncHolidaysProvider
+    """
+    return build_holidays_provider(config, ASYNC_PROVIDER_BUILDERS)
@@ -0,0 +1,136 @@
+import calendar
+from datetime import date, datetime, time, timedelta
+
+from ..core.local_cache import LocalCache
+from .holiday_providers import subdivision_calendar
+from .weekends import weekend_mask
+
+# Business-day calendars per (country, year, subdivision), built from the
+# holidays calendar they were computed with.
+business_calendars = LocalCache(max_size=1024, ttl=3600, name="business_days")
+
+
+def get_business_days(
+    country: str, year: int, holidays_calendar, subdivision: str = None
+) -> bytes:
+    """Return the business-day calendar of a country (or one of its
+    subdivisions) in a year.
+
+    The calendar has one byte per day of the year (0 based) that is 1 when
+    the day is neither a weekend (of the country) nor a holiday. It is
+    computed once per holidays calendar and weekend, and reused while they
+    do not change.
+
+    :param country: The country code. Example: US
+    :type country: str
+    :param year: The year of the calendar. Example 2022
+    :type year: int
+    :param holidays_calendar: The day ordinals of the holidays of that
+        country (or subdivision) in that year.
+    :type holidays_calendar: frozenset
+    :param subdivision: The ISO 3166-2 code of the subdivision.
+        Example: US-CA
+    :type subdivision: str, optional
+    :return: The business days of the year.
+    :rtype: bytes
+    """
+    cache_key = (country, year, subdivision)
+    weekend = weekend_mask(country, year)
+    cached = business_calendars.get(cache_key)
+    if (
+        cached is not None
+        and cached[0] is holidays_calendar
+        and cached[1] == weekend
+    ):
+        return cached[2]
+
+    first_day = date(year, 1, 1)
+    first_ordinal = first_day.toordinal()
+    first_weekday = first_day.weekday()
+    business_days = bytes(
+        not (
+            weekend >> (first_weekday + i) % 7 & 1
+            or first_ordinal + i in holidays_calendar
+        )
+        for i in range(366 if calendar.isleap(year) else 365)
+    )
+    business_calendars.set(
+        cache_key, (holidays_calendar, weekend, business_days)
+    )
+    return business_days
+
+
+def is_business_day(
+    d: date, country: str, calendars: dict, subdivision: str = None
+) -> bool:
+    """Check whether a date is a business day in a country, considering the
+    holidays of the subdivision given too.
+
+    :param d: The date to check.
+    :type d: date
+    :param country: The country code. Example: US
+    :type country: str
+    :param calendars: The holidays calendars per (country, year).
+    :type calendars: dict
+    :param subdivision: The ISO 3166-2 code of the subdivision.
+        Example: US-CA
+    :type subdivision: str, optional
+    :return: Whether the date is a business day.
+    :rtype: bool
+    """
+    business_days = get_business_days(
+        country,
+        d.year,
+        subdivision_calendar(
+            calendars.get((country, d.year), frozenset()), subdivision
+        ),
+        subdivision,
+    )
+    return bool(business_days[d.timetuple().tm_yday - 1])
+
+
+def range_years(from_dt: datetime, to_dt: datetime) -> range:
+    """Return the years covered by a range, in the timezone of its `from`
+    like the days walked by `split_business_windows`.
+    """
+    return range(from_dt.year, to_dt.astimezone(from_dt.tzinfo).year + 1)
+
+
+def split_business_windows(
+    from_dt: datetime,
+    to_dt: datetime,
+    country: str,
+    calendars: dict,
+    subdivision: str = None,
+) -> list:
+    """Split a range into its windows on business days.
+
+    The range is split at the midnights of its own timezone and the days
+    that are weekends or holidays in the country are dropped. A range ending
+    exactly at midnight has no window on that last day.
+
+    :param from_dt: The aware `from` datetime of the range.
+    :type from_dt: datetime
+    :param to_dt: The aware `to` datetime of the range.
+    :type to_dt: datetime
+    :param country: The country code. Example: US
+    :type country: str
+    :param calendars: The holidays calendars per (country, year).
+    :type calendars: dict
+    :param subdivision: The ISO 3166-2 code of the subdivision whose
+        holidays are dropped too. Example: US-CA
+    :type subdivision: str, optional
+    :return: The (from, to) datetimes of the windows.
+    :rtype: list
+    """
+    windows = []
+    d = from_dt.date()
+    while True:
+        day_start = datetime.combine(d, time(), tzinfo=from_dt.tzinfo)
+        day_end = day_start + timedelta(days=1)
+        if is_business_day(d, country, calendars, subdivision):
+            windows.append((max(from_dt, day_start), min(to_dt, day_end)))
+        if day_end >= to_dt:
+            break
+        d += timedelta(days=1)
+    return windows
@@ -0,0 +1,799 @@
+import json
+import logging
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import redis
+import requests
+from flask import abort
+
+from ..core import metrics
+from ..core.cache import create_redis_client
+from ..core.http import CircuitBreaker, CircuitOpenError, HttpClient
+from ..core.local_cache import LocalCache
+from ..core.single_flight import SingleFlight
+from .holidays_dataset import HolidaysDataset
+
+logger = logging.getLogger(__name__)
+
+# Format of the calendars cached in redis: version and fetched_at timestamp,
+# followed by the days of the year of the country and of its subdivisions
+# (see `encode_cached_calendar`).
+CACHE_VERSION = 2
+CACHE_HEADER = struct.Struct("<Bd")
+
+# Used to request concurrently the calendars of several keys.
+_fetch_executor = ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix="holidays-fetch"
+)
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="holidays-refresh"
+)
+
+# Incremented every time the holidays of a (country, year) are fetched from
+# calendarific, so the results computed with its former calendar can be told
+# apart.
+_holidays_versions = {}
+_holidays_versions_lock = threading.Lock()
+
+
+def holidays_version(country: str, year: int) -> int:
+    """Return the version of the holidays of a country in a year in this
+    process, that changes every time they are fetched from calendarific.
+
+    :param country: The country code. Example: US
+    :type country: str
+    :param year: The year of the holidays. Example 2022
+    :type year: int
+    :return: The version.
+    :rtype: int
+    """
+    return _holidays_versions.get((country, year), 0)
+
+
+def _bump_holidays_version(country: str, year: int):
+    with _holidays_versions_lock:
+        _holidays_versions[(country, year)] = (
+            _holidays_versions.get((country, year), 0) + 1
+        )
+
+
+class HolidaysCalendar(frozenset):
+    """The day ordinals of the holidays observed in the whole country, with
+    the index of the calendars of its subdivisions.
+
+    `subdivisions` maps the ISO 3166-2 code of every subdivision with
+    holidays of its own (Example: US-CA) to the day ordinals of all the
+    holidays observed there, the national ones included, so a subdivision
+    is checked with a single lookup.
+    """
+
+    __slots__ = ("subdivisions",)
+
+    def __new__(cls, days=(), subdivisions: dict = None):
+        calendar = super().__new__(cls, days)
+        calendar.subdivisions = subdivisions or {}
+        return calendar
+
+    def __reduce__(self):
+        return type(self), (frozenset(self), self.subdivisions)
+
+
+def subdivision_calendar(calendar, subdivision: str = None):
+    """Return the calendar of the holidays observed in a subdivision of a
+    country, the national one when the subdivision has no holidays of its
+    own or the calendar has no index of subdivisions.
+
+    :param calendar: The calendar of the country.
+    :param subdivision: The ISO 3166-2 code of the subdivision.
+        Example: US-CA
+    :type subdivision: str, optional
+    :return: The calendar of the subdivision.
+    """
+    if subdivision is None:
+        return calendar
+    return getattr(calendar, "subdivisions", {}).get(subdivision, calendar)
+
+
+def build_holidays_calendar(holidays: list) -> HolidaysCalendar:
+    """Build the calendar of the holidays given, indexing apart the ones
+    observed only in some states of the country.
+
+    Only the entries with a plain date are considered, the ones including a
+    time (like the equinoxes) never matched a date so they are skipped.
+
+    :param holidays: The list of holidays returned by the calendarific API.
+    :type holidays: list
+    :return: The ordinals (`date.toordinal`) of the holidays.
+    :rtype: HolidaysCalendar
+    """
+    national = set()
+    regional = {}
+    for h in holidays:
+        if len(h["date"]["iso"]) != 10:
+            continue
+        ordinal = date.fromisoformat(h["date"]["iso"]).toordinal()
+        states = h.get("states", "All")
+        if isinstance(states, list):
+            for state in states:
+                regional.setdefault(state["iso"].upper(), set()).add(ordinal)
+        else:
+            national.add(ordinal)
+    return HolidaysCalendar(
+        national,
+        {
+            subdivision: frozenset(national | days)
+            for subdivision, days in regional.items()
+        },
+    )
+
+
+def _pack_days(first_ordinal: int, ordinals) -> bytes:
+    days = sorted(ordinal - first_ordinal for ordinal in ordinals)
+    return struct.pack(f"<H{len(days)}H", len(days), *days)
+
+
+def _unpack_days(value, offset: int, first_ordinal: int) -> tuple:
+    (count,) = struct.unpack_from("<H", value, offset)
+    days = struct.unpack_from(f"<{count}H", value, offset + 2)
+    return (
+        frozenset(first_ordinal + day for day in days),
+        offset + 2 + 2 * count,
+    )
+
+
+def encode_cached_calendar(
+    year: int, calendar, fetched_at: float = None
+) -> bytes:
+    """Serialize a holidays calendar to be cached along with the time it was
+    fetched.
+
+    The value is the version of the format and the `fetched_at` timestamp
+    followed by the days of the year (0 based) of the national holidays and
+    then, for every subdivision, its code and the days of its own holidays.
+    The days are sorted uint16 prefixed by their count and the codes are
+    ASCII prefixed by their length. A calendar takes from ~40 bytes to a few
+    hundred instead of the ~20KB of the calendarific response.
+
+    :param year: The year of the calendar.
+    :type year: int
+    :param calendar: The day ordinals of the holidays.
+    :type calendar: iterable
+    :param fetched_at: The timestamp of the holidays, now by default.
+    :type fetched_at: float, optional
+    :return: The value to cache.
+    :rtype: bytes
+    """
+    first_ordinal = date(year, 1, 1).toordinal()
+    chunks = [
+        CACHE_HEADER.pack(
+            CACHE_VERSION, time.time() if fetched_at is None else fetched_at
+        ),
+        _pack_days(first_ordinal, calendar),
+    ]
+    subdivisions = getattr(calendar, "subdivisions", {})
+    for subdivision in sorted(subdivisions):
+        code = subdivision.encode("ascii")
+        chunks.append(struct.pack("<B", len(code)) + code)
+        chunks.append(
+            _pack_days(first_ordinal, subdivisions[subdivision] - calendar)
+        )
+    return b"".join(chunks)
+
+
+def is_legacy_cached_value(value) -> bool:
+    """Check whether a cached value is in the JSON format used before the
+    compact one: the calendarific holidays, with their `fetched_at` or as a
+    plain list.
+    """
+    return value[:1] in (b"{", b"[", "{", "[")
+
+
+def decode_cached_calendar(value, year: int) -> tuple:
+    """Parse a holidays calendar cached with `encode_cached_calendar`, or in
+    a former format.
+
+    The plain lists of the legacy JSON format and the calendars of the first
+    compact format, without subdivisions, are considered fetched at the
+    epoch so they get refreshed.
+
+    :param value: The cached value.
+    :type value: bytes or str
+    :param year: The year of the calendar.
+    :type year: int
+    :return: The calendar (None when the format version is unknown) and the
+        timestamp it was fetched at.
+    :rtype: tuple
+    """
+    if is_legacy_cached_value(value):
+        data = json.loads(value)
+        if isinstance(data, list):
+            return build_holidays_calendar(data), 0
+        return build_holidays_calendar(data["holidays"]), data["fetched_at"]
+
+    version, fetched_at = CACHE_HEADER.unpack_from(value)
+    first_ordinal = date(year, 1, 1).toordinal()
+    if version == 1:
+        days = struct.unpack_from(
+            f"<{(len(value) - CACHE_HEADER.size) // 2}H",
+            value,
+            CACHE_HEADER.size,
+        )
+        return HolidaysCalendar(first_ordinal + day for day in days), 0
+    if version != CACHE_VERSION:
+        return None, fetched_at
+
+    national, offset = _unpack_days(value, CACHE_HEADER.size, first_ordinal)
+    subdivisions = {}
+    while offset < len(value):
+        size = value[offset]
+        subdivision = value[offset + 1 : offset + 1 + size].decode("ascii")
+        days, offset = _unpack_days(value, offset + 1 + size, first_ordinal)
+        subdivisions[subdivision] = national | days
+    return HolidaysCalendar(national, subdivisions), fetched_at
+
+
+class HolidaysProvider:
+    """Base class of the sources of holidays.
+
+    A provider resolves (country, year) keys into calendars, that is, any
+    container of the day ordinals (`date.toordinal`) of the holidays that
+    supports the `in` operator. The calendars may index the holidays of the
+    subdivisions of the country too (see `HolidaysCalendar`).
+    """
+
+    def get_calendars(self, keys: set) -> dict:
+        """Return the calendars of the (country, year) keys given.
+
+        :param keys: The (country, year) keys to resolve.
+        :type keys: set
+        :return: The calendar of every key covered by the provider, the keys
+            not covered are not included.
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+
+class CalendarificProvider(HolidaysProvider):
+    """Request the holidays to the calendarific API, without any cache.
+
+    The requests share a pooled HTTP client with timeouts, retries and a
+    circuit breaker.
+    """
+
+    URL = "https://calendarific.com/api/v2/holidays?"
+
+    def __init__(self, api_key: str, http_client: HttpClient = None):
+        self.api_key = api_key
+        self.http_client = http_client or HttpClient()
+
+    @metrics.timed("calendarific")
+    def request_holidays(self, country: str, year: int) -> list:
+        """Execute the request to fetch the holidays to the calendarific API.
+
+        :param country: The country code. Example: US
+        :type country: str
+        :param year: The year used to search the holidays. Example 2022
+        :type year: int
+        :return: The list of holidays for that country in that year.
+        :rtype: list
+        """
+        try:
+            response = self.http_client.get(
+                self.URL,
+                params={
+                    "api_key": self.api_key,
+                    "country": country,
+                    "year": year,
+                },
+            )
+        except CircuitOpenError as e:
+            # Expected while calendarific is down, once per rejected call.
+            logger.warning("Unable to request the holidays: %s", e)
+            abort(500, "The holidays API is not available.")
+        except requests.RequestException:
+            logger.exception("Unable to request the holidays.")
+            abort(500, "The holidays API is not available.")
+
+        try:
+            data = json.loads(response.text)
+        except ValueError:
+            data = {}
+        if response.status_code != 200:
+            if "error" not in data:
+                data["error"] = "Unknown error with holidays API."
+            abort(500, data["error"])
+        _bump_holidays_version(country, year)
+        return data["response"]["holidays"]
+
+    def get_calendars(self, keys: set) -> dict:
+        keys = list(keys)
+        calendars = _fetch_executor.map(
+            lambda key: build_holidays_calendar(self.request_holidays(*key)),
+            keys,
+        )
+        return dict(zip(keys, calendars))
+
+
+class RedisLayer:
+    """The state and logic of the redis cache of the holidays shared by
+    `RedisProvider` and the `AsyncRedisProvider` of the ASGI app: skipping
+    redis while it fails and parsing the cached calendars, telling which
+    ones need to be migrated or refreshed.
+    """
+
+    def __init__(
+        self,
+        client,
+        upstream,
+        soft_ttl: timedelta,
+        hard_ttl: timedelta,
+        retry_interval: float,
+        single_flight: SingleFlight,
+    ):
+        self.client = client
+        self.upstream = upstream
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.retry_interval = retry_interval
+        self.unavailable_until = 0
+        self.single_flight = single_flight
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(country: str, year: int) -> str:
+        return f"{country}-{year}"
+
+    def _is_available(self) -> bool:
+        return time.monotonic() >= self.unavailable_until
+
+    def _mark_unavailable(self, error: Exception):
+        logger.warning(
+            "Redis is not available, skipping it for %ss: %s",
+            self.retry_interval,
+            error,
+        )
+        self.unavailable_until = time.monotonic() + self.retry_interval
+
+    def _start_refresh(self, country: str, year: int) -> bool:
+        """Mark the holidays as being refreshed by this worker.
+
+        :return: False when they were already being refreshed.
+        :rtype: bool
+        """
+        with self._refreshing_lock:
+            if (country, year) in self._refreshing:
+                return False
+            self._refreshing.add((country, year))
+            return True
+
+    def _end_refresh(self, country: str, year: int):
+        with self._refreshing_lock:
+            self._refreshing.discard((country, year))
+
+    def _parse_cached(self, country: str, year: int, cached_value) -> tuple:
+        """Parse the calendar cached for a given country and year.
+
+        A value in the legacy JSON format must be rewritten in the compact
+        one, and a calendar older than the `soft_ttl` must be refreshed
+        unless this worker is already refreshing it.
+
+        :return: The calendar (None when it was written in a format unknown
+            to this version), the value to rewrite (None when it is not
+            legacy) and whether the holidays must be refreshed.
+        :rtype: tuple
+        """
+        calendar, fetched_at = decode_cached_calendar(cached_value, year)
+        if calendar is None:
+            return None, None, False
+
+        migrated_value = None
+        if is_legacy_cached_value(cached_value):
+            migrated_value = encode_cached_calendar(year, calendar, fetched_at)
+        refresh = time.time() - fetched_at > self.soft_ttl.total_seconds()
+        return (
+            calendar,
+            migrated_value,
+            refresh and self._start_refresh(country, year),
+        )
+
+
+class RedisProvider(RedisLayer, HolidaysProvider):
+    """Cache in redis the holidays calendars of calendarific under the
+    `{country}-{year}` keys (see `encode_cached_calendar`).
+
+    The keys missing are read with a single `MGET` and the ones not cached
+    yet are requested concurrently. Concurrent misses of the same key are
+    coalesced into a single request in the whole cluster and the holidays
+    older than `soft_ttl` are served while they are refreshed in background.
+    Only past the `hard_ttl` (when redis drops the key) a request needs to
+    wait for calendarific.
+
+    When redis fails, it is skipped for `retry_interval` seconds and the
+    holidays are requested directly to the upstream meanwhile.
+    """
+
+    def __init__(
+        self,
+        client,
+        upstream: CalendarificProvider,
+        soft_ttl: timedelta = timedelta(days=1),
+        hard_ttl: timedelta = timedelta(days=7),
+        retry_interval: float = 5,
+    ):
+        super().__init__(
+            client,
+            upstream,
+            soft_ttl,
+            hard_ttl,
+            retry_interval,
+            SingleFlight(),
+        )
+
+    def _fetch(self, country: str, year: int) -> bytes:
+        """Request the holidays and serialize their calendar to be cached."""
+        return encode_cached_calendar(
+            year,
+            build_holidays_calendar(
+                self.upstream.request_holidays(country, year)
+            ),
+        )
+
+    def _refresh(self, country: str, year: int):
+        """Fetch again the holidays for a given country and year and replace
+        the cached ones. Only one worker of the cluster refreshes a key.
+        """
+        cache_key_name = self._cache_key(country, year)
+        try:
+            if self.client.set(
+                f"{cache_key_name}:refresh",
+                1,
+                nx=True,
+                ex=self.single_flight.lease_ttl,
+            ):
+                self.client.setex(
+                    cache_key_name, self.hard_ttl, self._fetch(country, year)
+                )
+        except Exception:
+            logger.exception(
+                "Unable to refresh the holidays %s.", cache_key_name
+            )
+        finally:
+            self._end_refresh(country, year)
+
+    def _migrate(self, country: str, year: int, value: bytes):
+        """Rewrite a value cached in the legacy JSON format, keeping its
+        expiration.
+        """
+        try:
+            self.client.set(
+                self._cache_key(country, year), value, keepttl=True
+            )
+        except redis.RedisError:
+            logger.exception(
+                "Unable to migrate the holidays %s-%s.", country, year
+            )
+
+    def _use_cached(self, country: str, year: int, cached_value):
+        """Parse the calendar cached for a given country and year scheduling
+        its refresh when it is older than the `soft_ttl`.
+        """
+        calendar, migrated_value, refresh = self._parse_cached(
+            country, year, cached_value
+        )
+        if calendar is None:
+            # Written in a format unknown to this version.
+            return build_holidays_calendar(
+                self.upstream.request_holidays(country, year)
+            )
+
+        if migrated_value is not None:
+            self._migrate(country, year, migrated_value)
+        if refresh:
+            _refresh_executor.submit(self._refresh, country, year)
+        return calendar
+
+    def get_calendar(self, country: str, year: int):
+        """Get the holidays calendar for a given country and year from the
+        cache, requesting the holidays when they are missing.
+
+        :param country: The country code. Example: US
+        :type country: str
+        :param year: The year used to search the holidays. Example 2022
+        :type year: int
+        :return: The day ordinals of the holidays.
+        :rtype: frozenset
+        """
+        if self._is_available():
+            try:
+                cached_value = self.single_flight.load(
+                    self.client,
+                    self._cache_key(country, year),
+                    lambda: self._fetch(country, year),
+                    self.hard_ttl,
+                    decode=False,
+                )
+                return self._use_cached(country, year, cached_value)
+            except redis.RedisError as e:
+                self._mark_unavailable(e)
+
+        return build_holidays_calendar(
+            self.upstream.request_holidays(country, year)
+        )
+
+    def get_calendars(self, keys: set) -> dict:
+        if not self._is_available():
+            return self.upstream.get_calendars(keys)
+
+        keys = list(keys)
+        try:
+            with metrics.timer("redis"):
+                cached_values = self.client.mget(
+                    [self._cache_key(*key) for key in keys]
+                )
+        except redis.RedisError as e:
+            metrics.inc("availapi_cache_errors_total", cache="redis")
+            self._mark_unavailable(e)
+            return self.upstream.get_calendars(keys)
+
+        calendars = {}
+        futures = {}
+        for key, cached_value in zip(keys, cached_values):
+            if cached_value is None:
+                futures[key] = _fetch_executor.submit(self.get_calendar, *key)
+            else:
+                calendars[key] = self._use_cached(*key, cached_value)
+        metrics.inc("availapi_cache_hits_total", len(calendars), cache="redis")
+        metrics.inc("availapi_cache_misses_total", len(futures), cache="redis")
+
+        for key, future in futures.items():
+            calendars[key] = future.result()
+        return calendars
+
+
+class MemoryLayer:
+    """The bounded (LRU + TTL) in-process copy of the calendars shared by
+    `MemoryProvider` and the `AsyncMemoryProvider` of the ASGI app.
+    """
+
+    def __init__(self, upstream, max_size: int = 512, ttl=3600):
+        self.upstream = upstream
+        self.calendars = LocalCache(max_size, ttl, name="holidays_memory")
+
+    def _lookup(self, keys: set) -> tuple:
+        """Split the keys given into the ones kept and the missing ones.
+
+        :return: The calendars kept and the keys missing.
+        :rtype: tuple
+        """
+        calendars = {}
+        missing_keys = set()
+        for key in keys:
+            calendar = self.calendars.get(key)
+            if calendar is None:
+                missing_keys.add(key)
+            else:
+                calendars[key] = calendar
+        return calendars, missing_keys
+
+    def _keep(self, calendars: dict) -> dict:
+        """Keep the calendars resolved by the upstream, returning them."""
+        for key, calendar in calendars.items():
+            self.calendars.set(key, calendar)
+        return calendars
+
+
+class MemoryProvider(MemoryLayer, HolidaysProvider):
+    """Keep in-process the calendars resolved by the upstream provider.
+
+    Every worker keeps its own bounded (LRU + TTL) copy, so in steady state
+    the calendars are resolved without leaving the process.
+    """
+
+    def get_calendars(self, keys: set) -> dict:
+        calendars, missing_keys = self._lookup(keys)
+        if missing_keys:
+            calendars.update(
+                self._keep(self.upstream.get_calendars(missing_keys))
+            )
+        return calendars
+
+
+class DatasetProvider(HolidaysProvider):
+    """Read the calendars from a dataset file (see `flask holidays
+    snapshot`), only the years covered by the file are resolved.
+    """
+
+    def __init__(self, path: str):
+        self.dataset = HolidaysDataset(path)
+
+    def get_calendars(self, keys: set) -> dict:
+        calendars = {}
+        for key in keys:
+            calendar = self.dataset.get(*key)
+            if calendar is not None:
+                calendars[key] = calendar
+        return calendars
+
+
+class StaticProvider(HolidaysProvider):
+    """Serve a fixed set of holidays kept in memory.
+
+    The holidays are given per (country, year), the ones of a subdivision
+    under its ISO 3166-2 code instead of the country. Example: ("US-CA",
+    2022)
+
+    The keys not included are resolved with the `default` calendar (no
+    holidays), or not resolved at all if it is None.
+    """
+
+    def __init__(self, holidays: dict, default=frozenset()):
+        national = {}
+        regional = {}
+        for (code, year), dates in holidays.items():
+            ordinals = {d.toordinal() for d in dates}
+            if "-" in code:
+                # The holidays of a subdivision. Example: ("US-CA", 2022)
+                country = code.split("-", 1)[0]
+                regional.setdefault((country, year), {})[code] = ordinals
+            else:
+                national[(code, year)] = ordinals
+
+        self.calendars = {
+            key: HolidaysCalendar(
+                national.get(key, ()),
+                {
+                    subdivision: frozenset(national.get(key, set()) | days)
+                    for subdivision, days in regional.get(key, {}).items()
+                },
+            )
+            for key in national.keys() | regional.keys()
+        }
+        self.default = default
+
+    def get_calendars(self, keys: set) -> dict:
+        calendars = {}
+        for key in keys:
+            calendar = self.calendars.get(key, self.default)
+            if calendar is not None:
+                calendars[key] = calendar
+        return calendars
+
+
+class ChainLayer:
+    """The order of the providers asked by `ChainProvider` and the
+    `AsyncChainProvider` of the ASGI app.
+    """
+
+    def __init__(self, providers: list):
+        self.providers = providers
+
+    def _lookups(self, keys: set, calendars: dict):
+        """Yield every provider with the keys it must be asked for: the ones
+        not resolved by the previous ones, whose calendars must be added to
+        `calendars` before asking the next one.
+        """
+        missing_keys = set(keys)
+        for provider in self.providers:
+            missing_keys.difference_update(calendars)
+            if not missing_keys:
+                return
+            yield provider, missing_keys
+
+
+class ChainProvider(ChainLayer, HolidaysProvider):
+    """Ask the providers in order, each one only for the keys not resolved
+    by the previous ones.
+    """
+
+    def get_calendars(self, keys: set) -> dict:
+        calendars = {}
+        for provider, missing_keys in self._lookups(keys, calendars):
+            calendars.update(provider.get_calendars(missing_keys))
+        return calendars
+
+
+def _build_calendarific(config, upstream):
+    return CalendarificProvider(
+        config["CALENDARIFIC_API_KEY"],
+        HttpClient(
+            pool_size=config["CALENDARIFIC_POOL_SIZE"],
+            connect_timeout=config["CALENDARIFIC_CONNECT_TIMEOUT"],
+            read_timeout=config["CALENDARIFIC_READ_TIMEOUT"],
+            retries=config["CALENDARIFIC_RETRIES"],
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=config["CALENDARIFIC_CIRCUIT_THRESHOLD"],
+                reset_timeout=config["CALENDARIFIC_CIRCUIT_RESET_TIMEOUT"],
+            ),
+            name="calendarific",
+        ),
+    )
+
+
+def _build_redis(config, upstream):
+    if not isinstance(upstream, CalendarificProvider):
+        raise ValueError("The redis holidays provider must wrap calendarific.")
+
+    return RedisProvider(
+        create_redis_client(config),
+        upstream,
+        soft_ttl=config["HOLIDAYS_SOFT_TTL"],
+        hard_ttl=config["HOLIDAYS_HARD_TTL"],
+        retry_interval=config["REDIS_RETRY_INTERVAL"],
+    )
+
+
+def _build_memory(config, upstream):
+    return MemoryProvider(
+        upstream,
+        max_size=config["HOLIDAYS_MEMORY_MAX_SIZE"],
+        ttl=config["HOLIDAYS_MEMORY_TTL"].total_seconds(),
+    )
+
+
+def _build_dataset(config, upstream):
+    if not config["HOLIDAYS_DATASET_PATH"]:
+        return upstream
+    try:
+        provider = DatasetProvider(config["HOLIDAYS_DATASET_PATH"])
+    except (OSError, ValueError):
+        logger.exception("Unable to open the holidays dataset.")
+        return upstream
+    return (
+        provider if upstream is None else ChainProvider([provider, upstream])
+    )
+
+
+def _build_static(config, upstream):
+    provider = StaticProvider(
+        config["HOLIDAYS_STATIC"], default=None if upstream else frozenset()
+    )
+    return (
+        provider if upstream is None else ChainProvider([provider, upstream])
+    )
+
+
+PROVIDER_BUILDERS = {
+    "calendarific": _build_calendarific,
+    "redis": _build_redis,
+    "memory": _build_memory,
+    "dataset": _build_dataset,
+    "static": _build_static,
+}
+
+
+def build_holidays_provider(
+    config, builders: dict = PROVIDER_BUILDERS
+) -> HolidaysProvider:
+    """Build the holidays provider described by the `HOLIDAYS_PROVIDERS`
+    setting of the config given.
+
+    The setting is a comma separated list of layers, from the first one to
+    be consulted to the last one. `memory` and `redis` cache the layers
+    after them, `dataset` and `static` resolve the keys they cover and pass
+    the rest to the layers after them. Example: `memory,redis,calendarific`.
+
+    :param config: The application config.
+    :type config: dict
+    :param builders: The builder of every layer, from the config and the
+        provider of the layers after it.
+    :type builders: dict, optional
+    :return: The provider.
+    :rtype: HolidaysProvider
+    """
+    provider = None
+    for name in reversed(config["HOLIDAYS_PROVIDERS"].split(",")):
+        name = name.strip()
+        if name not in builders:
+            raise ValueError(f"Unknown holidays provider: {name}.")
+        if name == "memory" and provider is None:
+            raise ValueError("The memory holidays provider needs a layer.")
+        provider = builders[name](config, provider)
+
+    if provider is None:
+        raise ValueError("No holidays provider is available.")
+    return provider
@@ -1,70 +1,102 @@
-import json
-import os
-from datetime import date, timedelta
+import threading
+from datetime import date
 
-import requests
-from flask import abort, current_app
+from flask import current_app
+from werkzeug.exceptions import HTTPException
 
-from ..core.cache import r
+from ..core import metrics
+from .holiday_providers import (
+    HolidaysProvider,
+    build_holidays_provider,
+    subdivision_calendar,
+)
 
-CALENDARIFIC_API_KEY = os.environ["CALENDARIFIC_API_KEY"]
+_provider_lock = threading.Lock()
 
 
-def _make_holidays_request(params: dict) -> dict:
-    """Execute the request to fetch the holidays to the calendarific API.
-    This function must receive the a dict that will contain two required keys:
-    `country` and `year` that later will be joined with the api_key to send
-    the request.
+def get_holidays_provider() -> HolidaysProvider:
+    """Return the holidays provider of the current app, building it from
+    the app config on the first call.
 
-    :param params: A dict of params for the request.
-    :type params: dict
-    :return: The dict with the parsed JSON of the response.
+    :return: The provider.
+    :rtype: HolidaysProvider
+    """
+    provider = current_app.extensions.get("holidays_provider")
+    if provider is None:
+        with _provider_lock:
+            provider = current_app.extensions.get("holidays_provider")
+            if provider is None:
+                provider = build_holidays_provider(current_app.config)
+                current_app.extensions["holidays_provider"] = provider
+    return provider
+
+
+@metrics.timed("holidays")
+def resolve_calendars(keys: set) -> dict:
+    """Resolve at once the holidays calendars of several (country, year)
+    keys with the provider of the current app.
+
+    :param keys: The (country, year) keys to resolve.
+    :type keys: set
+    :return: The day ordinals of the holidays of every key covered by the
+        provider, supporting the `in` operator.
     :rtype: dict
     """
-    response = requests.get(
-        "https://calendarific.com/api/v2/holidays?",
-        params={"api_key": CALENDARIFIC_API_KEY, **params},
-    )
-    data = json.loads(response.text)
-    if response.status_code != 200:
-        if "error" not in data:
-            data["error"] = "Unknown error with holidays API."
-        abort(500, data["error"])
-    return data["response"]["holidays"]
+    return get_holidays_provider().get_calendars(set(keys))
 
 
-def _get_holidays(country: str, year: int) -> list:
-    """
-    Get the holidays for a given country and
-    year using the calendarific API or the redis cache.
+def resolve_calendars_by_key(keys: set) -> tuple:
+    """Resolve at once the holidays calendars of several (country, year)
+    keys like `resolve_calendars`, telling apart the keys that fail.
 
-    This method will cache the results using redis since this info will be
-    updated quarterly and we dont want to fetch the data again without changes.
+    When resolving them at once fails (like calendarific not answering for
+    a country), every key is resolved on its own, so the error is only
+    reported for the keys causing it.
 
-    :param country: The country code. Example: US
-    :type country: str
-    :param year: The year used to search the holidays. Example 2022
-    :type year: int
-    :return: The list of holidays for that country in that year.
-    :rtype: list
+    :param keys: The (country, year) keys to resolve.
+    :type keys: set
+    :return: The calendars of the keys resolved and the error (an
+        `HTTPException`) of every key failing.
+    :rtype: tuple
+    """
+    try:
+        return resolve_calendars(keys), {}
+    except HTTPException:
+        pass
+
+    calendars = {}
+    errors = {}
+    for key in keys:
+        try:
+            calendars.update(resolve_calendars({key}))
+        except HTTPException as e:
+            errors[key] = e
+    return calendars, errors
+
+
+def resolve_holidays(dates: set) -> set:
+    """Given a set of (date, country) pairs, this function determines which
+    of them are holidays, resolving the calendar of every (country, year)
+    involved at once.
+
+    The dates whose calendar is not covered by the provider are not
+    considered holidays.
+
+    :param dates: The (date, country) pairs to check.
+    :type dates: set
+    :return: The (date, country) pairs that are holidays.
+    :rtype: set
     """
-    cache_key_name = f"{country}-{year}"
-    cached_holidays = r.get(cache_key_name)
-    if cached_holidays is None:
-        holidays = _make_holidays_request(
-            {
-                "country": country,
-                "year": year,
-            }
-        )
-        r.setex(cache_key_name, timedelta(days=1), json.dumps(holidays))
-    else:
-        holidays = json.loads(cached_holidays.decode())
-
-    return holidays
-
-
-def is_holiday(d: date, country: str) -> bool:
+    dates = set(dates)
+    calendars = resolve_calendars({(country, d.year) for d, country in dates})
+    return {
+        (d, country)
+        for d, country in dates
+        if d.toordinal() in calendars.get((country, d.year), ())
+    }
+
+
+def is_holiday(d: date, country: str, subdivision: str = None) -> bool:
     """Given a date and country, this function determines
     whether the date provided is holiday or not.
 
@@ -72,17 +104,16 @@ def is_holiday(d: date, country: str) -> bool:
     :type d: datetime.date
     :param country: The corresponding country.
     :type country: str
+    :param subdivision: The corresponding subdivision of the country, whose
+        own holidays are considered too. Example: US-CA
+    :type subdivision: str, optional
     :return: Whether it is holiday or not.
     :rtype: bool
     """
-    if current_app.testing:
-        # Prepared value for a test scenarios.
-        if country == "US" and d == date(2022, 12, 23):
-            return True
+    if subdivision is None:
+        return (d, country) in resolve_holidays({(d, country)})
 
-        if country in ["SG", "NG", "IN"]:
-            return False
-
-    holidays = _get_holidays(country, d.year)
-    holidays_iso_dates = [h["date"]["iso"] for h in holidays]
-    return d.isoformat() in holidays_iso_dates
+    calendar = resolve_calendars({(country, d.year)}).get((country, d.year))
+    return calendar is not None and d.toordinal() in subdivision_calendar(
+        calendar, subdivision
+    )
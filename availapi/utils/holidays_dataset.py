@@ -0,0 +1,137 @@
+import mmap
+import os
+import struct
+from datetime import date
+
+# File layout (little endian):
+#   header: magic, format version, number of calendars.
+#   index:  one (code, year) entry per calendar, sorted, where the code is
+#           the country (Example: US) or, for the calendars of the
+#           subdivisions with holidays of their own, its ISO 3166-2 code
+#           (Example: US-CA), padded with NUL bytes.
+#   data:   one bitset per calendar (same order as the index) where the bit
+#           `n` is set when the day `n` of the year (0 based) is a holiday.
+#           The bitset of a subdivision includes the national holidays.
+#
+# Version 1 stored only the calendars of the countries.
+DATASET_MAGIC = b"AVHD"
+DATASET_VERSION = 2
+HEADER = struct.Struct("<4sB3xI")
+INDEX_ENTRY = struct.Struct("<6sH")
+BITSET_SIZE = 46  # ceil(366 / 8)
+
+
+def write_dataset(path: str, calendars: dict):
+    """Write the holidays given into a dataset file.
+
+    The file is written into a temporary path first and then moved, so the
+    workers reading the previous file never see a partial one.
+
+    :param path: The path of the dataset file.
+    :type path: str
+    :param calendars: The day ordinals (`date.toordinal`) of the holidays
+        for each (country, year) key, with the `subdivisions` index of a
+        `HolidaysCalendar` when they have one.
+    :type calendars: dict
+    """
+    entries = []
+    for (country, year), days in calendars.items():
+        entries.append((country, year, days))
+        entries.extend(
+            (subdivision, year, subdivision_days)
+            for subdivision, subdivision_days in getattr(
+                days, "subdivisions", {}
+            ).items()
+        )
+    # Sorted by code, so every country comes before its subdivisions.
+    entries.sort(key=lambda entry: entry[:2])
+
+    chunks = [HEADER.pack(DATASET_MAGIC, DATASET_VERSION, len(entries))]
+    chunks.extend(
+        INDEX_ENTRY.pack(code.encode("ascii"), year)
+        for code, year, _ in entries
+    )
+    for _, year, days in entries:
+        bitset = bytearray(BITSET_SIZE)
+        first_ordinal = date(year, 1, 1).toordinal()
+        for ordinal in days:
+            day = ordinal - first_ordinal
+            bitset[day >> 3] |= 1 << (day & 7)
+        chunks.append(bytes(bitset))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"".join(chunks))
+    os.replace(tmp_path, path)
+
+
+class DatasetCalendar:
+    """The holidays of a country in a year, backed by the dataset bitset.
+
+    Like the in-process index, it supports checking whether a day ordinal is
+    a holiday with the `in` operator, without parsing anything, and has the
+    calendars of the subdivisions with holidays of their own in
+    `subdivisions`.
+    """
+
+    __slots__ = ("_buffer", "_offset", "_first_ordinal", "subdivisions")
+
+    def __init__(self, buffer, offset: int, year: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._first_ordinal = date(year, 1, 1).toordinal()
+        self.subdivisions = {}
+
+    def __contains__(self, ordinal: int) -> bool:
+        day = ordinal - self._first_ordinal
+        if not 0 <= day < 366:
+            return False
+        return bool(self._buffer[self._offset + (day >> 3)] >> (day & 7) & 1)
+
+
+class HolidaysDataset:
+    """Read-only view of a dataset file, memory mapped.
+
+    Only the index is read when the file is opened, the bitsets are
+    consulted directly from the mapped file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = HEADER.unpack_from(self._buffer, 0)
+        if magic != DATASET_MAGIC or version != DATASET_VERSION:
+            raise ValueError(f"{path} is not a valid holidays dataset.")
+
+        data_offset = HEADER.size + count * INDEX_ENTRY.size
+        self._calendars = {}
+        for i, (code, year) in enumerate(
+            INDEX_ENTRY.iter_unpack(self._buffer[HEADER.size : data_offset])
+        ):
+            code = code.rstrip(b"\0").decode("ascii")
+            calendar = DatasetCalendar(
+                self._buffer, data_offset + i * BITSET_SIZE, year
+            )
+            if "-" in code:
+                # The country is indexed before its subdivisions.
+                country = code.split("-", 1)[0]
+                self._calendars[(country, year)].subdivisions[code] = calendar
+            else:
+                self._calendars[(code, year)] = calendar
+
+    def __len__(self) -> int:
+        return len(self._calendars)
+
+    def get(self, country: str, year: int):
+        """Return the holidays of a country in a year.
+
+        :param country: The country code. Example: US
+        :type country: str
+        :param year: The year of the holidays. Example 2022
+        :type year: int
+        :return: The calendar (with the ones of its subdivisions) or None
+            when the dataset does not cover it.
+        :rtype: DatasetCalendar
+        """
+        return self._calendars.get((country, year))
@@ -0,0 +1,241 @@
+"""Intersection of datetime ranges stored as int64 epoch microseconds.
+
+Once the ranges are in a `Ranges`, the intersection itself is
+sub-millisecond: about 0.1 ms for 1,000 ranges and 0.01 ms for 10,000
+(with NumPy). Filling the `Ranges` is not: every datetime is converted one
+by one in Python, so the whole intersection (`benchmarks/test_micro.py`
+`test_intersection`) takes about 2.8 ms for 1,000 ranges and 25 ms for
+10,000, which misses the sub-millisecond target for thousands of ranges.
+NumPy cannot convert aware datetimes in bulk (`datetime64` drops the
+timezone, with a deprecation warning, and is slower), so the conversion is
+only made cheaper (`to_epoch_us`).
+"""
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import pytz
+
+from ..core import metrics
+
+# NumPy is imported by the first intersection needing it, as importing it
+# takes longer than the rest of a cold start. It is optional: when it is not
+# installed (None) the `array` fallback is used.
+_NOT_IMPORTED = object()
+np = _NOT_IMPORTED
+
+EPOCH = datetime(1970, 1, 1, tzinfo=pytz.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+US_PER_DAY = 86_400_000_000
+
+# The UTC offsets (microseconds) of the fixed-offset timezones seen, the
+# timezones parsed from the requests. `timezone` instances are equal by
+# offset, so there is at most one entry per offset.
+_fixed_offsets = {}
+
+# Below this size the NumPy call overhead is higher than what it saves.
+NUMPY_MIN_SIZE = 1024
+
+
+def _numpy():
+    global np
+    if np is _NOT_IMPORTED:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+
+def to_epoch_us(dt: datetime) -> int:
+    """Convert an aware datetime into microseconds since the epoch (UTC).
+
+    The microseconds are computed from the fields of the datetime, which is
+    about twice as fast as subtracting the epoch (a `timedelta` and a UTC
+    conversion per call).
+
+    :param dt: The datetime to convert, it must include the timezone.
+    :type dt: datetime
+    :return: The microseconds since 1970-01-01T00:00:00Z.
+    :rtype: int
+    """
+    tz = dt.tzinfo
+    offset = _fixed_offsets.get(tz) if type(tz) is timezone else None
+    if offset is None:
+        offset = dt.utcoffset() // ONE_MICROSECOND
+        if type(tz) is timezone:
+            _fixed_offsets[tz] = offset
+    return (
+        (dt.toordinal() - EPOCH_ORDINAL) * US_PER_DAY
+        + ((dt.hour * 60 + dt.minute) * 60 + dt.second) * 1_000_000
+        + dt.microsecond
+        - offset
+    )
+
+
+def from_epoch_us(us: int) -> datetime:
+    """Convert microseconds since the epoch into a UTC datetime.
+
+    :param us: The microseconds since 1970-01-01T00:00:00Z.
+    :type us: int
+    :return: The datetime in UTC.
+    :rtype: datetime
+    """
+    return EPOCH + timedelta(microseconds=int(us))
+
+
+class Ranges:
+    """Columnar storage of datetime ranges as int64 epoch microseconds.
+
+    The `from`/`to` of every range are kept in two `array("q")`, which can be
+    shared with NumPy without copies.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self):
+        self.starts = array("q")
+        self.ends = array("q")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def append(self, from_dt: datetime, to_dt: datetime):
+        """Add a range.
+
+        :param from_dt: The aware `from` datetime of the range.
+        :type from_dt: datetime
+        :param to_dt: The aware `to` datetime of the range.
+        :type to_dt: datetime
+        """
+        self.starts.append(to_epoch_us(from_dt))
+        self.ends.append(to_epoch_us(to_dt))
+
+
+@metrics.timed("intersection")
+def common_window(ranges: Ranges):
+    """Find the window shared by all the ranges given, that is, from the
+    highest `from` to the lowest `to`.
+
+    :param ranges: The ranges to intersect.
+    :type ranges: Ranges
+    :return: The (from, to) epoch microseconds of the window or None when
+        the ranges do not intersect (or there are no ranges).
+    :rtype: tuple
+    """
+    if len(ranges) == 0:
+        return None
+
+    if len(ranges) >= NUMPY_MIN_SIZE and _numpy() is not None:
+        start = int(np.frombuffer(ranges.starts, dtype=np.int64).max())
+        end = int(np.frombuffer(ranges.ends, dtype=np.int64).min())
+    else:
+        start = max(ranges.starts)
+        end = min(ranges.ends)
+
+    if start >= end:
+        return None
+    return start, end
+
+
+@metrics.timed("intersection")
+def common_windows(participants: list) -> list:
+    """Find the windows where all the participants are available, keeping
+    the bounds of the ranges of every participant: a window never spans the
+    end of a range (like the midnight between two business days) even when
+    the next range of the participant starts at that same instant.
+
+    :param participants: The ranges of every participant, not overlapping.
+    :type participants: list of Ranges
+    :return: The (from, to) epoch microseconds of the windows, sorted by
+        `from`.
+    :rtype: list
+    """
+    if not participants:
+        return []
+
+    windows = sorted(zip(participants[0].starts, participants[0].ends))
+    for ranges in participants[1:]:
+        other = sorted(zip(ranges.starts, ranges.ends))
+        intersected = []
+        i = j = 0
+        while i < len(windows) and j < len(other):
+            start = max(windows[i][0], other[j][0])
+            end = min(windows[i][1], other[j][1])
+            if start < end:
+                intersected.append((start, end))
+            if windows[i][1] < other[j][1]:
+                i += 1
+            else:
+                j += 1
+        windows = intersected
+        if not windows:
+            break
+    return windows
+
+
+def _merge(ranges: Ranges) -> list:
+    """Merge the overlapping (or contiguous) ranges given.
+
+    :param ranges: The ranges to merge.
+    :type ranges: Ranges
+    :return: The sorted (from, to) epoch microseconds of the merged ranges.
+    :rtype: list
+    """
+    merged = []
+    for start, end in sorted(zip(ranges.starts, ranges.ends)):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+@metrics.timed("intersection")
+def free_windows(participants: list, min_participants: int) -> list:
+    """Find every window where at least `min_participants` of the
+    participants are available, using a sweep-line over the sorted `from`
+    and `to` of all the ranges (O(n log n)).
+
+    The ranges of a participant are merged first so a participant is never
+    counted twice. Every window returned has a constant number of available
+    participants, the contiguous windows with the same number are joined.
+
+    :param participants: The ranges of every participant.
+    :type participants: list of Ranges
+    :param min_participants: The participants needed for a window.
+    :type min_participants: int
+    :return: The [from, to, participants] of the windows, where from/to are
+        epoch microseconds, sorted by `from`.
+    :rtype: list
+    """
+    events = []
+    for ranges in participants:
+        for start, end in _merge(ranges):
+            events.append((start, 1))
+            events.append((end, -1))
+    events.sort()
+
+    windows = []
+    available = 0
+    previous = None
+    i = 0
+    while i < len(events):
+        instant = events[i][0]
+        if previous is not None and available >= min_participants:
+            if (
+                windows
+                and windows[-1][1] == previous
+                and windows[-1][2] == available
+            ):
+                windows[-1][1] = instant
+            else:
+                windows.append([previous, instant, available])
+
+        # Apply all the events happening at the same instant together.
+        while i < len(events) and events[i][0] == instant:
+            available += events[i][1]
+            i += 1
+        previous = instant
+    return windows
@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from ..core.http import RateLimiter
+from .countries import supported_countries
+from .holidays import get_holidays_provider
+
+logger = logging.getLogger(__name__)
+
+
+def parse_countries(value: str) -> list:
+    """Parse a comma separated list of country codes, all the supported
+    countries when it is empty.
+
+    :param value: The country codes. Example: US,SG
+    :type value: str
+    :raises ValueError: When a country is not supported.
+    :return: The country codes.
+    :rtype: list
+    """
+    countries = [c.strip().upper() for c in (value or "").split(",")]
+    countries = [c for c in countries if c]
+    if not countries:
+        return list(supported_countries)
+
+    unknown = [c for c in countries if c not in supported_countries]
+    if unknown:
+        raise ValueError(f"Unknown countries: {', '.join(unknown)}.")
+    return countries
+
+
+def warmup_keys(countries: list, years: list = None) -> list:
+    """Return the (country, year) keys to warm up.
+
+    :param countries: The country codes.
+    :type countries: list
+    :param years: The years, the current and the next one by default.
+    :type years: list, optional
+    :return: The keys.
+    :rtype: list
+    """
+    if not years:
+        years = [date.today().year, date.today().year + 1]
+    return [(country, year) for country in countries for year in years]
+
+
+def warm_up_holidays(
+    provider, keys: list, max_workers: int = 8, rate: float = None
+) -> dict:
+    """Resolve the holidays of the keys given so they get cached by the
+    layers of the provider (redis under the same `{country}-{year}` keys).
+
+    The keys are resolved one by one by a bounded pool of workers and, when
+    `rate` is given, at most `rate` keys per second.
+
+    :param provider: The holidays provider.
+    :type provider: HolidaysProvider
+    :param keys: The (country, year) keys to warm up.
+    :type keys: list
+    :param max_workers: The keys resolved concurrently.
+    :type max_workers: int, optional
+    :param rate: The keys resolved per second, unlimited when not given.
+    :type rate: float, optional
+    :return: The report: the `keys` warmed up, the `failures` per key, the
+        `elapsed` seconds and the `timings` (seconds) per key.
+    :rtype: dict
+    """
+    rate_limiter = RateLimiter(rate) if rate else None
+
+    def warm_up(key):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        started_at = time.monotonic()
+        try:
+            provider.get_calendars({key})
+        except Exception as e:
+            return key, time.monotonic() - started_at, e
+        return key, time.monotonic() - started_at, None
+
+    started_at = time.monotonic()
+    timings = {}
+    failures = {}
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="holidays-warmup"
+    ) as executor:
+        for key, elapsed, error in executor.map(warm_up, keys):
+            timings[key] = elapsed
+            if error is not None:
+                # The aborted requests explain the error in the description.
+                description = getattr(error, "description", None)
+                failures[key] = description or str(error)
+    return {
+        "keys": len(keys),
+        "failures": failures,
+        "elapsed": time.monotonic() - started_at,
+        "timings": timings,
+    }
+
+
+def start_warmup(app) -> threading.Thread:
+    """Warm up in background the holidays of the countries in the
+    `HOLIDAYS_WARMUP_COUNTRIES` setting, logging the report.
+
+    :param app: The application.
+    :type app: Flask
+    :return: The thread warming up.
+    :rtype: threading.Thread
+    """
+
+    def run():
+        with app.app_context():
+            try:
+                report = warm_up_holidays(
+                    get_holidays_provider(),
+                    warmup_keys(
+                        parse_countries(
+                            app.config["HOLIDAYS_WARMUP_COUNTRIES"]
+                        )
+                    ),
+                    max_workers=app.config["HOLIDAYS_WARMUP_WORKERS"],
+                    rate=app.config["HOLIDAYS_WARMUP_RATE"],
+                )
+            except Exception:
+                logger.exception("Unable to warm up the holidays.")
+                return
+        logger.info(
+            "Warmed up %s holidays calendars in %.2fs, %s failed.",
+            report["keys"] - len(report["failures"]),
+            report["elapsed"],
+            len(report["failures"]),
+        )
+        for (country, year), error in report["failures"].items():
+            logger.warning(
+                "Unable to warm up the holidays %s-%s: %s",
+                country,
+                year,
+                error,
+            )
+
+    thread = threading.Thread(target=run, name="holidays-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -1,25 +1,128 @@
 from datetime import date
 
+from flask import current_app, has_app_context
 
-def is_weekend(d: date) -> bool:
-    """Given a datetime this function will return whether such day is weekend
-    or not
+# Weekends as bitmasks of weekdays, where the bit `n` is set when the day
+# `n` (`date.weekday`) is a weekend day.
+#
+# 0 = Monday
+# 1 = Tuesday
+# 2 = Wednesday
+# 3 = Thursday
+# 4 = Friday
+# 5 = Sathurday
+# 6 = Sunday
+FRIDAY = 1 << 4
+SATURDAY = 1 << 5
+SUNDAY = 1 << 6
+DEFAULT_WEEKEND_MASK = SATURDAY | SUNDAY
+
+# Countries whose weekend is not Saturday and Sunday.
+WEEKEND_MASKS = {
+    **dict.fromkeys(
+        (
+            "DZ",
+            "BH",
+            "BD",
+            "EG",
+            "IQ",
+            "IL",
+            "JO",
+            "KW",
+            "LY",
+            "MV",
+            "OM",
+            "QA",
+            "SA",
+            "SD",
+            "SY",
+            "YE",
+        ),
+        FRIDAY | SATURDAY,
+    ),
+    **dict.fromkeys(("AF", "IR", "DJ"), FRIDAY),
+    "NP": SATURDAY,
+    "BN": FRIDAY | SUNDAY,
+}
+
+# Former weekends of the countries that changed it: (until year, mask)
+# pairs, sorted by year.
+WEEKEND_HISTORY = {"AE": ((2022, FRIDAY | SATURDAY),)}
 
-    In python, the datetime.weekday function will help us with this since will
-    return an integer that will represent the day.
 
-    0 = Monday
-    1 = Tuesday
-    2 = Wednesday
-    3 = Thursday
-    4 = Friday
-    5 = Sathurday
-    6 = Sunday
+def build_weekends(overrides: dict) -> tuple:
+    """Build the weekends tables with the weekend of some countries
+    overridden, for all the years.
+
+    :param overrides: The weekdays (`date.weekday`) of the weekend per
+        country. Example: {"AE": [5, 6]}
+    :type overrides: dict
+    :raises ValueError: When a weekday is not valid.
+    :return: The weekend masks and history per country, like
+        `WEEKEND_MASKS` and `WEEKEND_HISTORY`.
+    :rtype: tuple
+    """
+    masks = dict(WEEKEND_MASKS)
+    history = dict(WEEKEND_HISTORY)
+    for country, weekdays in overrides.items():
+        mask = 0
+        for weekday in weekdays:
+            if weekday not in range(7):
+                raise ValueError(
+                    f"Invalid weekday {weekday!r} for the weekend of "
+                    f"{country}, it must be from 0 (Monday) to 6 (Sunday)."
+                )
+            mask |= 1 << weekday
+        masks[country] = mask
+        history.pop(country, None)
+    return masks, history
+
+
+def configure_weekends(app):
+    """Use the weekends of the app's `WEEKENDS` setting, which override the
+    built-in ones, in the requests of the app (and its app context).
+
+    :param app: The application.
+    :type app: Flask
+    :raises ValueError: When a weekday is not valid.
+    """
+    app.extensions["weekends"] = build_weekends(app.config["WEEKENDS"])
+
+
+def weekend_mask(country: str = None, year: int = None) -> int:
+    """Return the weekend of a country as a bitmask of weekdays, from the
+    weekends of the current app (the built-in ones outside an app context).
+
+    :param country: The country code, Saturday and Sunday when not given.
+        Example: US
+    :type country: str, optional
+    :param year: The year, the current weekend when not given.
+    :type year: int, optional
+    :return: The weekdays (`date.weekday`) of the weekend as a bitmask.
+    :rtype: int
+    """
+    masks, history = WEEKEND_MASKS, WEEKEND_HISTORY
+    if has_app_context():
+        masks, history = current_app.extensions.get(
+            "weekends", (masks, history)
+        )
+    if year is not None:
+        for until, mask in history.get(country, ()):
+            if year < until:
+                return mask
+    return masks.get(country, DEFAULT_WEEKEND_MASK)
+
+
+def is_weekend(d: date, country: str = None) -> bool:
+    """Given a datetime this function will return whether such day is weekend
+    or not in a country
 
     :param d: The datetime to check
     :type d: datetime.date
+    :param country: The country code, Saturday and Sunday are the weekend
+        when not given. Example: US
+    :type country: str, optional
     :return: Whether correspond to a weekend or not
     :rtype: bool
     """
-
-    return d.weekday() == 5 or d.weekday() == 6
+    return bool(weekend_mask(country, d.year) >> d.weekday() & 1)
@@ -0,0 +1,213 @@
+"""Routes of the availability API, registered by `create_app`."""
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    make_response,
+    request,
+    stream_with_context,
+)
+from webargs.flaskparser import use_args
+
+from .core.availability import (
+    check_availability,
+    check_availability_batch,
+    find_slots,
+    iter_ndjson_results,
+    validate_batch,
+)
+from .core.result_cache import cache_results
+from .core.schemas import SlotsQuerySchema, dump_ranked_slots, dump_slots
+
+api = Blueprint("availability", __name__)
+
+
+@api.route("/availability-check", methods=["POST"])
+@cache_results
+def check_availability_endpoint(data):
+    """Check availability view.
+    ---
+    post:
+      summary: Check availability
+      description: |
+        Determine and returns a meeting slot available (in UTC) between an
+        array of object that individually represent certain availability range
+        in a given country.
+        The ranges can span several days, in such case they are split by day
+        skipping the weekends and holidays and every slot where all the ranges
+        match is returned.
+      requestBody:
+        required: true
+        content:
+          application/json:
+            schema:
+              type: array
+              items: RangeSchema
+      responses:
+        200:
+          content:
+            application/json:
+              schema:
+                type: array
+                items: SlotSchema
+        304:
+          description: The slots did not change since the response with the
+            `ETag` sent in `If-None-Match` (only with `RESULT_CACHE_ENABLED`).
+        400:
+          $ref: '#/components/responses/BadRequest'
+        422:
+          $ref: '#/components/responses/UnprocessableEntity'
+      tags:
+        - Availability
+    """
+    slot_json = dump_slots(check_availability(data))
+
+    return make_response(slot_json, 200, {"Content-Type": "application/json"})
+
+
+@api.route("/availability-slots", methods=["POST"])
+@use_args(SlotsQuerySchema(), location="json")
+def find_slots_endpoint(data):
+    """Find slots view.
+    ---
+    post:
+      summary: Find slots
+      description: |
+        Determine and returns (in UTC) every meeting slot where all the
+        participants, or at least `min_participants` of them, are available.
+        Every participant can have several availability ranges, the ones
+        corresponding to a weekend or holiday in their country are ignored.
+        The slots are ranked by the participants available and then by
+        their duration.
+      requestBody:
+        required: true
+        content:
+          application/json:
+            schema: SlotsQuerySchema
+      responses:
+        200:
+          content:
+            application/json:
+              schema:
+                type: array
+                items: RankedSlotSchema
+        422:
+          $ref: '#/components/responses/UnprocessableEntity'
+      tags:
+        - Availability
+    """
+    slots_json = dump_ranked_slots(
+        find_slots(data["participants"], data["min_participants"])
+    )
+    return make_response(slots_json, 200, {"Content-Type": "application/json"})
+
+
+@api.route("/availability-check/batch", methods=["POST"])
+def check_availability_batch_endpoint():
+    """Check availability in batch view.
+    ---
+    post:
+      summary: Check availability in batch
+      description: |
+        Check the availability of several independent queries at once. Every
+        query is an array of ranges, like the body of `/availability-check`,
+        and gets its own result with the status and body that such endpoint
+        would have returned, so a query failing does not affect the others.
+      requestBody:
+        required: true
+        content:
+          application/json:
+            schema:
+              type: array
+              items:
+                type: array
+                items: RangeSchema
+      responses:
+        200:
+          content:
+            application/json:
+              schema:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    status:
+                      type: integer
+                      example: 200
+                    body:
+                      oneOf:
+                        - type: array
+                          items: SlotSchema
+                        - type: object
+                          properties:
+                            errors: {}
+        422:
+          $ref: '#/components/responses/UnprocessableEntity'
+      tags:
+        - Availability
+    """
+    queries = request.get_json(silent=True)
+    validate_batch(queries, current_app.config["MAX_BATCH_SIZE"])
+
+    results = check_availability_batch(queries)
+    return make_response(results, 200, {"Content-Type": "application/json"})
+
+
+@api.route("/availability-check/stream", methods=["POST"])
+def check_availability_stream_endpoint():
+    """Check availability in stream view.
+    ---
+    post:
+      summary: Check availability in stream
+      description: |
+        Check the availability of a stream of queries in newline-delimited
+        JSON, one query (an array of ranges) per line. The results are
+        streamed back as newline-delimited JSON while the queries are read,
+        one line per query with the `status` and `body` that
+        `/availability-check` would have returned for it.
+      requestBody:
+        required: true
+        content:
+          application/x-ndjson:
+            schema:
+              type: array
+              items: RangeSchema
+      responses:
+        200:
+          content:
+            application/x-ndjson:
+              schema:
+                type: object
+                properties:
+                  status:
+                    type: integer
+                    example: 200
+                  body:
+                    oneOf:
+                      - type: array
+                        items: SlotSchema
+                      - type: object
+                        properties:
+                          errors: {}
+      tags:
+        - Availability
+    """
+
+    def generate():
+        for result in iter_ndjson_results(
+            request.stream, current_app.config["STREAM_CHUNK_SIZE"]
+        ):
+            yield current_app.json.dumps(result, separators=(",", ":")) + "\n"
+
+    return Response(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
+
+
+# The views described in the OpenAPI spec (see `availapi.docs.spec`).
+DOCUMENTED_VIEWS = (
+    check_availability_endpoint,
+    find_slots_endpoint,
+    check_availability_batch_endpoint,
+    check_availability_stream_endpoint,
+)
@@ -0,0 +1,80 @@
+"""Compare the intersection engine against the previous code path of
+`check_availability_endpoint` (normalize + dicts + max/min).
+
+Usage: python -m benchmarks.bench_intersection
+"""
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+import pytz
+
+from availapi.utils.intersection import Ranges, common_window, from_epoch_us
+
+SIZES = [1, 10, 100, 1000, 10000]
+
+
+def _build_data(size: int) -> list:
+    data = []
+    for _ in range(size):
+        tz = timezone(timedelta(hours=random.randint(-3, 3)))
+        data.append(
+            {
+                "from_datetime": datetime(
+                    2022, 5, 2, random.randint(6, 9), tzinfo=tz
+                ),
+                "to_datetime": datetime(
+                    2022, 5, 2, random.randint(17, 20), tzinfo=tz
+                ),
+            }
+        )
+    return data
+
+
+def previous_code_path(data: list):
+    utc_dt_ranges = []
+    for dt_range in data:
+        utc_dt_ranges.append(
+            {
+                "from_datetime": pytz.utc.normalize(dt_range["from_datetime"]),
+                "to_datetime": pytz.utc.normalize(dt_range["to_datetime"]),
+            }
+        )
+    if len(utc_dt_ranges) == 1:
+        return (
+            utc_dt_ranges[0]["from_datetime"],
+            utc_dt_ranges[0]["to_datetime"],
+        )
+    return (
+        max(*[r["from_datetime"] for r in utc_dt_ranges]),
+        min(*[r["to_datetime"] for r in utc_dt_ranges]),
+    )
+
+
+def engine_code_path(data: list):
+    ranges = Ranges()
+    for dt_range in data:
+        ranges.append(dt_range["from_datetime"], dt_range["to_datetime"])
+    window = common_window(ranges)
+    return from_epoch_us(window[0]), from_epoch_us(window[1])
+
+
+def main():
+    random.seed(0)
+    print(f"{'ranges':>8} {'previous (us)':>15} {'engine (us)':>13} {'x':>6}")
+    for size in SIZES:
+        data = _build_data(size)
+        assert previous_code_path(data) == engine_code_path(data)
+        number = max(1, 20000 // size)
+        previous = timeit.timeit(
+            lambda: previous_code_path(data), number=number
+        )
+        engine = timeit.timeit(lambda: engine_code_path(data), number=number)
+        print(
+            f"{size:>8} {previous / number * 1e6:>15.1f} "
+            f"{engine / number * 1e6:>13.1f} {previous / engine:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Data and app shared by the benchmarks: the `/availability-check` bodies of
+every size and the app resolving the holidays through an in-memory redis and
+a stubbed calendarific, so nothing leaves the process.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+
+from availapi import create_app
+from availapi.testing import StubCalendarific
+from availapi.utils.holiday_providers import MemoryProvider, RedisProvider
+
+# Ranges per `/availability-check` body of the scaling cases.
+SIZES = [1, 10, 100, 10000]
+
+COUNTRIES = ["US", "SG", "NG", "GB", "DE", "IN", "BR", "SA"]
+
+
+def build_ranges(size: int, seed: int = 0) -> list:
+    """Build an `/availability-check` body of `size` single-day ranges of
+    several countries and offsets, all of them matched between 12:00 and
+    14:00 UTC.
+
+    :param size: The number of ranges.
+    :type size: int
+    :param seed: The seed of the offsets and hours.
+    :type seed: int
+    :return: The body.
+    :rtype: list
+    """
+    rng = random.Random(seed)
+    body = []
+    for i in range(size):
+        tz = timezone(timedelta(hours=rng.randint(-3, 3)))
+        body.append(
+            {
+                "from": datetime(
+                    2022, 5, 2, rng.randint(6, 9), tzinfo=tz
+                ).isoformat(timespec="milliseconds"),
+                "to": datetime(
+                    2022, 5, 2, rng.randint(17, 20), tzinfo=tz
+                ).isoformat(timespec="milliseconds"),
+                "cc": COUNTRIES[i % len(COUNTRIES)],
+            }
+        )
+    return body
+
+
+def create_bench_app(calendarific_delay: float = 0):
+    """Create the app resolving the holidays from memory, then an in-memory
+    redis and then a stubbed calendarific.
+
+    :param calendarific_delay: Seconds every calendarific request takes.
+    :type calendarific_delay: float, optional
+    :return: The app.
+    :rtype: Flask
+    """
+    app = create_app({"TESTING": True, "RESULT_CACHE_ENABLED": False})
+    app.extensions["holidays_provider"] = MemoryProvider(
+        RedisProvider(
+            fakeredis.FakeRedis(), StubCalendarific(delay=calendarific_delay)
+        )
+    )
+    return app
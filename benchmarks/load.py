@@ -0,0 +1,183 @@
+"""Load test of `/availability-check`: serve the app on a local port (with
+an in-memory redis and a stubbed calendarific) and send the bodies of every
+size from concurrent clients, reporting the throughput and latencies.
+
+Usage: python -m benchmarks.load [--save | --compare]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+
+import requests
+from werkzeug.serving import make_server
+
+from benchmarks.common import SIZES, build_ranges, create_bench_app
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(__file__), "baselines", "load.json"
+)
+
+
+def percentile(values: list, percent: float) -> float:
+    """Return the percentile of sorted values (nearest rank)."""
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def run_scenario(url: str, body: list, concurrency: int, duration: float):
+    """Post the body from `concurrency` clients for `duration` seconds.
+
+    :return: The requests per second and the latencies (ms) percentiles.
+    :rtype: dict
+    """
+    data = json.dumps(body)
+    headers = {"Content-Type": "application/json"}
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + duration
+
+    def client():
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            started_at = time.perf_counter()
+            response = session.post(url, data=data, headers=headers)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    started_at = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Compare the results of every size with the baseline.
+
+    :return: The regressions found, as messages.
+    :rtype: list
+    """
+    regressions = []
+    print(f"\n{'ranges':>8} {'rps':>16} {'p95 (ms)':>20}")
+    for size, result in results.items():
+        base = baseline["results"].get(size)
+        if base is None:
+            continue
+        rps_delta = result["rps"] / base["rps"] - 1
+        p95_delta = result["p95_ms"] / base["p95_ms"] - 1
+        print(
+            f"{size:>8} {base['rps']:>8} {rps_delta:>+7.1%} "
+            f"{base['p95_ms']:>12} {p95_delta:>+7.1%}"
+        )
+        if rps_delta < -tolerance:
+            regressions.append(f"{size} ranges: rps {rps_delta:+.1%}")
+        if p95_delta > tolerance:
+            regressions.append(f"{size} ranges: p95 {p95_delta:+.1%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, SIZES)), help="Ranges per body."
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--duration", type=float, default=5, help="Seconds per size."
+    )
+    parser.add_argument(
+        "--calendarific-delay",
+        type=float,
+        default=0.2,
+        help="Seconds every (stubbed) calendarific request takes.",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as baseline."
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare with the baseline, failing on a regression.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Change allowed before a regression (0.2 = 20%%).",
+    )
+    args = parser.parse_args(argv)
+
+    app = create_bench_app(args.calendarific_delay)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/availability-check"
+
+    results = {}
+    print(
+        f"{'ranges':>8} {'requests':>9} {'errors':>7} {'rps':>9} "
+        f"{'mean (ms)':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10}"
+    )
+    for size in map(int, args.sizes.split(",")):
+        body = build_ranges(size)
+        # Warm up: the holidays are fetched from calendarific once.
+        requests.post(url, json=body)
+        result = results[str(size)] = run_scenario(
+            url, body, args.concurrency, args.duration
+        )
+        print(
+            f"{size:>8} {result['requests']:>9} {result['errors']:>7} "
+            f"{result['rps']:>9} {result['mean_ms']:>10} "
+            f"{result['p50_ms']:>10} {result['p95_ms']:>10} "
+            f"{result['p99_ms']:>10}"
+        )
+    server.shutdown()
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "machine": {
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "cpus": os.cpu_count(),
+                    },
+                    "concurrency": args.concurrency,
+                    "duration": args.duration,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:\n" + "\n".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""Benchmarks of `/availability-check` through the Flask test client, from
+the request body to the response body.
+"""
+import pytest
+
+from benchmarks.common import SIZES, build_ranges, create_bench_app
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module")
+def bench_client():
+    client = create_bench_app().test_client()
+    client.post("/availability-check", json=build_ranges(100))
+    return client
+
+
+@pytest.mark.parametrize("size", SIZES, ids=lambda size: f"{size}-ranges")
+def test_availability_check(benchmark, bench_client, size):
+    body = build_ranges(size)
+
+    response = benchmark(bench_client.post, "/availability-check", json=body)
+
+    assert response.status_code == 200, response.json
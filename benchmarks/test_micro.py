@@ -0,0 +1,94 @@
+"""Micro benchmarks of the steps of `/availability-check`.
+
+Usage: python -m pytest benchmarks (see the README to store and compare the
+baselines).
+"""
+from datetime import date, datetime, timezone
+
+import pytest
+
+from availapi.core.availability import check_availability
+from availapi.core.fast_validation import fast_load_ranges
+from availapi.core.schemas import RangeSchema, SlotSchema, dump_slots
+from availapi.utils.holidays import is_holiday
+from availapi.utils.intersection import (
+    Ranges,
+    common_window,
+    from_epoch_us,
+    to_epoch_us,
+)
+from availapi.utils.weekends import is_weekend
+from benchmarks.common import SIZES, build_ranges, create_bench_app
+
+pytest.importorskip("pytest_benchmark")
+
+ranges_schema = RangeSchema(many=True)
+
+SLOTS_START_US = to_epoch_us(datetime(2022, 5, 2, 12, tzinfo=timezone.utc))
+
+
+@pytest.fixture(scope="module")
+def bench_app():
+    app = create_bench_app()
+    with app.app_context():
+        # Resolve the holidays once, so the benchmarks read them from memory.
+        check_availability(ranges_schema.load(build_ranges(100)))
+        yield app
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}-ranges")
+def body(request):
+    return build_ranges(request.param)
+
+
+def test_is_weekend(benchmark):
+    benchmark(is_weekend, date(2022, 5, 6), "SA")
+
+
+def test_is_holiday(benchmark, bench_app):
+    benchmark(is_holiday, date(2022, 7, 4), "US")
+
+
+def test_is_holiday_subdivision(benchmark, bench_app):
+    benchmark(is_holiday, date(2022, 3, 31), "US", "US-AA")
+
+
+def test_schema_load(benchmark, body):
+    benchmark(ranges_schema.load, body)
+
+
+def test_fast_load(benchmark, body):
+    assert benchmark(fast_load_ranges, body) is not None
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}-slots")
+def slots(request):
+    return [
+        {
+            "from_datetime": from_epoch_us(SLOTS_START_US + i * 60_000_000),
+            "to_datetime": from_epoch_us(SLOTS_START_US + i * 90_000_000),
+        }
+        for i in range(request.param)
+    ]
+
+
+def test_schema_dump(benchmark, slots):
+    benchmark(SlotSchema(many=True).dump, slots)
+
+
+def test_dump_slots(benchmark, slots):
+    benchmark(dump_slots, slots)
+
+
+def test_intersection(benchmark, body):
+    def intersect(data):
+        ranges = Ranges()
+        for dt_range in data:
+            ranges.append(dt_range["from_datetime"], dt_range["to_datetime"])
+        return common_window(ranges)
+
+    assert benchmark(intersect, fast_load_ranges(body)) is not None
+
+
+def test_check_availability(benchmark, bench_app, body):
+    benchmark(check_availability, fast_load_ranges(body))
@@ -1,13 +1,39 @@
+from datetime import date
+
+import fakeredis
 import pytest
 
-from availapi import app
+from availapi import create_app
+
+
+@pytest.fixture()
+def fake_redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture()
+def fake_redis(fake_redis_server):
+    return fakeredis.FakeRedis(server=fake_redis_server)
+
+
+@pytest.fixture()
+def fake_async_redis(fake_redis_server):
+    """Asyncio client of the same in-memory redis as `fake_redis`."""
+    return fakeredis.FakeAsyncRedis(server=fake_redis_server)
 
 
 @pytest.fixture()
 def app_fixture():
-    app.config.update(
+    app = create_app(
         {
             "TESTING": True,
+            # Prepared holidays for the test scenarios, so the tests do not
+            # need to reach redis nor calendarific.
+            "HOLIDAYS_PROVIDERS": "static",
+            "HOLIDAYS_STATIC": {
+                ("US", 2022): [date(2022, 12, 23)],
+                ("US-CA", 2022): [date(2022, 12, 22)],
+            },
         }
     )
 
@@ -0,0 +1,88 @@
+import subprocess
+import sys
+
+import availapi
+from availapi import create_app
+from availapi.config import Config
+
+
+def test_sc1_nothing_loaded_on_startup():
+    """
+    Scenario 1: Nothing loaded on startup
+    Given the app created in a new process, apispec must not be imported
+    nor the holidays provider built.
+    """
+    # Arrange
+    code = (
+        "import sys\n"
+        "from availapi import create_app\n"
+        "app = create_app()\n"
+        "assert 'apispec' not in sys.modules, 'apispec was imported.'\n"
+        "assert 'holidays_provider' not in app.extensions\n"
+    )
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+
+    # Assert
+    assert result.returncode == 0, result.stderr
+
+
+def test_sc2_spec_generated_once(client, app_fixture):
+    """
+    Scenario 2: Spec generated once
+    Given `/spec.json` requested twice, the document must be generated on
+    the first request and describe the routes.
+    """
+    # Act
+    first = client.get("/spec.json")
+    second = client.get("/spec.json")
+
+    # Assert
+    assert first.status_code == 200, "The status must be 200."
+    assert second.json == first.json, "The document must be the same."
+    assert set(first.json["paths"]) == {
+        "/availability-check",
+        "/availability-slots",
+        "/availability-check/batch",
+        "/availability-check/stream",
+    }
+    assert app_fixture.extensions["spec"] is not None, "Must be cached."
+
+
+def test_sc3_config():
+    """
+    Scenario 3: Config
+    Given a mapping or an object, it must override the default config.
+    """
+
+    # Arrange
+    class NoDocsConfig(Config):
+        DOCS_ENABLED = False
+
+    # Act
+    app = create_app({"MAX_BATCH_SIZE": 10})
+    no_docs_app = create_app(NoDocsConfig)
+
+    # Assert
+    assert app.config["MAX_BATCH_SIZE"] == 10
+    assert app.config["STREAM_CHUNK_SIZE"] == Config.STREAM_CHUNK_SIZE
+    assert no_docs_app.test_client().get("/spec.json").status_code == 404
+    assert no_docs_app.test_client().get("/docs/").status_code == 404
+
+
+def test_sc4_module_app():
+    """
+    Scenario 4: Module app
+    Given `availapi:app` accessed, the same app must be created once.
+    """
+    # Act
+    app = availapi.app
+
+    # Assert
+    assert availapi.app is app, "The app must be created once."
+    assert "/availability-check" in {
+        rule.rule for rule in app.url_map.iter_rules()
+    }
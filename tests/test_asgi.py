@@ -0,0 +1,344 @@
+import asyncio
+import json
+
+import pytest
+import redis
+
+from availapi.asgi import AsgiApp
+from availapi.testing import BrokenRedis, StubCalendarific
+from availapi.utils.async_holiday_providers import (
+    AsyncCalendarificProvider,
+    AsyncRedisProvider,
+    build_async_holidays_provider,
+)
+from availapi.utils.holiday_providers import build_holidays_calendar
+
+HAPPY_QUERY = [
+    {
+        "from": "2022-05-02T09:00:00.0+08:00",
+        "to": "2022-05-02T17:00:00.0+08:00",
+        "cc": "SG",
+    },
+    {
+        "from": "2022-05-02T09:00:00.0+01:00",
+        "to": "2022-05-02T17:00:00.0+01:00",
+        "cc": "NG",
+    },
+]
+
+HOLIDAY_QUERY = [
+    {
+        "from": "2022-12-23T09:00:00.0-05:00",
+        "to": "2022-12-23T17:00:00.0-05:00",
+        "cc": "US",
+    }
+]
+
+
+def asgi_request(asgi_app, method, path, chunks=(b"",), content_type=None):
+    """Send a request to an ASGI app and return the status, headers and
+    body of the response.
+    """
+    headers = []
+    if content_type is not None:
+        headers.append((b"content-type", content_type.encode()))
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": headers,
+        "server": ("testserver", 80),
+    }
+    messages = [
+        {
+            "type": "http.request",
+            "body": chunk,
+            "more_body": i < len(chunks) - 1,
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return sent[0]["status"], dict(sent[0]["headers"]), body
+
+
+@pytest.mark.parametrize(
+    "method, path, body",
+    [
+        ("POST", "/availability-check", HAPPY_QUERY),
+        ("POST", "/availability-check", HOLIDAY_QUERY),
+        ("POST", "/availability-check", [{"from": "", "cc": "SG"}]),
+        ("POST", "/availability-check", []),
+        ("POST", "/availability-check", "{"),
+        ("POST", "/availability-slots", {"participants": [HAPPY_QUERY]}),
+        (
+            "POST",
+            "/availability-slots",
+            {"participants": [{"ranges": HAPPY_QUERY}], "min_participants": 2},
+        ),
+        (
+            "POST",
+            "/availability-slots",
+            {"participants": [{"ranges": HAPPY_QUERY}]},
+        ),
+        (
+            "POST",
+            "/availability-check/batch",
+            [HAPPY_QUERY, HOLIDAY_QUERY, []],
+        ),
+        ("POST", "/availability-check/batch", {}),
+        ("GET", "/availability-check", None),
+        ("GET", "/spec.json", None),
+        ("POST", "/not-found", None),
+    ],
+)
+def test_sc1_same_responses_as_flask(app_fixture, method, path, body):
+    """
+    Scenario 1: Same responses as the Flask app
+    Given any request, the ASGI app must respond the same status and body
+    as the Flask app.
+    """
+    # Arrange
+    asgi_app = AsgiApp(app_fixture)
+    if body is None:
+        data, content_type = b"", None
+    elif body == "{":
+        data, content_type = b"{", "application/json"
+    else:
+        data, content_type = json.dumps(body).encode(), "application/json"
+
+    # Act
+    status, headers, asgi_body = asgi_request(
+        asgi_app, method, path, (data,), content_type
+    )
+    response = app_fixture.test_client().open(
+        path, method=method, data=data, content_type=content_type
+    )
+
+    # Assert
+    assert status == response.status_code, "The status did not match."
+    assert asgi_body == response.data, "The body did not match."
+    assert headers[b"content-type"] == response.content_type.encode()
+
+
+def test_sc2_stream(app_fixture):
+    """
+    Scenario 2: Stream
+    Given a stream of queries received in several pieces, the ASGI app must
+    stream the same lines as the Flask app.
+    """
+    # Arrange
+    asgi_app = AsgiApp(app_fixture)
+    app_fixture.config["STREAM_CHUNK_SIZE"] = 2
+    data = "\n".join(
+        json.dumps(query) for query in (HAPPY_QUERY, [], HOLIDAY_QUERY, "foo")
+    ).encode()
+
+    # Act
+    try:
+        status, headers, body = asgi_request(
+            asgi_app,
+            "POST",
+            "/availability-check/stream",
+            (data[:10], data[10:100], data[100:]),
+            "application/x-ndjson",
+        )
+    finally:
+        app_fixture.config["STREAM_CHUNK_SIZE"] = 100
+    response = app_fixture.test_client().post(
+        "/availability-check/stream",
+        data=data,
+        content_type="application/x-ndjson",
+    )
+
+    # Assert
+    assert status == 200, "The status must be 200."
+    assert headers[b"content-type"] == b"application/x-ndjson"
+    assert body == response.data, "The lines did not match."
+    assert len(body.splitlines()) == 4, "There must be a line per query."
+
+
+def test_sc3_concurrent_misses_coalesced(fake_redis, fake_async_redis):
+    """
+    Scenario 3: Concurrent misses coalesced
+    Given concurrent lookups of the same holidays missing in redis, they
+    must be requested once and then served from redis.
+    """
+    # Arrange
+    upstream = StubCalendarific(delay=0.05)
+    provider = AsyncRedisProvider(
+        fake_async_redis, AsyncCalendarificProvider(upstream)
+    )
+    keys = {("US", 2022), ("SG", 2022)}
+
+    async def lookups():
+        return await asyncio.gather(
+            *(provider.get_calendars(keys) for _ in range(5))
+        )
+
+    # Act
+    results = asyncio.run(lookups())
+    cached = asyncio.run(provider.get_calendars(keys))
+
+    # Assert
+    expected = build_holidays_calendar(upstream.request_holidays("US", 2022))
+    assert sorted(upstream.requests[:-1]) == [("SG", 2022), ("US", 2022)]
+    assert all(result[("US", 2022)] == expected for result in results)
+    assert cached[("US", 2022)] == expected, "It must be cached in redis."
+    assert fake_redis.get("US-2022") is not None
+
+
+def test_sc4_redis_unavailable(app_fixture):
+    """
+    Scenario 4: Redis unavailable
+    Given redis failing, the holidays must be requested to the upstream.
+    """
+    # Arrange
+    upstream = StubCalendarific()
+    provider = AsyncRedisProvider(
+        BrokenRedis(asynchronous=True), AsyncCalendarificProvider(upstream)
+    )
+
+    # Act
+    calendars = asyncio.run(provider.get_calendars({("US", 2022)}))
+
+    # Assert
+    assert ("US", 2022) in calendars, "The holidays must be resolved."
+    assert upstream.requests == [("US", 2022)]
+    assert not provider._is_available(), "Redis must be skipped meanwhile."
+
+
+def test_sc5_provider_layers(app_fixture):
+    """
+    Scenario 5: Provider layers
+    Given the holidays providers setting, the async provider must have the
+    same layers as the sync one.
+    """
+    # Arrange
+    config = {
+        **app_fixture.config,
+        "HOLIDAYS_PROVIDERS": "memory,redis,calendarific",
+    }
+
+    # Act
+    provider = build_async_holidays_provider(config)
+
+    # Assert
+    assert isinstance(provider.upstream, AsyncRedisProvider)
+    assert isinstance(provider.upstream.client, redis.asyncio.Redis)
+    with pytest.raises(ValueError):
+        build_async_holidays_provider(
+            {**config, "HOLIDAYS_PROVIDERS": "redis,static"}
+        )
+
+
+def test_sc6_workers_coalesced_by_the_lease(fake_redis, fake_async_redis):
+    """
+    Scenario 6: Workers coalesced by the lease
+    Given two workers (two providers) missing the same holidays at the same
+    time, only the one holding the redis lease must request them and both
+    must get them.
+    """
+    # Arrange
+    upstream = StubCalendarific(delay=0.05)
+    workers = [
+        AsyncRedisProvider(
+            fake_async_redis, AsyncCalendarificProvider(upstream)
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.single_flight.poll_interval = 0.01
+
+    async def lookups():
+        return await asyncio.gather(
+            *(worker.get_calendars({("US", 2022)}) for worker in workers)
+        )
+
+    # Act
+    results = asyncio.run(lookups())
+
+    # Assert
+    expected = build_holidays_calendar(upstream.request_holidays("US", 2022))
+    assert upstream.requests[:-1] == [("US", 2022)], "Must be requested once."
+    assert all(result[("US", 2022)] == expected for result in results)
+    assert fake_redis.get("US-2022:lease") is None, "The lease must be freed."
+
+
+def test_sc7_batch_holidays_failing_for_a_country(app_fixture):
+    """
+    Scenario 7: Batch with the holidays of a country failing
+    Given the holidays of a country failing to resolve, only the queries of
+    the batch needing them must fail, like in the Flask app.
+    """
+    # Arrange
+    upstream = StubCalendarific(failing={"SG"})
+    app_fixture.extensions["holidays_provider"] = upstream
+    asgi_app = AsgiApp(app_fixture)
+    asgi_app._holidays_provider = AsyncCalendarificProvider(upstream)
+    data = json.dumps([[HAPPY_QUERY[1]], HAPPY_QUERY]).encode()
+
+    # Act
+    status, _, body = asgi_request(
+        asgi_app,
+        "POST",
+        "/availability-check/batch",
+        (data,),
+        "application/json",
+    )
+    response = app_fixture.test_client().post(
+        "/availability-check/batch", data=data, content_type="application/json"
+    )
+
+    # Assert
+    assert status == 200, "The status must be 200."
+    assert [result["status"] for result in json.loads(body)] == [200, 500]
+    assert body == response.data, "The body did not match."
+
+
+def test_sc8_stream_holidays_failing_for_a_country(app_fixture):
+    """
+    Scenario 8: Stream with the holidays of a country failing
+    Given the holidays of a country failing to resolve, the stream must go
+    on with a 500 line for every query needing them, like the Flask app.
+    """
+    # Arrange
+    upstream = StubCalendarific(failing={"SG"})
+    app_fixture.extensions["holidays_provider"] = upstream
+    asgi_app = AsgiApp(app_fixture)
+    asgi_app._holidays_provider = AsyncCalendarificProvider(upstream)
+    data = "\n".join(
+        json.dumps(query) for query in ([HAPPY_QUERY[1]], HAPPY_QUERY, [])
+    ).encode()
+
+    # Act
+    status, _, body = asgi_request(
+        asgi_app,
+        "POST",
+        "/availability-check/stream",
+        (data,),
+        "application/x-ndjson",
+    )
+    response = app_fixture.test_client().post(
+        "/availability-check/stream",
+        data=data,
+        content_type="application/x-ndjson",
+    )
+
+    # Assert
+    assert status == 200, "The status must be 200."
+    assert [json.loads(line)["status"] for line in body.splitlines()] == [
+        200,
+        500,
+        422,
+    ]
+    assert body == response.data, "The lines did not match."
@@ -0,0 +1,148 @@
+from availapi.testing import StubCalendarific
+
+ENDPOINT_URL = "/availability-check/batch"
+
+HAPPY_QUERY = [
+    {
+        "from": "2022-05-02T09:00:00.0+08:00",
+        "to": "2022-05-02T17:00:00.0+08:00",
+        "cc": "SG",
+    },
+    {
+        "from": "2022-05-02T09:00:00.0+01:00",
+        "to": "2022-05-02T17:00:00.0+01:00",
+        "cc": "NG",
+    },
+]
+
+
+def test_sc1_independent_results(client):
+    """
+    Scenario 1: Independent results
+    Given several queries, every one must get the status and body that
+    `/availability-check` would have returned.
+    """
+    # Arrange
+    request_body = [
+        HAPPY_QUERY,
+        [
+            {
+                "from": "2022-12-23T09:00:00.0-05:00",
+                "to": "2022-12-23T17:00:00.0-05:00",
+                "cc": "US",
+            }
+        ],
+        [{"from": "", "to": "2022-05-02T17:00:00.0+08:00", "cc": "SG"}],
+        [
+            {
+                "from": "2022-05-02T09:00:00.0+24:00",
+                "to": "2022-05-02T17:00:00.0+08:00",
+                "cc": "SG",
+            }
+        ],
+        [],
+        "foo",
+    ]
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert response.is_json, "The response format must be JSON."
+    assert response.json == [
+        {
+            "status": 200,
+            "body": [
+                {
+                    "from": "2022-05-02T08:00:00.0Z",
+                    "to": "2022-05-02T09:00:00.0Z",
+                }
+            ],
+        },
+        {
+            "status": 400,
+            "body": {
+                "errors": "Unable to find an available slot. "
+                "The date 2022-12-23 is holiday in US."
+            },
+        },
+        {
+            "status": 422,
+            "body": {
+                "errors": {"json": {"0": {"from": ["Not a valid datetime."]}}}
+            },
+        },
+        {
+            "status": 422,
+            "body": {
+                "errors": {"json": {"0": {"from": ["Not a valid datetime."]}}}
+            },
+        },
+        {
+            "status": 422,
+            "body": {
+                "errors": {
+                    "json": {
+                        "_schema": ["Invalid input type. The array is empty."]
+                    }
+                }
+            },
+        },
+        {
+            "status": 422,
+            "body": {"errors": {"json": {"_schema": ["Invalid input type."]}}},
+        },
+    ], "The output did not match."
+
+
+def test_sc2_results_match_single_endpoint(client):
+    """
+    Scenario 2: Same output as the single endpoint
+    Given a query, the result must be the same as `/availability-check`.
+    """
+    # Act
+    single = client.post("/availability-check", json=HAPPY_QUERY)
+    batch = client.post(ENDPOINT_URL, json=[HAPPY_QUERY])
+
+    # Assert
+    assert batch.json == [{"status": single.status_code, "body": single.json}]
+
+
+def test_sc3_invalid_batch(client):
+    """
+    Scenario 3: Invalid batch
+    Given a body that is not an array of queries, an error must be returned.
+    """
+    # Act
+    response = client.post(ENDPOINT_URL, json={"foo": "bar"})
+
+    # Assert
+    assert response.status_code == 422, "The status must be 422."
+    assert response.json == {
+        "errors": {"json": {"_schema": ["Invalid input type."]}}
+    }, "The output did not match."
+
+
+def test_sc4_holidays_failing_for_a_country(app_fixture):
+    """
+    Scenario 4: Holidays failing for a country
+    Given the holidays of a country failing to resolve, only the queries
+    needing them must fail, with a 500 result.
+    """
+    # Arrange
+    upstream = StubCalendarific(failing={"SG"})
+    app_fixture.extensions["holidays_provider"] = upstream
+    ng_query = [HAPPY_QUERY[1], {**HAPPY_QUERY[1], "cc": "GB"}]
+
+    # Act
+    response = app_fixture.test_client().post(
+        ENDPOINT_URL, json=[ng_query, HAPPY_QUERY, []]
+    )
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert [result["status"] for result in response.json] == [200, 500, 422]
+    assert response.json[1]["body"] == {
+        "errors": "The holidays API is not available."
+    }, "The error of the holidays must be returned."
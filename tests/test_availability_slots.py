@@ -0,0 +1,141 @@
+ENDPOINT_URL = "/availability-slots"
+
+
+def _range(day, from_hour, to_hour, offset, cc):
+    return {
+        "from": f"2022-05-{day:02}T{from_hour:02}:00:00.0{offset}",
+        "to": f"2022-05-{day:02}T{to_hour:02}:00:00.0{offset}",
+        "cc": cc,
+    }
+
+
+def test_sc1_all_free_windows(client):
+    """
+    Scenario 1: All the free windows
+    Given participants with several ranges, every window where all of them
+    are available must be returned ranked by duration.
+    """
+    # Arrange
+    request_body = {
+        "participants": [
+            {
+                "ranges": [
+                    _range(2, 9, 12, "+00:00", "NG"),
+                    _range(2, 13, 17, "+00:00", "NG"),
+                ]
+            },
+            {"ranges": [_range(2, 10, 16, "+00:00", "SG")]},
+        ]
+    }
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert response.is_json, "The response format must be JSON."
+    assert response.json == [
+        {
+            "from": "2022-05-02T13:00:00.0Z",
+            "to": "2022-05-02T16:00:00.0Z",
+            "participants": 2,
+        },
+        {
+            "from": "2022-05-02T10:00:00.0Z",
+            "to": "2022-05-02T12:00:00.0Z",
+            "participants": 2,
+        },
+    ], "The output did not match."
+
+
+def test_sc2_min_participants(client):
+    """
+    Scenario 2: At least k participants
+    Given a `min_participants`, the windows with fewer participants must be
+    excluded and the rest ranked by attendance.
+    """
+    # Arrange
+    request_body = {
+        "participants": [
+            {"ranges": [_range(2, 9, 12, "+00:00", "NG")]},
+            {"ranges": [_range(2, 11, 14, "+00:00", "SG")]},
+            {"ranges": [_range(2, 13, 15, "+00:00", "IN")]},
+        ],
+        "min_participants": 2,
+    }
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert response.json == [
+        {
+            "from": "2022-05-02T11:00:00.0Z",
+            "to": "2022-05-02T12:00:00.0Z",
+            "participants": 2,
+        },
+        {
+            "from": "2022-05-02T13:00:00.0Z",
+            "to": "2022-05-02T14:00:00.0Z",
+            "participants": 2,
+        },
+    ], "The output did not match."
+
+
+def test_sc3_special_dates_are_ignored(client):
+    """
+    Scenario 3: Weekends and holidays
+    Given ranges on a weekend or holiday, they must be ignored and when no
+    window is left an empty list returned.
+    """
+    # Arrange
+    request_body = {
+        "participants": [
+            {
+                "ranges": [
+                    {
+                        "from": "2022-12-23T09:00:00.0-05:00",
+                        "to": "2022-12-23T17:00:00.0-05:00",
+                        "cc": "US",
+                    }
+                ]
+            },
+            {"ranges": [_range(7, 9, 17, "+00:00", "NG")]},
+        ],
+    }
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert response.json == [], "The output did not match."
+
+
+def test_sc4_min_participants_too_high(client):
+    """
+    Scenario 4: Invalid `min_participants`
+    Given more `min_participants` than participants, an error is returned.
+    """
+    # Arrange
+    request_body = {
+        "participants": [{"ranges": [_range(2, 9, 12, "+00:00", "NG")]}],
+        "min_participants": 2,
+    }
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 422, "The status must be 422."
+    assert response.json == {
+        "errors": {
+            "json": {
+                "min_participants": [
+                    "The `min_participants` field must not be higher than "
+                    "the number of participants."
+                ]
+            }
+        }
+    }, "The output did not match."
@@ -0,0 +1,115 @@
+import json
+
+from availapi.core.availability import iter_ndjson_results
+from availapi.testing import StubCalendarific
+
+ENDPOINT_URL = "/availability-check/stream"
+
+HAPPY_QUERY = [
+    {
+        "from": "2022-05-02T09:00:00.0+08:00",
+        "to": "2022-05-02T17:00:00.0+08:00",
+        "cc": "SG",
+    },
+    {
+        "from": "2022-05-02T09:00:00.0+01:00",
+        "to": "2022-05-02T17:00:00.0+01:00",
+        "cc": "NG",
+    },
+]
+
+
+def test_sc1_streamed_results(client):
+    """
+    Scenario 1: Streamed results
+    Given a stream of queries, one line must be returned per query with the
+    status and body that `/availability-check` would have returned.
+    """
+    # Arrange
+    request_body = "\n".join(
+        [json.dumps(HAPPY_QUERY), "", "foo", json.dumps([])]
+    )
+    single = client.post("/availability-check", json=HAPPY_QUERY)
+
+    # Act
+    response = client.post(
+        ENDPOINT_URL, data=request_body, content_type="application/x-ndjson"
+    )
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"status": single.status_code, "body": single.json},
+        {
+            "status": 422,
+            "body": {"errors": {"json": {"_schema": ["Invalid input type."]}}},
+        },
+        {
+            "status": 422,
+            "body": {
+                "errors": {
+                    "json": {
+                        "_schema": ["Invalid input type. The array is empty."]
+                    }
+                }
+            },
+        },
+    ], "The output did not match."
+
+
+def test_sc2_results_by_chunks(app_fixture):
+    """
+    Scenario 2: Results by chunks
+    Given more queries than the chunk size, the results must keep the order
+    of the queries and be produced while the stream is read.
+    """
+    # Arrange
+    read = []
+
+    def lines():
+        for i in range(5):
+            read.append(i)
+            yield json.dumps(HAPPY_QUERY if i % 2 else [])
+
+    # Act
+    with app_fixture.app_context():
+        results = iter_ndjson_results(lines(), chunk_size=2)
+        first = next(results)
+        read_before_rest = list(read)
+        statuses = [first["status"]] + [r["status"] for r in results]
+
+    # Assert
+    assert read_before_rest == [0, 1], "Only the first chunk must be read."
+    assert statuses == [422, 200, 422, 200, 422]
+
+
+def test_sc3_holidays_failing_for_a_country(app_fixture):
+    """
+    Scenario 3: Holidays failing for a country
+    Given the holidays of a country failing to resolve, the stream must go
+    on with a 500 line for every query needing them.
+    """
+    # Arrange
+    app_fixture.extensions["holidays_provider"] = StubCalendarific(
+        failing={"SG"}
+    )
+    request_body = "\n".join(
+        json.dumps(query) for query in ([HAPPY_QUERY[1]], HAPPY_QUERY, [])
+    )
+
+    # Act
+    response = app_fixture.test_client().post(
+        ENDPOINT_URL, data=request_body, content_type="application/x-ndjson"
+    )
+
+    # Assert
+    results = [
+        json.loads(line)
+        for line in response.get_data(as_text=True).splitlines()
+    ]
+    assert [result["status"] for result in results] == [200, 500, 422]
+    assert results[1]["body"] == {
+        "errors": "The holidays API is not available."
+    }, "The error of the holidays must be returned."
@@ -1,3 +1,5 @@
+from datetime import date
+
 ENDPOINT_URL = "/availability-check"
 
 
@@ -318,16 +320,73 @@ def test_sc10_weekend(client):
     }, "The output did not match."
 
 
-def test_sc11_from_to_different_dates(client):
+def test_sc11_multi_day_ranges(client):
+    """
+    Scenario 11: Ranges spanning several days
+    Given ranges spanning a weekend, the slots of every business day where
+    all of them match must be returned.
+    """
+    # Arrange
+    request_body = [
+        {
+            "from": "2022-05-06T09:00:00.0+08:00",
+            "to": "2022-05-09T17:00:00.0+08:00",
+            "cc": "SG",
+        },
+        {
+            "from": "2022-05-06T09:00:00.0+01:00",
+            "to": "2022-05-09T17:00:00.0+01:00",
+            "cc": "NG",
+        },
+    ]
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert response.is_json, "The response format must be JSON."
+    assert response.json == [
+        {"from": "2022-05-06T08:00:00.0Z", "to": "2022-05-06T16:00:00.0Z"},
+        {"from": "2022-05-08T23:00:00.0Z", "to": "2022-05-09T09:00:00.0Z"},
+    ], "The output did not match."
+
+
+def test_sc12_multi_day_range_without_business_days(client):
     """
-    Scenario 11: From/To different dates
-    Given a from/to with different dates, an error must be returned.
+    Scenario 12: Range spanning only non business days
+    Given a range covering only a weekend, a meaningful response is returned.
+    """
+    # Arrange
+    request_body = [
+        {
+            "from": "2022-12-24T09:00:00.0-05:00",
+            "to": "2022-12-25T17:00:00.0-05:00",
+            "cc": "US",
+        },
+    ]
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 400, "The status must be 400."
+    assert response.json == {
+        "errors": "Unable to find an available slot. "
+        "The date 2022-12-24 correspond to a weekend."
+    }, "The output did not match."
+
+
+def test_sc13_range_too_long(client):
+    """
+    Scenario 13: Range too long
+    Given a range spanning more than 31 days, an error must be returned.
     """
     # Arrange
     request_body = [
         {
             "from": "2022-05-02T09:00:00.0+08:00",
-            "to": "2022-05-03T17:00:00.0+08:00",
+            "to": "2022-06-03T17:00:00.0+08:00",
             "cc": "SG",
         },
     ]
@@ -342,11 +401,162 @@ def test_sc11_from_to_different_dates(client):
         "errors": {
             "json": {
                 "0": {
-                    "_schema": [
-                        "The `from` and `to` dates must "
-                        "be correspond to the same day."
+                    "_schema": ["The range must not span more than 31 days."]
+                }
+            }
+        }
+    }, "The output did not match."
+
+
+def test_sc14_subdivision_holiday(client):
+    """
+    Scenario 14: Subdivision holiday
+    Given a range on a holiday observed only in a subdivision of the country,
+    it must be rejected only for that subdivision.
+    """
+    # Arrange
+    dt_range = {
+        "from": "2022-12-22T09:00:00.0-08:00",
+        "to": "2022-12-22T17:00:00.0-08:00",
+        "cc": "US",
+    }
+
+    # Act
+    country_response = client.post(ENDPOINT_URL, json=[dt_range])
+    subdivision_response = client.post(
+        ENDPOINT_URL, json=[{**dt_range, "subdivision": "US-CA"}]
+    )
+    other_response = client.post(
+        ENDPOINT_URL, json=[{**dt_range, "subdivision": "US-NY"}]
+    )
+
+    # Assert
+    assert country_response.status_code == 200, "Must be available in US."
+    assert other_response.status_code == 200, "Must be available in US-NY."
+    assert subdivision_response.status_code == 400, "The status must be 400."
+    assert subdivision_response.json == {
+        "errors": "Unable to find an available slot. "
+        "The date 2022-12-22 is holiday in US-CA."
+    }, "The output did not match."
+
+
+def test_sc15_subdivision_of_another_country(client):
+    """
+    Scenario 15: Subdivision of another country
+    Given a subdivision not belonging to the country of the range, an error
+    must be returned.
+    """
+    # Arrange
+    request_body = [
+        {
+            "from": "2022-05-02T09:00:00.0+08:00",
+            "to": "2022-05-02T17:00:00.0+08:00",
+            "cc": "SG",
+            "subdivision": "US-CA",
+        },
+    ]
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 422, "The status must be 422."
+    assert response.json == {
+        "errors": {
+            "json": {
+                "0": {
+                    "subdivision": [
+                        "The subdivision must belong to the country `cc`."
                     ]
                 }
             }
         }
     }, "The output did not match."
+
+
+def test_sc16_weekend_of_the_country(client):
+    """
+    Scenario 16: Weekend of the country
+    Given a range on a friday in a country whose weekend includes fridays,
+    a meaningful response is returned.
+    """
+    # Arrange
+    request_body = [
+        {
+            "from": "2022-07-08T09:00:00.0+03:00",
+            "to": "2022-07-08T17:00:00.0+03:00",
+            "cc": "SA",
+        },
+    ]
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 400, "The status must be 400."
+    assert response.json == {
+        "errors": "Unable to find an available slot. "
+        "The date 2022-07-08 correspond to a weekend."
+    }, "The output did not match."
+
+
+def test_sc17_consecutive_business_days(client):
+    """
+    Scenario 17: Ranges spanning consecutive business days
+    Given ranges spanning several business days, the slots must not cross
+    the midnights of any of the ranges.
+    """
+    # Arrange
+    request_body = [
+        {
+            "from": "2022-05-02T09:00:00.0+08:00",
+            "to": "2022-05-04T17:00:00.0+08:00",
+            "cc": "SG",
+        },
+        {
+            "from": "2022-05-02T09:00:00.0+01:00",
+            "to": "2022-05-04T17:00:00.0+01:00",
+            "cc": "NG",
+        },
+    ]
+
+    # Act
+    response = client.post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert response.json == [
+        {"from": "2022-05-02T08:00:00.0Z", "to": "2022-05-02T16:00:00.0Z"},
+        {"from": "2022-05-02T16:00:00.0Z", "to": "2022-05-02T23:00:00.0Z"},
+        {"from": "2022-05-02T23:00:00.0Z", "to": "2022-05-03T16:00:00.0Z"},
+        {"from": "2022-05-03T16:00:00.0Z", "to": "2022-05-03T23:00:00.0Z"},
+        {"from": "2022-05-03T23:00:00.0Z", "to": "2022-05-04T09:00:00.0Z"},
+    ], "The output did not match."
+
+
+def test_sc18_range_with_mixed_offsets_across_years(app_fixture):
+    """
+    Scenario 18: Range with mixed offsets across years
+    Given a range whose `to` is in the previous year in its own offset but
+    in the next one in the offset of `from`, the holidays of the next year
+    must be considered too.
+    """
+    # Arrange
+    app_fixture.config["HOLIDAYS_STATIC"] = {("US", 2024): [date(2024, 1, 1)]}
+    request_body = [
+        {
+            "from": "2023-12-31T10:00:00.0+14:00",
+            "to": "2023-12-31T23:00:00.0-10:00",
+            "cc": "US",
+        },
+    ]
+
+    # Act
+    response = app_fixture.test_client().post(ENDPOINT_URL, json=request_body)
+
+    # Assert
+    assert response.status_code == 400, "The status must be 400."
+    assert response.json == {
+        "errors": "Unable to find an available slot. "
+        "The date 2023-12-31 correspond to a weekend."
+    }, "The output did not match."
@@ -0,0 +1,145 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from availapi import create_app
+from availapi.utils.business_days import (
+    business_calendars,
+    get_business_days,
+    split_business_windows,
+)
+from availapi.utils.weekends import is_weekend
+
+TZ = timezone(timedelta(hours=-5))
+
+
+def test_split_business_windows():
+    """
+    Given a range from a friday to a tuesday with a holiday on monday, only
+    the windows of friday and tuesday must be returned.
+    """
+    # Arrange
+    calendars = {("US", 2022): frozenset([date(2022, 7, 4).toordinal()])}
+
+    # Act
+    windows = split_business_windows(
+        datetime(2022, 7, 1, 9, tzinfo=TZ),
+        datetime(2022, 7, 5, 17, tzinfo=TZ),
+        "US",
+        calendars,
+    )
+
+    # Assert
+    assert windows == [
+        (datetime(2022, 7, 1, 9, tzinfo=TZ), datetime(2022, 7, 2, tzinfo=TZ)),
+        (datetime(2022, 7, 5, tzinfo=TZ), datetime(2022, 7, 5, 17, tzinfo=TZ)),
+    ], "The windows did not match."
+
+
+def test_range_ending_at_midnight():
+    """
+    Given a range ending at midnight, the next day must not have a window.
+    """
+    # Act
+    windows = split_business_windows(
+        datetime(2022, 7, 5, 9, tzinfo=TZ),
+        datetime(2022, 7, 6, tzinfo=TZ),
+        "US",
+        {},
+    )
+
+    # Assert
+    assert windows == [
+        (datetime(2022, 7, 5, 9, tzinfo=TZ), datetime(2022, 7, 6, tzinfo=TZ))
+    ], "The windows did not match."
+
+
+def test_business_days_are_computed_once_per_calendar():
+    """
+    Given the same holidays calendar, the business days must be reused and
+    computed again once the calendar changes.
+    """
+    # Arrange
+    business_calendars.clear()
+    holidays = frozenset([date(2022, 7, 4).toordinal()])
+
+    # Act
+    first = get_business_days("US", 2022, holidays)
+    second = get_business_days("US", 2022, holidays)
+    updated = get_business_days("US", 2022, frozenset())
+
+    # Assert
+    assert first is second, "The business days must be reused."
+    assert len(first) == 365
+    assert first[date(2022, 7, 4).timetuple().tm_yday - 1] == 0
+    assert first[date(2022, 7, 2).timetuple().tm_yday - 1] == 0
+    assert first[date(2022, 7, 5).timetuple().tm_yday - 1] == 1
+    assert updated[date(2022, 7, 4).timetuple().tm_yday - 1] == 1
+
+
+def test_weekend_of_the_country():
+    """
+    Given a range from a thursday to a sunday in a country whose weekend is
+    friday and saturday, only the windows of thursday and sunday must be
+    returned.
+    """
+    # Arrange
+    tz = timezone(timedelta(hours=3))
+
+    # Act
+    windows = split_business_windows(
+        datetime(2022, 7, 7, 9, tzinfo=tz),
+        datetime(2022, 7, 10, 17, tzinfo=tz),
+        "SA",
+        {},
+    )
+
+    # Assert
+    assert windows == [
+        (datetime(2022, 7, 7, 9, tzinfo=tz), datetime(2022, 7, 8, tzinfo=tz)),
+        (
+            datetime(2022, 7, 10, tzinfo=tz),
+            datetime(2022, 7, 10, 17, tzinfo=tz),
+        ),
+    ], "The windows did not match."
+
+
+def test_weekend_changes():
+    """
+    Given a country that changed its weekend, the weekend of every year
+    must be used.
+    """
+    # Act & Assert
+    assert is_weekend(date(2021, 12, 31), "AE"), "Friday until 2022."
+    assert not is_weekend(date(2021, 12, 26), "AE"), "Sunday until 2022."
+    assert not is_weekend(date(2022, 1, 7), "AE"), "Friday since 2022."
+    assert is_weekend(date(2022, 1, 9), "AE"), "Sunday since 2022."
+    assert is_weekend(date(2022, 1, 8), "US") and is_weekend(date(2022, 1, 8))
+
+
+def test_configured_weekends():
+    """
+    Given a weekend overridden by the config of an app, it must be used for
+    all the years in that app only, and the business days computed again.
+    """
+    # Arrange
+    business_calendars.clear()
+    monday = date(2022, 7, 4)
+    app = create_app({"TESTING": True, "WEEKENDS": {"US": [0, 6], "AE": [6]}})
+    other_app = create_app({"TESTING": True})
+
+    # Act
+    before = get_business_days("US", 2022, frozenset())
+    with app.app_context():
+        after = get_business_days("US", 2022, frozenset())
+        ae_weekend = is_weekend(date(2021, 12, 26), "AE")
+    with other_app.app_context():
+        other_app_weekend = is_weekend(monday, "US")
+
+    # Assert
+    assert before[monday.timetuple().tm_yday - 1] == 1
+    assert after[monday.timetuple().tm_yday - 1] == 0, "Must be recomputed."
+    assert ae_weekend, "Must replace the former weekends."
+    assert not other_app_weekend, "Must not apply to other apps."
+    with pytest.raises(ValueError):
+        create_app({"WEEKENDS": {"US": [7]}})
@@ -0,0 +1,41 @@
+import redis
+
+from availapi.core.cache import create_redis_client
+
+
+def test_redis_client_is_built_from_config(app_fixture):
+    """
+    Given the redis settings, a pooled client must be created without
+    connecting to redis.
+    """
+    # Arrange
+    config = {
+        **app_fixture.config,
+        "REDIS_HOST": "redis.local",
+        "REDIS_MAX_CONNECTIONS": 7,
+    }
+
+    # Act
+    client = create_redis_client(config)
+
+    # Assert
+    pool = client.connection_pool
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs["host"] == "redis.local"
+    assert pool.connection_kwargs["socket_timeout"] == 0.5
+    assert pool._created_connections == 0, "It must connect lazily."
+
+
+def test_redis_client_over_unix_socket(app_fixture):
+    """
+    Given a unix socket, the client must use it instead of the host.
+    """
+    # Act
+    client = create_redis_client(
+        {**app_fixture.config, "REDIS_UNIX_SOCKET": "/tmp/redis.sock"}
+    )
+
+    # Assert
+    pool = client.connection_pool
+    assert pool.connection_class is redis.UnixDomainSocketConnection
+    assert pool.connection_kwargs["path"] == "/tmp/redis.sock"
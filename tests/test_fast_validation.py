@@ -0,0 +1,183 @@
+import json
+
+import pytest
+
+from availapi.core.fast_validation import fast_load_ranges
+from availapi.core.schemas import RangeSchema
+
+
+def make_range(from_datetime, to_datetime, cc="SG"):
+    return {"from": from_datetime, "to": to_datetime, "cc": cc}
+
+
+VALID_BODIES = [
+    [],
+    [make_range("2022-05-02T09:00:00.0+08:00", "2022-05-02T17:00:00.0+08:00")],
+    [make_range("2022-05-02T09:00:00Z", "2022-05-02T17:00:00.123Z")],
+    [
+        make_range(
+            "2022-05-02T09:00:00.123456-05:30",
+            "2022-05-03T17:00:00.5+00:00",
+            "US",
+        ),
+        make_range("2022-05-02T09:00:00-00:00", "2022-06-02T09:00:00+00:00"),
+    ],
+    [
+        {
+            **make_range("2022-05-02T09:00:00Z", "2022-05-02T17:00:00Z", "US"),
+            "subdivision": "US-CA",
+        }
+    ],
+]
+
+INVALID_BODIES = [
+    None,
+    {"from": "2022-05-02T09:00:00Z"},
+    ["foo"],
+    [make_range("", "2022-05-02T17:00:00.0+08:00")],
+    [make_range("2022-05-02T09:00:00.0", "2022-05-02T17:00:00.0")],
+    [
+        make_range(
+            "2022-05-02T09:00:00.0+08:00", "2022-05-02T17:00:00.0+08:00", 1
+        )
+    ],
+    [
+        make_range(
+            "2022-05-02T09:00:00.0+08:00", "2022-05-02T17:00:00.0+08:00", "ZZ"
+        )
+    ],
+    [make_range("2022-05-02T17:00:00.0+08:00", "2022-05-02T09:00:00.0+08:00")],
+    [make_range("2022-05-01T09:00:00.0+08:00", "2022-06-02T09:00:00.0+08:00")],
+    [make_range("2022-02-30T09:00:00.0+08:00", "2022-03-02T09:00:00.0+08:00")],
+    [make_range("2022-05-02T09:00:00.0+99:00", "2022-05-02T17:00:00.0+08:00")],
+    [make_range("2022-05-02T09:00:00.0+08:00", "2022-05-02T17:00:00.0-24:00")],
+    [{**make_range("2022-05-02T09:00Z", "2022-05-02T17:00Z"), "foo": 1}],
+    [
+        {
+            **make_range("2022-05-02T09:00:00Z", "2022-05-02T17:00:00Z"),
+            "subdivision": "US-CA",
+        }
+    ],
+    [
+        {
+            **make_range("2022-05-02T09:00:00Z", "2022-05-02T17:00:00Z", "US"),
+            "subdivision": "US-CA\n",
+        }
+    ],
+    [
+        {
+            **make_range("2022-05-02T09:00:00Z", "2022-05-02T17:00:00Z", "US"),
+            "subdivision": None,
+        }
+    ],
+]
+
+# Valid for marshmallow but outside the subset handled by the fast path.
+FALLBACK_BODIES = [
+    [make_range("2022-05-02 09:00:00+08", "2022-05-02T17:00+0800")],
+    [make_range("2022-5-2T09:00:00Z", "2022-05-02T17:00:00.1234567Z")],
+]
+
+
+@pytest.mark.parametrize("body", VALID_BODIES)
+def test_sc1_same_data_as_marshmallow(body):
+    """
+    Scenario 1: Same data as marshmallow
+    Given a valid body, the fast path must load the same ranges that the
+    schema does, timezones included.
+    """
+    # Act
+    fast_data = fast_load_ranges(body)
+    schema_data = RangeSchema(many=True).load(body)
+
+    # Assert
+    assert fast_data == schema_data, "The ranges loaded did not match."
+    for fast_range, schema_range in zip(fast_data, schema_data):
+        for key in ("from_datetime", "to_datetime"):
+            assert (
+                fast_range[key].tzinfo == schema_range[key].tzinfo
+            ), "The timezones did not match."
+            assert fast_range[key].tzname() == schema_range[key].tzname()
+
+
+@pytest.mark.parametrize("body", INVALID_BODIES + FALLBACK_BODIES)
+def test_sc2_fallback(body):
+    """
+    Scenario 2: Fallback
+    Given a body that is not valid or not in the subset handled, the fast
+    path must leave it to the schema.
+    """
+    # Act & Assert
+    assert fast_load_ranges(body) is None, "The body must not be loaded."
+
+
+@pytest.mark.parametrize(
+    "body", VALID_BODIES + INVALID_BODIES + FALLBACK_BODIES
+)
+def test_sc3_same_response(app_fixture, monkeypatch, body):
+    """
+    Scenario 3: Same response
+    Given any body, `/availability-check` must respond the same with and
+    without the fast path.
+    """
+    # Arrange
+    client = app_fixture.test_client()
+
+    # Act
+    responses = []
+    for fast_validation in (True, False):
+        monkeypatch.setitem(
+            app_fixture.config, "FAST_VALIDATION", fast_validation
+        )
+        response = client.post("/availability-check", json=body)
+        responses.append((response.status_code, response.json))
+
+    # Assert
+    assert responses[0] == responses[1], "The responses did not match."
+
+
+@pytest.mark.parametrize(
+    "path", ["/availability-check", "/availability-check/batch", "stream"]
+)
+def test_sc4_null_subdivision(app_fixture, monkeypatch, path):
+    """
+    Scenario 4: Null subdivision
+    Given a range with a null `subdivision`, the single, batch and stream
+    endpoints must answer the error of the schema with and without the
+    fast path.
+    """
+    # Arrange
+    client = app_fixture.test_client()
+    query = [
+        {
+            **make_range("2022-05-02T09:00:00Z", "2022-05-02T17:00:00Z", "US"),
+            "subdivision": None,
+        }
+    ]
+    error = {"json": {"0": {"subdivision": ["Field may not be null."]}}}
+
+    # Act
+    responses = []
+    for fast_validation in (True, False):
+        monkeypatch.setitem(
+            app_fixture.config, "FAST_VALIDATION", fast_validation
+        )
+        if path == "stream":
+            response = client.post(
+                "/availability-check/stream",
+                data=json.dumps(query),
+                content_type="application/x-ndjson",
+            )
+            responses.append(json.loads(response.data))
+        elif path.endswith("batch"):
+            responses.append(client.post(path, json=[query]).json[0])
+        else:
+            response = client.post(path, json=query)
+            responses.append(
+                {"status": response.status_code, "body": response.json}
+            )
+
+    # Assert
+    assert responses[0] == responses[1], "The responses did not match."
+    assert responses[0]["status"] == 422
+    assert responses[0]["body"]["errors"] == error
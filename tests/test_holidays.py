@@ -0,0 +1,371 @@
+import json
+import threading
+import time
+from datetime import date
+
+import pytest
+from werkzeug.exceptions import HTTPException
+
+from availapi.core.http import CircuitBreaker, HttpClient
+from availapi.testing import BrokenRedis, StubCalendarific
+from availapi.utils.holiday_providers import (
+    CalendarificProvider,
+    ChainProvider,
+    HolidaysCalendar,
+    MemoryProvider,
+    RedisProvider,
+    StaticProvider,
+    build_holidays_calendar,
+    build_holidays_provider,
+    decode_cached_calendar,
+    encode_cached_calendar,
+    holidays_version,
+    subdivision_calendar,
+)
+from availapi.utils.holidays import is_holiday, resolve_holidays
+
+
+def test_memory_provider_resolves_once():
+    """
+    Given several lookups for the same country and year, the upstream must
+    be asked only once and then served from the in-process copy.
+    """
+    # Arrange
+    upstream = StubCalendarific()
+    provider = MemoryProvider(upstream)
+
+    # Act
+    calendars = [provider.get_calendars({("US", 2022)}) for _ in range(3)]
+
+    # Assert
+    assert upstream.requests == [("US", 2022)], "Must be requested once."
+    assert calendars[0] == {
+        ("US", 2022): frozenset([date(2022, 7, 4).toordinal()])
+    }, "Only the plain dates must be indexed."
+    assert provider.calendars.stats()["hits"] == 2
+
+
+def test_concurrent_cache_misses_fetch_once(fake_redis):
+    """
+    Given concurrent lookups of an expired key, calendarific must be
+    requested only once and the result stored in redis.
+    """
+    # Arrange
+    upstream = StubCalendarific(delay=0.05)
+    provider = RedisProvider(fake_redis, upstream)
+    threads = [
+        threading.Thread(target=provider.get_calendar, args=("US", 2022))
+        for _ in range(5)
+    ]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert upstream.requests == [("US", 2022)], "Must be requested once."
+    assert fake_redis.get("US-2022") is not None, "The key must be cached."
+
+
+def test_stale_holidays_are_served_and_refreshed(fake_redis):
+    """
+    Given holidays cached past the soft TTL, the stale holidays must be
+    returned right away while they are refreshed in background.
+    """
+    # Arrange
+    fake_redis.set(
+        "US-2022",
+        json.dumps(
+            {"fetched_at": 0, "holidays": [{"date": {"iso": "2022-12-24"}}]}
+        ),
+    )
+    provider = RedisProvider(fake_redis, StubCalendarific())
+
+    # Act
+    stale = provider.get_calendar("US", 2022)
+    deadline = time.monotonic() + 1
+    while provider._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Assert
+    assert stale == {date(2022, 12, 24).toordinal()}, "Stale must be served."
+    assert provider.get_calendar("US", 2022) == {
+        date(2022, 7, 4).toordinal()
+    }, "The holidays must be refreshed."
+
+
+def test_redis_provider_resolves_in_one_round_trip(monkeypatch, fake_redis):
+    """
+    Given several countries, the cached calendars must be read with a single
+    MGET and only the missing ones requested to calendarific.
+    """
+    # Arrange
+    fake_redis.set(
+        "US-2022",
+        json.dumps(
+            {
+                "fetched_at": time.time(),
+                "holidays": [{"date": {"iso": "2022-07-04"}}],
+            }
+        ),
+    )
+    mget_calls = []
+    mget = fake_redis.mget
+    monkeypatch.setattr(
+        fake_redis, "mget", lambda keys: mget_calls.append(keys) or mget(keys)
+    )
+    upstream = StubCalendarific()
+    provider = RedisProvider(fake_redis, upstream)
+
+    # Act
+    calendars = provider.get_calendars({("US", 2022), ("MX", 2022)})
+
+    # Assert
+    assert set(calendars) == {("US", 2022), ("MX", 2022)}
+    assert len(mget_calls) == 1, "Redis must be read in one round trip."
+    assert upstream.requests == [("MX", 2022)]
+
+
+def test_calendar_indexes_subdivisions():
+    """
+    Given holidays observed only in some states, they must be indexed apart
+    so they only apply to those subdivisions.
+    """
+    # Arrange
+    holidays = [
+        {"date": {"iso": "2022-07-04"}, "states": "All"},
+        {
+            "date": {"iso": "2022-03-31"},
+            "states": [{"abbrev": "CA", "iso": "us-ca"}],
+        },
+    ]
+
+    # Act
+    calendar = build_holidays_calendar(holidays)
+
+    # Assert
+    national = {date(2022, 7, 4).toordinal()}
+    assert calendar == national, "Only national holidays for the country."
+    assert subdivision_calendar(calendar, "US-CA") == national | {
+        date(2022, 3, 31).toordinal()
+    }, "The subdivision must include the national holidays."
+    assert subdivision_calendar(calendar, "US-NY") is calendar
+    assert subdivision_calendar(frozenset(national), "US-CA") == national
+
+
+def test_compact_cached_calendar():
+    """
+    Given a holidays calendar, it must be cached as a few bytes and read
+    back with the time it was fetched.
+    """
+    # Arrange
+    national = frozenset(
+        date(2022, month, 1).toordinal() for month in range(1, 13)
+    )
+    calendar = HolidaysCalendar(
+        national, {"US-CA": national | {date(2022, 3, 31).toordinal()}}
+    )
+
+    # Act
+    value = encode_cached_calendar(2022, calendar, fetched_at=42.5)
+    decoded, fetched_at = decode_cached_calendar(value, 2022)
+
+    # Assert
+    assert len(value) == 9 + 2 + 2 * 12 + 6 + 2 + 2, "Must be compact."
+    assert (decoded, fetched_at) == (calendar, 42.5)
+    assert decoded.subdivisions == calendar.subdivisions
+    assert decode_cached_calendar(b"\xff" + value[1:], 2022)[0] is None
+
+
+def test_cached_calendar_without_subdivisions_is_refreshed():
+    """
+    Given a calendar cached in the first compact format, without
+    subdivisions, it must be read and considered stale.
+    """
+    # Arrange
+    value = b"\x01" + bytes(8) + bytes([184, 0])
+
+    # Act
+    calendar, fetched_at = decode_cached_calendar(value, 2022)
+
+    # Assert
+    assert calendar == {date(2022, 7, 4).toordinal()}
+    assert fetched_at == 0, "Must be refreshed."
+
+
+def test_legacy_cached_holidays_are_migrated(fake_redis):
+    """
+    Given holidays cached in the legacy JSON format, the calendar must be
+    served and rewritten in the compact format keeping its expiration.
+    """
+    # Arrange
+    fake_redis.set(
+        "US-2022",
+        json.dumps(
+            {
+                "fetched_at": time.time(),
+                "holidays": [{"date": {"iso": "2022-12-24"}}],
+            }
+        ),
+        ex=60,
+    )
+    ttl = fake_redis.pttl("US-2022")
+    upstream = StubCalendarific()
+    provider = RedisProvider(fake_redis, upstream)
+
+    # Act
+    calendars = provider.get_calendars({("US", 2022)})
+
+    # Assert
+    expected = frozenset([date(2022, 12, 24).toordinal()])
+    value = fake_redis.get("US-2022")
+    assert calendars == {("US", 2022): expected}
+    assert decode_cached_calendar(value, 2022)[0] == expected
+    assert not value.startswith(b"{"), "Must be migrated to the new format."
+    assert 0 < fake_redis.pttl("US-2022") <= ttl, "The TTL must be kept."
+    assert upstream.requests == [], "Must not be requested again."
+
+
+def test_unknown_cached_format_is_requested(fake_redis):
+    """
+    Given a calendar cached in a format unknown to this version, the
+    holidays must be requested to calendarific.
+    """
+    # Arrange
+    fake_redis.set("US-2022", b"\xff" + bytes(8))
+    upstream = StubCalendarific()
+    provider = RedisProvider(fake_redis, upstream)
+
+    # Act
+    calendars = provider.get_calendars({("US", 2022)})
+
+    # Assert
+    assert calendars == {("US", 2022): {date(2022, 7, 4).toordinal()}}
+    assert upstream.requests == [("US", 2022)]
+
+
+def test_chain_provider_asks_only_for_missing_keys():
+    """
+    Given a chain, every provider must be asked only for the keys not
+    resolved by the previous ones.
+    """
+    # Arrange
+    upstream = StubCalendarific()
+    provider = ChainProvider(
+        [StaticProvider({("US", 2022): []}, default=None), upstream]
+    )
+
+    # Act
+    calendars = provider.get_calendars({("US", 2022), ("MX", 2022)})
+
+    # Assert
+    assert calendars[("US", 2022)] == frozenset()
+    assert upstream.requests == [("MX", 2022)]
+
+
+def test_build_holidays_provider(app_fixture):
+    """
+    Given the provider layers on the config, the providers must be nested.
+    """
+    # Arrange
+    config = {
+        **app_fixture.config,
+        "HOLIDAYS_PROVIDERS": "memory, calendarific",
+    }
+
+    # Act
+    provider = build_holidays_provider(config)
+
+    # Assert
+    assert isinstance(provider, MemoryProvider)
+    assert isinstance(provider.upstream, CalendarificProvider)
+    with pytest.raises(ValueError):
+        build_holidays_provider({**config, "HOLIDAYS_PROVIDERS": "memory"})
+
+
+def test_resolve_holidays(app_fixture):
+    """
+    Given dates of several countries, the holidays must be resolved with the
+    provider of the app.
+    """
+    # Act
+    with app_fixture.app_context():
+        holidays = resolve_holidays(
+            {(date(2022, 12, 23), "US"), (date(2022, 12, 23), "MX")}
+        )
+        us_holiday = is_holiday(date(2022, 12, 23), "US")
+
+    # Assert
+    assert holidays == {(date(2022, 12, 23), "US")}
+    assert us_holiday, "The date must be holiday in US."
+
+
+def test_redis_provider_degrades_without_redis():
+    """
+    Given redis not being available, the holidays must be requested to the
+    upstream and redis skipped during the retry interval.
+    """
+    # Arrange
+    client = BrokenRedis()
+    upstream = StubCalendarific()
+    provider = RedisProvider(client, upstream, retry_interval=60)
+
+    # Act
+    calendars = provider.get_calendars({("US", 2022)})
+    calendar = provider.get_calendar("MX", 2022)
+
+    # Assert
+    assert date(2022, 7, 4).toordinal() in calendars[("US", 2022)]
+    assert calendar == {date(2022, 7, 4).toordinal()}
+    assert client.commands == 1, "Redis must be skipped after the error."
+    assert upstream.requests == [("US", 2022), ("MX", 2022)]
+
+
+def test_open_circuit_is_logged_without_traceback(caplog):
+    """
+    Given the circuit of calendarific open, a rejected call must be logged
+    as a single warning line.
+    """
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    provider = CalendarificProvider(
+        "test", HttpClient(circuit_breaker=breaker)
+    )
+
+    # Act
+    with pytest.raises(HTTPException):
+        provider.request_holidays("US", 2022)
+
+    # Assert
+    assert [(r.levelname, r.exc_info) for r in caplog.records] == [
+        ("WARNING", None)
+    ]
+
+
+def test_fetch_changes_only_the_version_of_its_holidays():
+    """
+    Given the holidays of a country and year fetched from calendarific,
+    only the version of those holidays must change.
+    """
+
+    # Arrange
+    class Response:
+        status_code = 200
+        text = json.dumps({"response": {"holidays": []}})
+
+    class Client:
+        def get(self, url, params=None):
+            return Response()
+
+    provider = CalendarificProvider("test", Client())
+    versions = [holidays_version("FR", 2022), holidays_version("FR", 2023)]
+
+    # Act
+    provider.request_holidays("FR", 2022)
+
+    # Assert
+    assert holidays_version("FR", 2022) == versions[0] + 1
+    assert holidays_version("FR", 2023) == versions[1], "Must not change."
@@ -0,0 +1,93 @@
+from datetime import date
+
+from availapi.utils.holiday_providers import (
+    CalendarificProvider,
+    DatasetProvider,
+    HolidaysCalendar,
+    subdivision_calendar,
+)
+from availapi.utils.holidays_dataset import HolidaysDataset, write_dataset
+
+
+def test_dataset_roundtrip(tmp_path):
+    """
+    Given calendars written into a dataset, the same holidays must be read,
+    those of the subdivisions included.
+    """
+    # Arrange
+    path = str(tmp_path / "holidays.bin")
+    national = {date(2022, 1, 1).toordinal(), date(2022, 12, 31).toordinal()}
+    write_dataset(
+        path,
+        {
+            ("US", 2022): HolidaysCalendar(
+                national,
+                {"US-CA": national | {date(2022, 3, 31).toordinal()}},
+            ),
+            ("US", 2024): {date(2024, 12, 31).toordinal()},
+            ("MX", 2022): set(),
+        },
+    )
+
+    # Act
+    dataset = HolidaysDataset(path)
+    us_ca = subdivision_calendar(dataset.get("US", 2022), "US-CA")
+
+    # Assert
+    assert len(dataset) == 3, "All the calendars must be stored."
+    assert date(2022, 1, 1).toordinal() in dataset.get("US", 2022)
+    assert date(2022, 12, 31).toordinal() in dataset.get("US", 2022)
+    assert date(2022, 1, 2).toordinal() not in dataset.get("US", 2022)
+    assert date(2022, 3, 31).toordinal() not in dataset.get("US", 2022)
+    assert date(2022, 3, 31).toordinal() in us_ca, "Must be in US-CA."
+    assert date(2022, 1, 1).toordinal() in us_ca, "Must include national."
+    assert subdivision_calendar(dataset.get("US", 2022), "US-NY") is (
+        dataset.get("US", 2022)
+    ), "Must be the national calendar."
+    assert date(2024, 12, 31).toordinal() in dataset.get("US", 2024)
+    assert date(2022, 1, 1).toordinal() not in dataset.get("MX", 2022)
+    assert dataset.get("US", 2023) is None, "2023 must not be covered."
+
+
+def test_snapshot_command(monkeypatch, tmp_path, app_fixture):
+    """
+    Given the snapshot command, a dataset with the holidays of every
+    supported country must be written and then used to resolve them.
+    """
+    # Arrange
+    path = str(tmp_path / "holidays.bin")
+    monkeypatch.setattr(
+        CalendarificProvider,
+        "request_holidays",
+        lambda self, country, year: [
+            {"date": {"iso": f"{year}-07-04"}, "states": "All"},
+            {
+                "date": {"iso": f"{year}-03-31"},
+                "states": [{"iso": f"{country.lower()}-aa"}],
+            },
+        ],
+    )
+
+    # Act
+    result = app_fixture.test_cli_runner().invoke(
+        args=[
+            "holidays",
+            "snapshot",
+            "--from-year=2022",
+            "--to-year=2022",
+            f"--output={path}",
+        ]
+    )
+    calendars = DatasetProvider(path).get_calendars(
+        {("MX", 2022), ("MX", 2023)}
+    )
+
+    # Assert
+    assert result.exit_code == 0, result.output
+    assert list(calendars) == [("MX", 2022)], "Only 2022 must be covered."
+    assert date(2022, 7, 4).toordinal() in calendars[("MX", 2022)]
+    assert date(2022, 7, 5).toordinal() not in calendars[("MX", 2022)]
+    assert date(2022, 3, 31).toordinal() not in calendars[("MX", 2022)]
+    assert date(2022, 3, 31).toordinal() in subdivision_calendar(
+        calendars[("MX", 2022)], "MX-AA"
+    ), "The holidays of the subdivisions must be included."
@@ -0,0 +1,166 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from availapi.core.http import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HttpClient,
+    RateLimiter,
+)
+
+
+@pytest.fixture()
+def stub_server():
+    """Local HTTP server answering with the statuses queued in `responses`
+    (200 once the queue is empty)."""
+    responses = []
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            received.append(self.path)
+            status = responses.pop(0) if responses else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}/"
+    server.responses = responses
+    server.received = received
+    yield server
+    server.shutdown()
+
+
+def test_errors_are_retried(stub_server):
+    """
+    Given an upstream failing twice, the request must be retried until it
+    succeeds.
+    """
+    # Arrange
+    stub_server.responses.extend([500, 429])
+    client = HttpClient(retries=2, backoff=0.001)
+
+    # Act
+    response = client.get(stub_server.url)
+
+    # Assert
+    assert response.status_code == 200, "The last attempt must succeed."
+    assert len(stub_server.received) == 3, "Two retries must be sent."
+    assert client.stats()["retries"] == 2
+    assert client.stats()["circuit"]["state"] == CircuitBreaker.CLOSED
+
+
+def test_circuit_opens_and_fails_fast(stub_server):
+    """
+    Given an upstream that keeps failing, the circuit must open and the next
+    requests must be rejected without reaching it.
+    """
+    # Arrange
+    stub_server.responses.extend([500] * 4)
+    client = HttpClient(
+        retries=1,
+        backoff=0.001,
+        circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+    )
+
+    # Act
+    responses = [client.get(stub_server.url) for _ in range(2)]
+    with pytest.raises(CircuitOpenError):
+        client.get(stub_server.url)
+
+    # Assert
+    assert [r.status_code for r in responses] == [500, 500]
+    assert len(stub_server.received) == 4, "The upstream must not be hit."
+    assert client.stats()["circuit"] == {
+        "state": CircuitBreaker.OPEN,
+        "successes": 0,
+        "failures": 2,
+        "rejections": 1,
+        "opened": 1,
+    }, "The circuit stats did not match."
+
+
+def test_half_open_circuit_closes_on_success(stub_server):
+    """
+    Given an open circuit past its reset timeout, a successful trial request
+    must close it.
+    """
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    client = HttpClient(retries=0, circuit_breaker=breaker)
+    breaker.record_failure()
+
+    # Act
+    response = client.get(stub_server.url)
+
+    # Assert
+    assert response.status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_circuit_survives_unexpected_errors(
+    monkeypatch, stub_server
+):
+    """
+    Given a trial request failing with an unexpected error, the circuit must
+    open again and let a later trial through.
+    """
+    # Arrange
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    client = HttpClient(retries=0, circuit_breaker=breaker)
+    breaker.record_failure()
+
+    def broken_get(*args, **kwargs):
+        raise ValueError("Unexpected.")
+
+    # Act
+    with monkeypatch.context() as m:
+        m.setattr(client.session, "get", broken_get)
+        with pytest.raises(ValueError):
+            client.get(stub_server.url)
+    response = client.get(stub_server.url)
+
+    # Assert
+    assert response.status_code == 200, "The next trial must be sent."
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.counters["failures"] == 2
+
+
+def test_connection_errors_are_raised():
+    """
+    Given an unreachable upstream, the error must be raised after retrying.
+    """
+    # Arrange
+    client = HttpClient(retries=1, backoff=0.001, connect_timeout=0.5)
+
+    # Act / Assert
+    with pytest.raises(requests.ConnectionError):
+        client.get("http://127.0.0.1:9/")
+    assert client.stats()["requests"] == 2
+
+
+def test_rate_limiter_spaces_calls():
+    """
+    Given a rate, the calls must be spaced to not exceed it.
+    """
+    # Arrange
+    rate_limiter = RateLimiter(rate=50)
+    started_at = time.monotonic()
+
+    # Act
+    for _ in range(5):
+        rate_limiter.acquire()
+
+    # Assert
+    assert time.monotonic() - started_at >= 0.08, "The calls must wait."
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytz
+
+from availapi.utils import intersection
+from availapi.utils.intersection import (
+    Ranges,
+    common_window,
+    common_windows,
+    free_windows,
+    from_epoch_us,
+    to_epoch_us,
+)
+
+
+def _ranges(*hours):
+    ranges = Ranges()
+    for offset, from_hour, to_hour in hours:
+        tz = timezone(timedelta(hours=offset))
+        ranges.append(
+            datetime(2022, 5, 2, from_hour, tzinfo=tz),
+            datetime(2022, 5, 2, to_hour, tzinfo=tz),
+        )
+    return ranges
+
+
+def test_epoch_us_roundtrip():
+    """
+    Given an aware datetime, it must be converted back as the same UTC time.
+    """
+    # Arrange
+    dt = datetime(
+        2022, 5, 2, 9, 0, 0, 123456, tzinfo=timezone(timedelta(hours=8))
+    )
+
+    # Act
+    result = from_epoch_us(to_epoch_us(dt))
+
+    # Assert
+    assert result == dt, "The instant must be the same."
+    assert result.utcoffset() == timedelta(0), "It must be in UTC."
+    assert result.hour == 1 and result.microsecond == 123456
+
+
+@pytest.mark.parametrize(
+    "tz",
+    [
+        timezone.utc,
+        timezone(timedelta(hours=-5, minutes=-30)),
+        timezone(timedelta(hours=14)),
+        pytz.utc,
+        pytz.timezone("America/New_York"),
+    ],
+)
+def test_epoch_us_same_as_subtracting_the_epoch(tz):
+    """
+    Given aware datetimes of any timezone, the microseconds must be the ones
+    of subtracting the epoch.
+    """
+    # Arrange
+    dts = [
+        datetime(1969, 12, 31, 23, 59, 59, 999999),
+        datetime(2022, 3, 13, 7, 30, 0, 1),
+        datetime(2022, 12, 31, 23, 0),
+    ]
+    if hasattr(tz, "localize"):
+        dts = [tz.localize(dt) for dt in dts]
+    else:
+        dts = [dt.replace(tzinfo=tz) for dt in dts]
+
+    # Act & Assert
+    for dt in dts * 2:
+        assert to_epoch_us(dt) == (dt - intersection.EPOCH) // timedelta(
+            microseconds=1
+        ), f"{dt} was not converted right."
+
+
+def test_common_window():
+    """
+    Given ranges on different offsets, the shared window must be returned.
+    """
+    # Act
+    window = common_window(_ranges((8, 9, 17), (1, 9, 17), (5, 9, 17)))
+
+    # Assert
+    assert [from_epoch_us(us).hour for us in window] == [8, 9]
+
+
+def test_common_window_without_intersection():
+    """
+    Given ranges that do not intersect, no window must be returned.
+    """
+    # Act / Assert
+    assert common_window(_ranges((-6, 9, 17), (5, 9, 17))) is None
+    assert common_window(Ranges()) is None
+
+
+@pytest.mark.parametrize("use_numpy", [True, False], ids=["numpy", "array"])
+def test_common_window_with_many_ranges(monkeypatch, use_numpy):
+    """
+    Given more ranges than the NumPy threshold, the same window must be
+    returned with NumPy and with the `array` fallback.
+    """
+    # Arrange
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(intersection, "np", None)
+    monkeypatch.setattr(intersection, "NUMPY_MIN_SIZE", 2)
+    ranges = _ranges(*[(0, 9 + i % 3, 17 - i % 4) for i in range(100)])
+
+    # Act
+    window = common_window(ranges)
+
+    # Assert
+    assert [from_epoch_us(us).hour for us in window] == [11, 14]
+
+
+def test_free_windows_counts_each_participant_once():
+    """
+    Given a participant with overlapping ranges, it must be counted once.
+    """
+    # Arrange
+    participants = [
+        _ranges((0, 9, 12), (0, 10, 13)),
+        _ranges((0, 11, 15)),
+    ]
+
+    # Act
+    windows = free_windows(participants, 1)
+
+    # Assert
+    assert [
+        [from_epoch_us(w[0]).hour, from_epoch_us(w[1]).hour, w[2]]
+        for w in windows
+    ] == [[9, 11, 1], [11, 13, 2], [13, 15, 1]]
+
+
+def test_common_windows_keep_the_bounds_of_the_ranges():
+    # Arrange
+    first, second = Ranges(), Ranges()
+    for ranges, bounds in (
+        (first, ((0, 10), (10, 20), (25, 30))),
+        (second, ((5, 28),)),
+    ):
+        for start, end in bounds:
+            ranges.starts.append(start)
+            ranges.ends.append(end)
+
+    # Act
+    windows = common_windows([first, second])
+
+    # Assert
+    assert windows == [(5, 10), (10, 20), (25, 28)], "Must not be joined."
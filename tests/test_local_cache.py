@@ -0,0 +1,61 @@
+import time
+
+from availapi.core.local_cache import LocalCache
+
+
+def test_get_counts_hits_and_misses():
+    """
+    Given a cache with one entry, the hits and misses must be counted.
+    """
+    # Arrange
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("US", 1)
+
+    # Act
+    hit = cache.get("US")
+    miss = cache.get("MX")
+
+    # Assert
+    assert hit == 1, "The cached value must be returned."
+    assert miss is None, "A missing key must return the default."
+    assert cache.stats() == {
+        "size": 1,
+        "max_size": 2,
+        "hits": 1,
+        "misses": 1,
+    }, "The stats did not match."
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Given a full cache, the least recently used entry must be evicted.
+    """
+    # Arrange
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("US", 1)
+    cache.set("MX", 2)
+    cache.get("US")
+
+    # Act
+    cache.set("SG", 3)
+
+    # Assert
+    assert cache.get("MX") is None, "The LRU entry must be evicted."
+    assert cache.get("US") == 1, "The recently used entry must be kept."
+    assert cache.get("SG") == 3, "The new entry must be stored."
+
+
+def test_expired_entries_are_not_returned():
+    """
+    Given an entry older than its TTL, it must be treated as a miss.
+    """
+    # Arrange
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("US", 1, ttl=0.01)
+
+    # Act
+    time.sleep(0.02)
+
+    # Assert
+    assert cache.get("US") is None, "The expired entry must be missing."
+    assert len(cache) == 0, "The expired entry must be removed."
@@ -0,0 +1,140 @@
+import pytest
+
+from availapi.core import metrics
+from availapi.core.http import CircuitBreaker, HttpClient
+from availapi.utils.holiday_providers import RedisProvider
+
+QUERY = [
+    {
+        "from": "2022-05-02T09:00:00.0+08:00",
+        "to": "2022-05-02T17:00:00.0+08:00",
+        "cc": "SG",
+    }
+]
+
+
+@pytest.fixture()
+def enabled_metrics():
+    metrics.enable()
+    yield metrics.registry
+    metrics.disable()
+
+
+def test_sc1_disabled(client):
+    """
+    Scenario 1: Disabled
+    Given the metrics disabled, `/metrics` must not be found and the timed
+    functions must work as usual.
+    """
+    # Arrange
+    timed_sum = metrics.timed("test")(lambda a, b: a + b)
+
+    # Act
+    response = client.get("/metrics")
+
+    # Assert
+    assert response.status_code == 404, "The status must be 404."
+    assert timed_sum(1, 2) == 3
+    with metrics.timer("test"):
+        pass
+
+
+def test_sc2_requests_and_stages(client, enabled_metrics):
+    """
+    Scenario 2: Requests and stages
+    Given a request served, its count and the latency of its stages must be
+    exposed.
+    """
+    # Act
+    client.post("/availability-check", json=QUERY)
+    response = client.get("/metrics")
+
+    # Assert
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200, "The status must be 200."
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert (
+        'availapi_requests_total{endpoint="/availability-check",'
+        'method="POST",status="200"} 1' in body
+    )
+    for stage in ("parse", "holidays", "intersection", "serialize"):
+        assert (
+            f'availapi_stage_duration_seconds_count{{stage="{stage}"}} 1'
+            in body
+        ), f"The {stage} stage must be timed."
+    assert 'availapi_cache_misses_total{cache="business_days"}' in body
+    assert "# TYPE availapi_stage_duration_seconds histogram" in body
+
+
+def test_sc3_histogram_format(enabled_metrics):
+    """
+    Scenario 3: Histogram format
+    Given some observations, the buckets must be cumulative and include the
+    sum and count.
+    """
+    # Arrange
+    for value in (0.0002, 0.003, 20):
+        enabled_metrics.observe("availapi_request_duration_seconds", value)
+
+    # Act
+    body = enabled_metrics.render()
+
+    # Assert
+    assert 'availapi_request_duration_seconds_bucket{le="0.0001"} 0' in body
+    assert 'availapi_request_duration_seconds_bucket{le="0.00025"} 1' in body
+    assert 'availapi_request_duration_seconds_bucket{le="0.005"} 2' in body
+    assert 'availapi_request_duration_seconds_bucket{le="+Inf"} 3' in body
+    assert "availapi_request_duration_seconds_count 3" in body
+
+
+def test_sc4_upstream_circuit(enabled_metrics):
+    """
+    Scenario 4: Upstream circuit
+    Given the circuit of an upstream open, its state and errors must be
+    exposed.
+    """
+    # Arrange
+    circuit_breaker = CircuitBreaker(failure_threshold=1)
+    http_client = HttpClient(
+        circuit_breaker=circuit_breaker, name="test-upstream"
+    )
+    http_client.counters["errors"] += 1
+    circuit_breaker.record_failure()
+
+    # Act
+    body = enabled_metrics.render()
+
+    # Assert
+    assert 'availapi_upstream_errors_total{upstream="test-upstream"} 1' in body
+    assert (
+        'availapi_upstream_circuit_state{state="open",'
+        'upstream="test-upstream"} 1' in body
+    )
+    assert (
+        'availapi_upstream_circuit_state{state="closed",'
+        'upstream="test-upstream"} 0' in body
+    )
+
+
+def test_sc5_redis_hits_and_misses(fake_redis, enabled_metrics):
+    """
+    Scenario 5: Redis hits and misses
+    Given calendars found and missing in redis, they must be counted.
+    """
+
+    # Arrange
+    class Upstream:
+        def request_holidays(self, country, year):
+            return []
+
+    provider = RedisProvider(fake_redis, Upstream())
+    provider.get_calendars({("US", 2022)})
+
+    # Act
+    provider.get_calendars({("US", 2022), ("MX", 2022)})
+    body = enabled_metrics.render()
+
+    # Assert
+    assert 'availapi_cache_hits_total{cache="redis"} 1' in body
+    assert 'availapi_cache_misses_total{cache="redis"} 2' in body
+    assert 'availapi_stage_duration_seconds_count{stage="redis"} 2' in body
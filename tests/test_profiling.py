@@ -0,0 +1,164 @@
+import os
+import pstats
+import re
+import time
+
+import pytest
+from flask import Flask
+
+from availapi.config import Config
+from availapi.core.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    configure_profiling,
+)
+
+
+@pytest.fixture()
+def profiled_app(tmp_path):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(
+        PROFILING_ENABLED=True,
+        PROFILING_SAMPLE_RATE=1,
+        PROFILING_DIR=str(tmp_path),
+        PROFILING_MAX_FILES=3,
+    )
+
+    @app.route("/work")
+    def work():
+        return "done"
+
+    configure_profiling(app)
+    return app
+
+
+def test_sc1_sampled_request(profiled_app, tmp_path):
+    """
+    Scenario 1: Sampled request
+    Given a request sampled, its profile must be saved readable by pstats.
+    """
+    # Act
+    response = profiled_app.test_client().get("/work", buffered=True)
+
+    # Assert
+    names = os.listdir(tmp_path)
+    assert response.data == b"done", "The response must not change."
+    assert len(names) == 1, "A profile must be saved."
+    assert re.fullmatch(r"\d+-GET_work-\d+ms\.prof", names[0])
+    stats = pstats.Stats(str(tmp_path / names[0]))
+    assert any(func[2] == "work" for func in stats.stats), "Must profile it."
+
+
+def test_sc2_list_and_download(profiled_app):
+    """
+    Scenario 2: List and download
+    Given profiles saved, they must be listed, the newest first, and
+    downloaded by name, without profiling these requests.
+    """
+    # Arrange
+    client = profiled_app.test_client()
+    client.get("/work", buffered=True)
+    client.get("/work", buffered=True)
+
+    # Act
+    names = client.get("/debug/profiles").json
+    download = client.get(f"/debug/profiles/{names[0]}")
+    missing = client.get("/debug/profiles/..%2Fconftest.py")
+
+    # Assert
+    assert len(names) == 2, "Only the profiles of /work must be listed."
+    assert names == sorted(names, reverse=True), "The newest must be first."
+    assert download.status_code == 200, "The status must be 200."
+    assert download.headers["Content-Disposition"].startswith("attachment")
+    assert missing.status_code == 404, "The status must be 404."
+
+
+def test_sc3_bounded(profiled_app, tmp_path):
+    """
+    Scenario 3: Bounded
+    Given more requests sampled than the profiles kept, only the newest
+    ones must be kept.
+    """
+    # Arrange
+    client = profiled_app.test_client()
+
+    # Act
+    for _ in range(5):
+        client.get("/work", buffered=True)
+
+    # Assert
+    assert len(os.listdir(tmp_path)) == 3, "Only 3 profiles must be kept."
+
+
+def test_sc4_slow_request(tmp_path):
+    """
+    Scenario 4: Slow request
+    Given a request exceeding the threshold, its stacks must be sampled in
+    the folded format while a fast one must not be saved.
+    """
+    # Arrange
+    def app(environ, start_response):
+        if environ["PATH_INFO"] == "/slow":
+            time.sleep(0.2)
+        start_response("200 OK", [])
+        return [b"done"]
+
+    middleware = ProfilingMiddleware(
+        app,
+        ProfileStore(str(tmp_path)),
+        sample_rate=0,
+        slow_threshold=0.05,
+        sample_interval=0.01,
+    )
+
+    # Act
+    for path in ("/fast", "/slow"):
+        middleware(
+            {"REQUEST_METHOD": "GET", "PATH_INFO": path}, lambda *_: None
+        ).close()
+
+    # Assert
+    names = os.listdir(tmp_path)
+    assert len(names) == 1, "Only the slow request must be saved."
+    assert "-GET_slow-" in names[0] and names[0].endswith(".folded")
+    with open(tmp_path / names[0]) as f:
+        lines = f.read().splitlines()
+    assert lines, "Some stacks must be sampled."
+    assert all(
+        line.rsplit(" ", 1)[0].endswith("test_profiling.app") for line in lines
+    ), "The stacks must end in the app."
+
+
+def test_sc5_not_sampled(tmp_path):
+    """
+    Scenario 5: Not sampled
+    Given a request not sampled without threshold, the response of the app
+    must be returned as is.
+    """
+    # Arrange
+    body = [b"done"]
+    middleware = ProfilingMiddleware(
+        lambda environ, start_response: body,
+        ProfileStore(str(tmp_path)),
+        sample_rate=0,
+    )
+
+    # Act
+    response = middleware({"PATH_INFO": "/"}, lambda *_: None)
+
+    # Assert
+    assert response is body, "The response must not be wrapped."
+    assert os.listdir(tmp_path) == [], "Nothing must be saved."
+
+
+def test_sc6_disabled(client):
+    """
+    Scenario 6: Disabled
+    Given profiling disabled, the profiles must not be exposed.
+    """
+    # Act
+    response = client.get("/debug/profiles")
+
+    # Assert
+    assert response.status_code == 404, "The status must be 404."
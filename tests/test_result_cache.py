@@ -0,0 +1,182 @@
+import json
+
+import pytest
+
+from availapi import views
+from availapi.utils import holiday_providers
+
+ENDPOINT_URL = "/availability-check"
+
+QUERY = [
+    {
+        "from": "2022-05-02T09:00:00.0+08:00",
+        "to": "2022-05-02T17:00:00.0+08:00",
+        "cc": "SG",
+    },
+    {
+        "from": "2022-05-02T09:00:00.0+01:00",
+        "to": "2022-05-02T17:00:00.0+01:00",
+        "cc": "NG",
+    },
+]
+
+HOLIDAY_QUERY = [
+    {
+        "from": "2022-12-23T09:00:00.0-05:00",
+        "to": "2022-12-23T17:00:00.0-05:00",
+        "cc": "US",
+    }
+]
+
+
+@pytest.fixture()
+def cached_client(app_fixture, monkeypatch):
+    app_fixture.config["RESULT_CACHE_ENABLED"] = True
+    calls = []
+    check_availability = views.check_availability
+    monkeypatch.setattr(
+        views,
+        "check_availability",
+        lambda data: calls.append(data) or check_availability(data),
+    )
+    client = app_fixture.test_client()
+    client.calls = calls
+    return client
+
+
+def test_sc1_repeated_query(cached_client):
+    """
+    Scenario 1: Repeated query
+    Given the same query sent twice, the slots must be computed once and
+    the same response returned.
+    """
+    # Act
+    first = cached_client.post(ENDPOINT_URL, json=QUERY)
+    second = cached_client.post(ENDPOINT_URL, json=QUERY)
+
+    # Assert
+    assert second.status_code == first.status_code == 200
+    assert second.data == first.data, "The body must be the same."
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert len(cached_client.calls) == 1, "Must be computed once."
+
+
+def test_sc2_same_query_written_differently(cached_client):
+    """
+    Scenario 2: Same query written differently
+    Given two bodies with the same ranges written differently, the slots
+    must be computed once.
+    """
+    # Arrange
+    rewritten = [
+        {
+            "cc": "SG",
+            "to": "2022-05-02T17:00:00+08:00",
+            "from": "2022-05-02T09:00:00.000+08:00",
+        },
+        QUERY[1],
+    ]
+
+    # Act
+    first = cached_client.post(ENDPOINT_URL, json=QUERY)
+    second = cached_client.post(
+        ENDPOINT_URL,
+        data=json.dumps(rewritten, indent=2),
+        content_type="application/json",
+    )
+
+    # Assert
+    assert second.data == first.data, "The body must be the same."
+    assert len(cached_client.calls) == 1, "Must be computed once."
+
+
+def test_sc3_holiday_cached(cached_client):
+    """
+    Scenario 3: Holiday cached
+    Given a query on a holiday sent twice, the same error must be returned
+    and computed once.
+    """
+    # Act
+    first = cached_client.post(ENDPOINT_URL, json=HOLIDAY_QUERY)
+    second = cached_client.post(ENDPOINT_URL, json=HOLIDAY_QUERY)
+
+    # Assert
+    assert second.status_code == first.status_code == 400
+    assert second.json == {
+        "errors": "Unable to find an available slot. "
+        "The date 2022-12-23 is holiday in US."
+    }, "The output did not match."
+    assert len(cached_client.calls) == 1, "Must be computed once."
+
+
+def test_sc4_not_modified(cached_client):
+    """
+    Scenario 4: Not modified
+    Given a query sent with the ETag of its response, a 304 without body
+    must be returned.
+    """
+    # Arrange
+    etag = cached_client.post(ENDPOINT_URL, json=QUERY).headers["ETag"]
+
+    # Act
+    response = cached_client.post(
+        ENDPOINT_URL, json=QUERY, headers={"If-None-Match": etag}
+    )
+    other_response = cached_client.post(
+        ENDPOINT_URL, json=HOLIDAY_QUERY, headers={"If-None-Match": etag}
+    )
+
+    # Assert
+    assert response.status_code == 304, "The status must be 304."
+    assert response.data == b"", "There must not be a body."
+    assert response.headers["ETag"] == etag
+    assert other_response.status_code == 400, "A different body is sent."
+
+
+def test_sc5_holidays_fetched_again(cached_client):
+    """
+    Scenario 5: Holidays fetched again
+    Given the holidays of a country of a cached query fetched again, the
+    query must be computed again, but not the queries of other countries.
+    """
+    # Arrange
+    cached_client.post(ENDPOINT_URL, json=QUERY)
+    cached_client.post(ENDPOINT_URL, json=HOLIDAY_QUERY)
+
+    # Act
+    holiday_providers._bump_holidays_version("SG", 2022)
+    response = cached_client.post(ENDPOINT_URL, json=QUERY)
+    other_response = cached_client.post(ENDPOINT_URL, json=HOLIDAY_QUERY)
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert other_response.status_code == 400, "The status must be 400."
+    assert len(cached_client.calls) == 3, "Only SG must be computed again."
+    assert cached_client.calls[2] == cached_client.calls[0]
+
+
+def test_sc6_invalid_body_not_cached(cached_client):
+    """
+    Scenario 6: Invalid body not cached
+    Given an invalid body, the validation errors must be returned as usual.
+    """
+    # Act
+    response = cached_client.post(ENDPOINT_URL, json=[{"cc": "SG"}])
+
+    # Assert
+    assert response.status_code == 422, "The status must be 422."
+    assert "ETag" not in response.headers
+    assert cached_client.calls == []
+
+
+def test_sc7_disabled(client):
+    """
+    Scenario 7: Disabled
+    Given the result cache disabled, the responses must not carry an ETag.
+    """
+    # Act
+    response = client.post(ENDPOINT_URL, json=QUERY)
+
+    # Assert
+    assert response.status_code == 200, "The status must be 200."
+    assert "ETag" not in response.headers
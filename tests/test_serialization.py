@@ -0,0 +1,69 @@
+from datetime import date, datetime
+
+import pytest
+import pytz
+from flask.json.provider import DefaultJSONProvider
+
+from availapi.core.json_provider import OrjsonProvider
+from availapi.core.schemas import (
+    RankedSlotSchema,
+    SlotSchema,
+    dump_ranked_slots,
+    dump_slots,
+)
+
+SLOTS = [
+    {
+        "from_datetime": datetime(2022, 5, 2, 1, 0, tzinfo=pytz.utc),
+        "to_datetime": datetime(2022, 5, 2, 9, 0, 0, 99999, tzinfo=pytz.utc),
+        "participants": 3,
+    },
+    {
+        "from_datetime": datetime(2022, 12, 31, 23, 59, 59, 100000, pytz.utc),
+        "to_datetime": datetime(2023, 1, 1, 0, 0, 0, 999999, tzinfo=pytz.utc),
+        "participants": 1,
+    },
+]
+
+
+def test_sc1_slots_same_as_schema():
+    """
+    Scenario 1: Slots serialized like the schema
+    Given some slots, the direct serializers must return the same as the
+    slot schemas.
+    """
+    # Act & Assert
+    assert dump_slots(SLOTS) == SlotSchema().dump(SLOTS, many=True)
+    assert dump_ranked_slots(SLOTS) == RankedSlotSchema().dump(
+        SLOTS, many=True
+    ), "The ranked slots did not match."
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        dump_ranked_slots(SLOTS),
+        {"errors": {"json": {0: {"from": ["Not a valid datetime."]}}}},
+        {"errors": {"json": {"b": [1, 2], "a": None, "c": True}}},
+        {"errors": {"json": {"fóo": ["Unknown field."]}}},
+        {"date": date(2022, 5, 2)},
+    ],
+)
+def test_sc2_orjson_same_bytes(app_fixture, obj):
+    """
+    Scenario 2: Same bytes with orjson
+    Given any response, the orjson provider must write the same bytes as
+    the default provider.
+    """
+    # Arrange
+    pytest.importorskip("orjson")
+    orjson_provider = OrjsonProvider(app_fixture)
+    default_provider = DefaultJSONProvider(app_fixture)
+
+    # Act
+    with app_fixture.app_context():
+        orjson_body = orjson_provider.response(obj).get_data()
+        default_body = default_provider.response(obj).get_data()
+
+    # Assert
+    assert orjson_body == default_body, "The output did not match."
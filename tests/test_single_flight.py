@@ -0,0 +1,87 @@
+import threading
+import time
+from datetime import timedelta
+
+from availapi.core.single_flight import SingleFlight
+
+
+def _slow_loader(calls):
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    return loader
+
+
+def _run_concurrently(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_misses_load_once(fake_redis):
+    """
+    Given several threads missing the same key, the loader must run once.
+    """
+    # Arrange
+    calls, results = [], []
+    single_flight = SingleFlight(poll_interval=0.01)
+    loader = _slow_loader(calls)
+
+    def target():
+        results.append(
+            single_flight.load(fake_redis, "US-2022", loader, timedelta(1))
+        )
+
+    # Act
+    _run_concurrently([target] * 10)
+
+    # Assert
+    assert len(calls) == 1, "The loader must run only once."
+    assert results == ["value"] * 10, "All callers must get the value."
+    assert fake_redis.get("US-2022:lease") is None, "The lease must be freed."
+
+
+def test_workers_are_coalesced_by_the_redis_lease(fake_redis):
+    """
+    Given two workers (two instances) missing the same key, only the one
+    holding the lease must run the loader.
+    """
+    # Arrange
+    calls = []
+    loader = _slow_loader(calls)
+    workers = [SingleFlight(poll_interval=0.01) for _ in range(2)]
+
+    def target(worker):
+        return lambda: worker.load(fake_redis, "US-2022", loader, timedelta(1))
+
+    # Act
+    _run_concurrently([target(worker) for worker in workers])
+
+    # Assert
+    assert len(calls) == 1, "The loader must run only once."
+    assert fake_redis.get("US-2022") == b"value"
+
+
+def test_stuck_lease_falls_back_to_load(fake_redis):
+    """
+    Given a lease that is never released, the caller must load the value
+    after the wait timeout.
+    """
+    # Arrange
+    fake_redis.set("US-2022:lease", "someone-else", ex=60)
+    single_flight = SingleFlight(poll_interval=0.01, wait_timeout=0.05)
+
+    # Act
+    value = single_flight.load(
+        fake_redis, "US-2022", lambda: "value", timedelta(1)
+    )
+
+    # Assert
+    assert value == "value", "The value must be loaded."
+    assert (
+        fake_redis.get("US-2022:lease") == b"someone-else"
+    ), "A lease from another worker must not be released."
@@ -0,0 +1,90 @@
+from availapi.testing import StubCalendarific
+from availapi.utils.holiday_providers import HolidaysProvider, RedisProvider
+from availapi.utils.warmup import start_warmup
+
+
+class RecordingProvider(HolidaysProvider):
+    def __init__(self):
+        self.keys = []
+
+    def get_calendars(self, keys):
+        self.keys.extend(keys)
+        return {key: frozenset() for key in keys}
+
+
+def test_warmup_command_fills_redis(monkeypatch, app_fixture, fake_redis):
+    """
+    Given some countries, their holidays must be cached in redis under the
+    keys used by the requests and the timings reported.
+    """
+    # Arrange
+    provider = RedisProvider(fake_redis, StubCalendarific())
+    monkeypatch.setitem(app_fixture.extensions, "holidays_provider", provider)
+
+    # Act
+    result = app_fixture.test_cli_runner().invoke(
+        args=["holidays", "warmup", "--countries=us,SG", "--year=2022"]
+    )
+
+    # Assert
+    assert result.exit_code == 0, result.output
+    assert "Warmed up 2 of 2 holidays calendars" in result.output
+    assert "p50" in result.output, "The timings must be reported."
+    assert fake_redis.get("US-2022") is not None
+    assert fake_redis.get("SG-2022") is not None
+    assert fake_redis.get("SG-2023") is None, "Only 2022 must be warmed up."
+
+
+def test_warmup_command_reports_failures(monkeypatch, app_fixture, fake_redis):
+    """
+    Given a country whose holidays can not be requested, the failure must be
+    reported without stopping the rest.
+    """
+    # Arrange
+    provider = RedisProvider(fake_redis, StubCalendarific(failing={"SG"}))
+    monkeypatch.setitem(app_fixture.extensions, "holidays_provider", provider)
+
+    # Act
+    result = app_fixture.test_cli_runner(mix_stderr=False).invoke(
+        args=["holidays", "warmup", "--countries=US,SG", "--year=2022"]
+    )
+
+    # Assert
+    assert result.exit_code == 1, "The command must fail."
+    assert "Warmed up 1 of 2 holidays calendars" in result.output
+    assert (
+        "Failed SG-2022: The holidays API is not available." in result.stderr
+    )
+    assert fake_redis.get("US-2022") is not None
+
+
+def test_warmup_command_rejects_unknown_countries(app_fixture):
+    """
+    Given a country not supported, the command must fail before warming up.
+    """
+    # Act
+    result = app_fixture.test_cli_runner().invoke(
+        args=["holidays", "warmup", "--countries=US,XX"]
+    )
+
+    # Assert
+    assert result.exit_code == 2, result.output
+    assert "Unknown countries: XX." in result.output
+
+
+def test_warmup_on_startup(monkeypatch, app_fixture):
+    """
+    Given the startup warm up, the holidays of the configured countries for
+    the current and next year must be resolved in background.
+    """
+    # Arrange
+    provider = RecordingProvider()
+    monkeypatch.setitem(app_fixture.extensions, "holidays_provider", provider)
+    monkeypatch.setitem(app_fixture.config, "HOLIDAYS_WARMUP_COUNTRIES", "US")
+
+    # Act
+    start_warmup(app_fixture).join(timeout=5)
+
+    # Assert
+    assert len(provider.keys) == 2, "The current and next year are expected."
+    assert {country for country, _ in provider.keys} == {"US"}